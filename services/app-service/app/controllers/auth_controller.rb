@@ -135,7 +135,7 @@ class AuthController < BaseController
             grpc_host = config.notification_grpc_host
             stub = Notification::NotificationDelivery::Stub.new(grpc_host, :this_channel_is_insecure)
             grpc_req = Notification::WebappUserAuthRequest.new(euid: euid)
-            grpc_resp = stub.authorize_webapp_user(grpc_req)
+            grpc_resp = stub.authorize_webapp_user(grpc_req, deadline: Time.now + config.notification_grpc_timeout)
             if grpc_resp.success
                 logger.info("WebApp user authorized via gRPC", {euid: euid&.slice(0,12)})
                 res.status = 200
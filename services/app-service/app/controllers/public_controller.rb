@@ -70,6 +70,7 @@ class PublicController < BaseController
     end
 
     # Handles POST to /api/message for site contact messages, sends via gRPC.
+    # The client IP is forwarded as x-client-ip metadata for notification-bot rate limiting.
     #
     # Parameters:
     # - req: WEBrick::HTTPRequest (JSON body)
@@ -91,12 +92,18 @@ class PublicController < BaseController
         stub = Notification::NotificationDelivery::Stub.new(grpc_host, :this_channel_is_insecure)
         grpc_req = Notification::ContactMessageRequest.new(name: name, email: email, body: body)
         begin
-            grpc_resp = stub.deliver_contact_message(grpc_req)
+            grpc_resp = stub.deliver_contact_message(
+                grpc_req,
+                metadata: contact_metadata(req),
+                deadline: Time.now + config.notification_grpc_timeout
+            )
             if grpc_resp.success
                 respond_json(res, { success: true, status: "received" }, 200)
             else
                 respond_json(res, { error: grpc_resp.error_message || "Notification delivery failed" }, 500)
             end
+        rescue GRPC::ResourceExhausted
+            respond_json(res, { error: "Too many messages, please try again later" }, 429)
         rescue StandardError => e
             logger.error("gRPC notify failed: #{e.class} #{e.message}")
             respond_json(res, { error: "Notification service unavailable" }, 503)
@@ -128,6 +135,18 @@ class PublicController < BaseController
         res.body = ErrorHandler.instance_method(:render_error_template).bind(ErrorHandler).call('public/404.html')
     end
 
+    # Builds gRPC metadata for a contact message: the client IP used by notification-bot for
+    # per-sender rate limiting (Rack::Request#ip, which honors X-Forwarded-For from trusted proxies).
+    #
+    # Parameters:
+    # - req: Rack::Request
+    #
+    # Returns:
+    # - Hash - gRPC call metadata
+    def contact_metadata(req)
+        { "x-client-ip" => req.ip.to_s }
+    end
+
     # Responds with JSON body and code. Sets correct content-type.
     #
     # Parameters:
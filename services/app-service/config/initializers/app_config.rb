@@ -7,7 +7,7 @@ require 'base64'
 
 # Application configuration loader; handles environment variables, .env parsing, and key handling.
 class AppConfig
-    attr_reader :env, :port, :notification_grpc_host, :notification_bot_token, :admin_key
+    attr_reader :env, :port, :notification_grpc_host, :notification_grpc_timeout, :notification_bot_token, :admin_key
 
     # Initializes AppConfig with merged environment and .env/.dotenv values.
     #
@@ -20,6 +20,7 @@ class AppConfig
         @env = load_env
         @port = fetch_param('RACKUP_PORT', 9292).to_i
         @notification_grpc_host = fetch_param('NOTIFICATION_GRPC_HOST', 'notification-bot:50051')
+        @notification_grpc_timeout = fetch_param('NOTIFICATION_GRPC_TIMEOUT', 5).to_f
         @notification_bot_token = fetch_param('NOTIFICATION_BOT_TOKEN', nil)
         @admin_key = load_admin_key
     end
@@ -0,0 +1,73 @@
+# SPDX-FileCopyrightText: 2025 Maxim Selin <selinmax05@mail.ru>
+#
+# SPDX-License-Identifier: MIT
+
+require_relative '../spec_helper'
+require_relative '../../app/controllers/public_controller'
+
+RSpec.describe PublicController do
+    let(:config) do
+        instance_double(AppConfig, notification_grpc_host: 'localhost:50051', notification_grpc_timeout: 5.0)
+    end
+    let(:logger) { double('logger', error: nil, info: nil) }
+    let(:controller) { described_class.new(config, logger) }
+    let(:stub) { instance_double(Notification::NotificationDelivery::Stub) }
+    let(:ok) { Notification::ContactMessageResponse.new(success: true, error_message: '') }
+
+    before do
+        allow(Notification::NotificationDelivery::Stub).to receive(:new).and_return(stub)
+    end
+
+    # Posts a valid contact message through the controller (as config.ru builds the request).
+    #
+    # Parameters:
+    # - env: Hash - extra Rack env entries (REMOTE_ADDR, forwarding headers)
+    #
+    # Returns:
+    # - Rack::Response
+    def post_message(env = {})
+        body = JSON.generate(name: 'Alice', email: 'alice@example.com', body: 'Hello')
+        opts = { method: 'POST', input: body, 'CONTENT_TYPE' => 'application/json' }.merge(env)
+        req = Rack::Request.new(Rack::MockRequest.env_for('/api/message', opts))
+        res = Rack::Response.new
+        controller.handle_request(req, res)
+        res
+    end
+
+    describe 'POST /api/message' do
+        it 'forwards the client IP as x-client-ip metadata' do
+            expect(stub).to receive(:deliver_contact_message)
+                .with(an_instance_of(Notification::ContactMessageRequest), hash_including(metadata: { 'x-client-ip' => '203.0.113.7' }))
+                .and_return(ok)
+
+            res = post_message('REMOTE_ADDR' => '203.0.113.7')
+
+            expect(res.status).to eq(200)
+            expect(JSON.parse(res.body.to_s)).to include('success' => true)
+        end
+
+        it 'uses the forwarded client IP behind the local proxy' do
+            expect(stub).to receive(:deliver_contact_message)
+                .with(anything, hash_including(metadata: { 'x-client-ip' => '198.51.100.4' }))
+                .and_return(ok)
+
+            res = post_message('REMOTE_ADDR' => '127.0.0.1', 'HTTP_X_FORWARDED_FOR' => '198.51.100.4')
+
+            expect(res.status).to eq(200)
+        end
+
+        it 'sets a deadline on the call' do
+            expect(stub).to receive(:deliver_contact_message)
+                .with(anything, hash_including(deadline: an_instance_of(Time)))
+                .and_return(ok)
+
+            expect(post_message('REMOTE_ADDR' => '203.0.113.7').status).to eq(200)
+        end
+
+        it 'maps a rate-limited call to 429' do
+            allow(stub).to receive(:deliver_contact_message).and_raise(GRPC::ResourceExhausted.new('Too many contact messages'))
+
+            expect(post_message('REMOTE_ADDR' => '203.0.113.7').status).to eq(429)
+        end
+    end
+end
@@ -0,0 +1,16 @@
+# SPDX-FileCopyrightText: 2025 Maxim Selin <selinmax05@mail.ru>
+#
+# SPDX-License-Identifier: MIT
+
+# RSpec setup for app-service. Controller specs load the generated gRPC Ruby classes from
+# ./proto-context (see protoc_gen in entrypoint.sh), so run them from the app-service root
+# after codegen: bundle exec rspec
+require 'rspec'
+require 'json'
+require 'rack'
+require 'rack/mock'
+
+RSpec.configure do |config|
+    config.expect_with(:rspec) { |c| c.syntax = :expect }
+    config.mock_with(:rspec) { |m| m.verify_partial_doubles = true }
+end
@@ -0,0 +1,119 @@
+# SPDX-FileCopyrightText: 2025 Maxim Selin <selinmax05@mail.ru>
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Load test for Telegram update processing: many simulated users send /start, /status and /logout
+whose handler performs a blocking DB call (in a worker thread) and a Bot API round trip.
+Compares PTB's sequential processing with PerUserUpdateProcessor and checks per-user ordering.
+The burst case has one user send --burst updates at once next to single updates from the other
+users, and reports how long those other users wait (they must not queue behind the burst).
+
+Usage (from services/notification-bot):
+    python -m bench.bot_updates_load [--users 200] [--per-user 5] [--concurrency 16] [--burst 64]
+"""
+import argparse
+import asyncio
+import time
+from telegram import Update
+from telegram.ext import SimpleUpdateProcessor
+from src.bot import PerUserUpdateProcessor
+from bench.webhook_standin import synthetic_updates
+
+async def _run(processor, updates, db_latency, api_latency):
+    """
+    Feeds updates through the given processor the way PTB's update fetcher does
+    (one task per update) and awaits them all.
+
+    Parameters:
+    - processor: BaseUpdateProcessor
+    - updates: list[dict] - Telegram update payloads
+    - db_latency: float - simulated blocking DB call (seconds)
+    - api_latency: float - simulated Bot API reply (seconds)
+
+    Returns:
+    - tuple(float updates per second, bool per-user order preserved)
+    """
+    seen = {}
+
+    async def simulated_handler(update):
+        await asyncio.to_thread(time.sleep, db_latency)
+        await asyncio.sleep(api_latency)
+        seen.setdefault(update.effective_user.id, []).append(update.update_id)
+
+    parsed = [Update.de_json(u, None) for u in updates]
+
+    async with processor:
+        start = time.perf_counter()
+        await asyncio.gather(*(processor.process_update(u, simulated_handler(u)) for u in parsed))
+        elapsed = time.perf_counter() - start
+
+    ordered = all(ids == sorted(ids) for ids in seen.values())
+    return len(parsed) / elapsed, ordered
+
+async def _run_burst(processor, burst, users, handler_latency):
+    """
+    Sends `burst` updates from one user, then one update from each of `users` other users,
+    all at once, and times how long each of the other users' updates takes to finish.
+
+    Parameters:
+    - processor: BaseUpdateProcessor
+    - burst: int - updates from the bursting user
+    - users: int - other users (one update each)
+    - handler_latency: float - simulated handler time (seconds)
+
+    Returns:
+    - tuple(float p50 seconds, float max seconds) - other users' completion times
+    """
+    payloads = synthetic_updates(users + 1)
+    burster = [dict(payloads[1], update_id=i) for i in range(1, burst + 1)]
+    others = [dict(payloads[3 * n + 1], update_id=burst + n) for n in range(1, users + 1)]
+    parsed = [Update.de_json(u, None) for u in burster + others]
+    done = []
+
+    async def simulated_handler():
+        await asyncio.sleep(handler_latency)
+
+    async def timed(update):
+        await processor.process_update(update, simulated_handler())
+        done.append(time.perf_counter() - start)
+
+    async with processor:
+        start = time.perf_counter()
+        await asyncio.gather(*(processor.process_update(u, simulated_handler()) for u in parsed[:burst]), *(timed(u) for u in parsed[burst:]))
+
+    done.sort()
+    return done[len(done) // 2], done[-1]
+
+def main():
+    parser = argparse.ArgumentParser(description="Telegram update processing load test")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--per-user", type=int, default=1, help="rounds of /start,/status,/logout per user")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--db-latency", type=float, default=0.005)
+    parser.add_argument("--api-latency", type=float, default=0.02)
+    parser.add_argument("--burst", type=int, default=64, help="updates sent at once by one user in the burst case")
+    parser.add_argument("--burst-users", type=int, default=8, help="other users sending one update next to the burst")
+    parser.add_argument("--burst-latency", type=float, default=0.1, help="handler time in the burst case (seconds)")
+    args = parser.parse_args()
+
+    updates = [
+        dict(update, update_id=i)
+        for i, update in enumerate(synthetic_updates(args.users) * args.per_user, start=1)
+    ]
+
+    for name, processor in (
+        ("sequential", SimpleUpdateProcessor(1)),
+        (f"per-user x{args.concurrency}", PerUserUpdateProcessor(args.concurrency)),
+    ):
+        rate, ordered = asyncio.run(_run(processor, updates, args.db_latency, args.api_latency))
+        print(f"{name:>16}: {rate:8.1f} updates/s, per-user order preserved: {ordered}")
+
+    p50, worst = asyncio.run(_run_burst(PerUserUpdateProcessor(args.concurrency), args.burst, args.burst_users, args.burst_latency))
+    print(
+        f"{'burst':>16}: 1 user x {args.burst} updates + {args.burst_users} other users, "
+        f"{args.burst_latency * 1000:.0f} ms handler: other users done in p50 {p50 * 1000:.0f} ms, max {worst * 1000:.0f} ms"
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+# SPDX-FileCopyrightText: 2025 Maxim Selin <selinmax05@mail.ru>
+#
+# SPDX-License-Identifier: MIT
+
+"""
+End-to-end load benchmark: runs the real gRPC server, NotificationHandler and Telegram
+Application against the local fake Bot API (bench.fake_bot_api) and an in-memory (or throwaway
+Postgres) user repository, drives DeliverContactMessage and AuthorizeWebappUser at fixed rates
+and reports throughput plus p50/p95/p99 latency from gRPC ingress to completed Telegram send.
+
+The client, the fake Bot API and the service each run on their own thread, so load
+generation does not compete with the service loop. Results can be appended as JSON lines
+(tagged with the git commit) to compare runs across commits.
+
+Usage (from services/notification-bot, generated stubs on PYTHONPATH):
+    python -m bench.e2e_load [--recipients 20] [--contact-rate 5] [--auth-rate 1] [--duration 10] \\
+        [--api-latency 0.05] [--rate-429 0.01] [--rate-5xx 0.01] [--runtime-mode threaded] \\
+        [--postgres] [--output results.jsonl]
+"""
+import argparse
+import asyncio
+import base64
+import json
+import logging
+import os
+import re
+import socket
+import subprocess
+import threading
+import time
+import grpc
+import service_pb2
+import service_pb2_grpc
+from src.config import Config
+from src.api import start_server, ServerThread
+from src.bot import build_application
+from src.handlers import UserAuthManager, NotificationHandler, encrypt_uid
+from bench.fake_bot_api import FakeBotApi
+
+RECIPIENT_BASE = 500000
+AUTH_UID_BASE = 900000
+MARKER_RE = re.compile(r"bench-(\d+)$")
+
+class InMemoryUserRepository:
+    """
+    NotificationUserRepository stand-in keeping authorized user ids in a set.
+    """
+
+    def __init__(self):
+        self.users = set()
+
+    def add_user(self, user_id: int):
+        self.users.add(int(user_id))
+
+    def remove_user(self, user_id: int):
+        self.users.discard(int(user_id))
+
+    def is_authorized(self, user_id: int) -> bool:
+        return int(user_id) in self.users
+
+    def get_all_authorized_user_ids(self):
+        return list(self.users)
+
+    def close(self):
+        pass
+
+class _ApiThread:
+    """
+    Runs FakeBotApi on its own thread and event loop.
+    """
+
+    def __init__(self, api):
+        self.api = api
+        self._ready = threading.Event()
+        self._loop = None
+        self._stop = None
+        self._thread = threading.Thread(target=self._run, name="fake-bot-api", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        self._ready.wait()
+
+    def stop(self):
+        self._loop.call_soon_threadsafe(self._stop.set)
+        self._thread.join()
+
+    def _run(self):
+        asyncio.run(self._serve())
+
+    async def _serve(self):
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        await self.api.start()
+        self._ready.set()
+        await self._stop.wait()
+        await self.api.stop()
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def percentiles(values):
+    """
+    Nearest-rank p50/p95/p99/max of a list of milliseconds.
+
+    Parameters:
+    - values: list[float]
+
+    Returns:
+    - dict[str, float]|None - None for an empty list
+    """
+    if not values:
+        return None
+
+    ordered = sorted(values)
+    pick = lambda q: ordered[min(len(ordered) - 1, max(0, round(q * len(ordered)) - 1))]
+    return {"p50": round(pick(0.50), 2), "p95": round(pick(0.95), 2), "p99": round(pick(0.99), 2), "max": round(ordered[-1], 2)}
+
+def git_commit() -> str:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True).stdout.strip()
+        return f"{commit}-dirty" if dirty else commit
+
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def drive_load(target, args, secret, repo):
+    """
+    Open-loop client: issues RPCs on a fixed schedule regardless of how fast responses come back.
+    Uses the sync gRPC stub's futures from a plain thread (a second grpc.aio loop in the same
+    process trips over the aio poller).
+
+    Parameters:
+    - target: str - gRPC host:port
+    - args: argparse.Namespace - contact_rate, auth_rate, duration
+    - secret: str - WebApp secret for building euids
+    - repo: user repository - authorizations are reverted so the fan-out stays constant
+
+    Returns:
+    - dict - ingress times per contact sequence number, RPC latencies and status counts
+    """
+    schedule = [(i / args.contact_rate, "contact", i) for i in range(int(args.contact_rate * args.duration))]
+
+    if args.auth_rate > 0:
+        schedule += [(i / args.auth_rate, "auth", i) for i in range(int(args.auth_rate * args.duration))]
+
+    schedule.sort()
+    euids = {seq: encrypt_uid(str(AUTH_UID_BASE + seq), secret) for _, kind, seq in schedule if kind == "auth"}
+    result = {"ingress": {}, "contact_ms": [], "auth_ms": [], "statuses": {}}
+    lock = threading.Lock()
+
+    def on_done(kind, seq, start, future):
+        elapsed = (time.perf_counter() - start) * 1000
+        code = future.code()
+
+        if kind == "auth" and code == grpc.StatusCode.OK:
+            repo.remove_user(AUTH_UID_BASE + seq)
+
+        with lock:
+
+            if code == grpc.StatusCode.OK:
+                result[f"{kind}_ms"].append(elapsed)
+
+            key = f"{kind}:{code.name}"
+            result["statuses"][key] = result["statuses"].get(key, 0) + 1
+
+    with grpc.insecure_channel(target) as channel:
+        grpc.channel_ready_future(channel).result(timeout=10)
+        stub = service_pb2_grpc.NotificationDeliveryStub(channel)
+        futures = []
+        start = time.perf_counter()
+
+        for offset, kind, seq in schedule:
+            delay = start + offset - time.perf_counter()
+
+            if delay > 0:
+                time.sleep(delay)
+
+            sent_at = time.perf_counter()
+
+            if kind == "contact":
+                result["ingress"][seq] = sent_at
+                request = service_pb2.ContactMessageRequest(name="Bench", email="bench@example.com", body=f"bench-{seq}")
+                future = stub.DeliverContactMessage.future(request, timeout=30)
+
+            else:
+                future = stub.AuthorizeWebappUser.future(service_pb2.WebappUserAuthRequest(euid=euids[seq]), timeout=30)
+
+            future.add_done_callback(lambda f, kind=kind, seq=seq, sent_at=sent_at: on_done(kind, seq, sent_at, f))
+            futures.append(future)
+
+        for future in futures:
+
+            try:
+                future.result()
+
+            except grpc.RpcError:
+                pass
+
+    return result
+
+async def run_service(args):
+    """
+    Starts fake Bot API, service and client; waits for the delivery queue to drain; collects metrics.
+
+    Parameters:
+    - args: argparse.Namespace
+
+    Returns:
+    - dict - benchmark result
+    """
+    api = FakeBotApi(latency=args.api_latency, rate_429=args.rate_429, rate_5xx=args.rate_5xx, seed=args.seed)
+    api_thread = _ApiThread(api)
+    api_thread.start()
+
+    secret = base64.b64encode(os.urandom(32)).decode("ascii")
+    single_loop = args.runtime_mode == "single_loop"
+    config = Config(
+        admin_key="",
+        notification_bot_token="123456:bench",
+        webapp_token_secret=secret,
+        notification_bot_port=free_port(),
+        pg_host=os.environ.get("PGHOST", "localhost"),
+        pg_port=int(os.environ.get("PGPORT", 5432)),
+        pg_user=os.environ.get("PGUSER", "postgres"),
+        pg_password=os.environ.get("PGPASSWORD", "postgres"),
+        pg_database=os.environ.get("PGDATABASE", "sitecard"),
+        runtime_mode=args.runtime_mode,
+        telegram_pool_size=args.pool_size,
+        delivery_send_concurrency=args.send_concurrency,
+        telegram_api_base_url=api.base_url,
+        contact_rate_per_minute=0,
+        contact_global_rate_per_minute=0,
+    )
+
+    if args.postgres:
+        from src.clients import NotificationUserRepository
+        repo = NotificationUserRepository(config)
+
+    else:
+        repo = InMemoryUserRepository()
+
+    recipients = list(range(RECIPIENT_BASE, RECIPIENT_BASE + args.recipients))
+
+    for uid in recipients:
+        repo.add_user(uid)
+
+    auth_manager = UserAuthManager(repo)
+    application = build_application(config, auth_manager)
+    handler = NotificationHandler(application, auth_manager, single_loop=single_loop, send_concurrency=config.delivery_send_concurrency)
+    await application.initialize()
+    await handler.start_worker()
+    grpc_thread = None
+    server = None
+
+    if single_loop:
+        server = await start_server(config, handler)
+
+    else:
+        grpc_thread = ServerThread(config, handler)
+        grpc_thread.start()
+
+    try:
+        load = await asyncio.to_thread(drive_load, f"127.0.0.1:{config.notification_bot_port}", args, secret, repo)
+        drain_until = time.perf_counter() + args.drain_timeout
+
+        while handler.pending_count() and time.perf_counter() < drain_until:
+            await asyncio.sleep(0.05)
+
+        undelivered = handler.pending_count()
+
+    finally:
+
+        if server is not None:
+            await server.stop(0)
+
+        if grpc_thread is not None:
+            await grpc_thread.stop(0)
+
+        await handler.stop_worker()
+        await application.shutdown()
+        api_thread.stop()
+
+        for uid in recipients:
+            repo.remove_user(uid)
+
+        repo.close()
+
+    delivery_ms = []
+    sends = []
+
+    for sent_at, _, text in api.sent:
+        match = MARKER_RE.search(text)
+
+        if match and int(match.group(1)) in load["ingress"]:
+            sends.append(sent_at)
+            delivery_ms.append((sent_at - load["ingress"][int(match.group(1))]) * 1000)
+
+    first_ingress = min(load["ingress"].values(), default=0.0)
+    window = (max(sends) - first_ingress) if sends else 0.0
+
+    return {
+        "commit": git_commit(),
+        "timestamp": int(time.time()),
+        "params": {key: value for key, value in vars(args).items() if key != "output"},
+        "rpc_statuses": load["statuses"],
+        "contact_rpc_ms": percentiles(load["contact_ms"]),
+        "auth_rpc_ms": percentiles(load["auth_ms"]),
+        "ingress_to_send_ms": percentiles(delivery_ms),
+        "sends_per_sec": round(len(sends) / window, 1) if window else 0.0,
+        "sent": len(sends),
+        "expected": load["statuses"].get("contact:OK", 0) * args.recipients,
+        "api_responses": api.counts,
+        "undelivered": undelivered,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="notification-bot end-to-end load benchmark")
+    parser.add_argument("--recipients", type=int, default=20, help="authorized users each contact message fans out to")
+    parser.add_argument("--contact-rate", type=float, default=5.0, help="DeliverContactMessage calls per second")
+    parser.add_argument("--auth-rate", type=float, default=1.0, help="AuthorizeWebappUser calls per second (0 disables)")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load")
+    parser.add_argument("--api-latency", type=float, default=0.05, help="fake Bot API response time (seconds)")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="share of sends answered with 429")
+    parser.add_argument("--rate-5xx", type=float, default=0.0, help="share of sends answered with 502")
+    parser.add_argument("--seed", type=int, default=1, help="failure injection seed")
+    parser.add_argument("--runtime-mode", choices=("threaded", "single_loop"), default="threaded")
+    parser.add_argument("--pool-size", type=int, default=64, help="TELEGRAM_POOL_SIZE")
+    parser.add_argument("--send-concurrency", type=int, default=8, help="DELIVERY_SEND_CONCURRENCY")
+    parser.add_argument("--drain-timeout", type=float, default=120.0, help="max seconds to wait for the queue after load stops")
+    parser.add_argument("--postgres", action="store_true", help="use NotificationUserRepository with PG* env (throwaway database)")
+    parser.add_argument("--log-level", default="ERROR")
+    parser.add_argument("--output", help="append the JSON result to this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=args.log_level.upper())
+    result = asyncio.run(run_service(args))
+
+    print(f"commit {result['commit']}: {result['sent']}/{result['expected']} sends, {result['sends_per_sec']} sends/s")
+    print(f"rpc statuses: {result['rpc_statuses']}, fake API responses: {result['api_responses']}, undelivered: {result['undelivered']}")
+
+    for name in ("contact_rpc_ms", "auth_rpc_ms", "ingress_to_send_ms"):
+        print(f"{name:>20}: {result[name]}")
+
+    if args.output:
+
+        with open(args.output, "a", encoding="utf-8") as f:
+            f.write(json.dumps(result) + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+# SPDX-FileCopyrightText: 2025 Maxim Selin <selinmax05@mail.ru>
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Local stand-in for the Telegram Bot API used by the load benchmarks: answers getMe and
+sendMessage (and acknowledges any other method) over keep-alive HTTP/1.1, with configurable
+response latency and injected 429 / 5xx failures. Successful sends are recorded with their
+completion time for latency accounting.
+
+Point the bot at it with TELEGRAM_API_BASE_URL=http://127.0.0.1:<port>/bot.
+
+Usage (from services/notification-bot, standalone):
+    python -m bench.fake_bot_api [--port 8081] [--latency 0.05] [--rate-429 0.01] [--rate-5xx 0.01]
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from urllib.parse import parse_qs
+
+REASONS = {200: "OK", 404: "Not Found", 429: "Too Many Requests", 502: "Bad Gateway"}
+
+class FakeBotApi:
+    """
+    Minimal asyncio Bot API server; counters and sent messages are read by the benchmark driver.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, rate_429=0.0, rate_5xx=0.0, retry_after=1, seed=None):
+        """
+        Parameters:
+        - host: str - bind address
+        - port: int - bind port (0 picks a free one)
+        - latency: float - seconds before each response
+        - rate_429: float - share of sendMessage calls answered with 429 Too Many Requests (0..1)
+        - rate_5xx: float - share of sendMessage calls answered with 502 Bad Gateway (0..1)
+        - retry_after: int - retry_after advertised in 429 responses
+        - seed: int|None - failure injection RNG seed (reproducible runs)
+
+        Returns:
+        - FakeBotApi
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.rate_429 = rate_429
+        self.rate_5xx = rate_5xx
+        self.retry_after = retry_after
+        self.sent = []
+        self.counts = {"ok": 0, "429": 0, "5xx": 0}
+        self._random = random.Random(seed)
+        self._server = None
+        self._message_id = 0
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/bot"
+
+    async def start(self):
+        """
+        Binds and starts serving on the running loop (resolves port 0 to the bound port).
+
+        Parameters:
+        - None
+
+        Returns:
+        - None
+        """
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        """
+        Stops serving.
+
+        Parameters:
+        - None
+
+        Returns:
+        - None
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle_connection(self, reader, writer):
+
+        try:
+
+            while True:
+                request_line = await reader.readline()
+
+                if not request_line:
+                    break
+
+                _, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+
+                while True:
+                    line = await reader.readline()
+
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length", 0))
+                body = await reader.readexactly(length) if length else b""
+                status, payload = await self._dispatch(path.rsplit("/", 1)[-1], headers, body)
+                data = json.dumps(payload).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\nConnection: keep-alive\r\n\r\n".encode("latin-1") + data
+                )
+                await writer.drain()
+
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method, headers, body):
+        """
+        Answers one Bot API call.
+
+        Parameters:
+        - method: str - Bot API method name (last path segment)
+        - headers: dict[str, str]
+        - body: bytes - form-encoded or JSON parameters
+
+        Returns:
+        - tuple(int status, dict payload)
+        """
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if method == "getMe":
+            return 200, {"ok": True, "result": {"id": 1, "is_bot": True, "first_name": "bench", "username": "bench_bot"}}
+
+        if method != "sendMessage":
+            return 200, {"ok": True, "result": True}
+
+        if headers.get("content-type", "").startswith("application/json"):
+            params = json.loads(body or b"{}")
+
+        else:
+            params = {key: values[0] for key, values in parse_qs(body.decode("utf-8")).items()}
+
+        roll = self._random.random()
+
+        if roll < self.rate_429:
+            self.counts["429"] += 1
+            return 429, {
+                "ok": False,
+                "error_code": 429,
+                "description": f"Too Many Requests: retry after {self.retry_after}",
+                "parameters": {"retry_after": self.retry_after},
+            }
+
+        if roll < self.rate_429 + self.rate_5xx:
+            self.counts["5xx"] += 1
+            return 502, {"ok": False, "error_code": 502, "description": "Bad Gateway"}
+
+        self.counts["ok"] += 1
+        self._message_id += 1
+        chat_id = int(params.get("chat_id", 0))
+        text = params.get("text", "")
+        self.sent.append((time.perf_counter(), chat_id, text))
+        return 200, {
+            "ok": True,
+            "result": {
+                "message_id": self._message_id,
+                "date": int(time.time()),
+                "chat": {"id": chat_id, "type": "private"},
+                "text": text,
+            },
+        }
+
+async def _serve(args):
+    api = FakeBotApi(args.host, args.port, args.latency, args.rate_429, args.rate_5xx, seed=args.seed)
+    await api.start()
+    print(f"fake Bot API listening, TELEGRAM_API_BASE_URL={api.base_url}", flush=True)
+
+    try:
+        await asyncio.Event().wait()
+
+    finally:
+        await api.stop()
+        print(f"responses: {api.counts}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Telegram Bot API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per response")
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--rate-5xx", type=float, default=0.0)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(_serve(args))
+
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+# SPDX-FileCopyrightText: 2025 Maxim Selin <selinmax05@mail.ru>
+#
+# SPDX-License-Identifier: MIT
+
+"""
+gRPC transport latency benchmark: serves NotificationService on TCP and on a Unix domain socket
+at the same time (threaded runtime, as in production) and measures round-trip latency of
+sequential DeliverContactMessage and AuthorizeWebappUser calls over each transport.
+
+Contact messages go to zero recipients and authorization hits an already authorized user, so
+no queue or Telegram work is done and the numbers are the RPC path itself: transport, HTTP/2
+framing, protobuf and the service's request handling.
+
+Usage (from services/notification-bot, generated stubs on PYTHONPATH):
+    python -m bench.grpc_transport [--calls 2000] [--warmup 200] [--output results.jsonl]
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import tempfile
+import time
+import grpc
+import service_pb2
+import service_pb2_grpc
+from src.config import Config
+from src.api import ServerThread
+from src.handlers import UserAuthManager, NotificationHandler, encrypt_uid
+from bench.e2e_load import InMemoryUserRepository, free_port, percentiles, git_commit
+
+AUTH_UID = 900001
+
+def measure(stub, method, request, calls, warmup):
+    """
+    Times sequential blocking calls.
+
+    Parameters:
+    - stub: NotificationDeliveryStub
+    - method: str - RPC name
+    - request: protobuf request
+    - calls: int - timed calls
+    - warmup: int - untimed calls first
+
+    Returns:
+    - list[float] - latencies in milliseconds
+    """
+    rpc = getattr(stub, method)
+
+    for _ in range(warmup):
+        rpc(request, timeout=5)
+
+    latencies = []
+
+    for _ in range(calls):
+        start = time.perf_counter()
+        rpc(request, timeout=5)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    return latencies
+
+def main():
+    parser = argparse.ArgumentParser(description="gRPC latency over TCP vs Unix domain socket")
+    parser.add_argument("--calls", type=int, default=2000, help="timed calls per RPC and transport")
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--output", help="append the result as a JSON line to this file")
+    args = parser.parse_args()
+
+    secret = base64.b64encode(os.urandom(32)).decode("ascii")
+    socket_dir = tempfile.mkdtemp(prefix="notification-bot-")
+    config = Config(
+        admin_key="",
+        notification_bot_token="123456:bench",
+        webapp_token_secret=secret,
+        notification_bot_port=free_port(),
+        grpc_unix_socket=os.path.join(socket_dir, "grpc.sock"),
+        contact_rate_per_minute=0,
+        contact_global_rate_per_minute=0,
+    )
+    repo = InMemoryUserRepository()
+    repo.add_user(AUTH_UID)
+    handler = NotificationHandler(None, UserAuthManager(repo))
+    server = ServerThread(config, handler)
+    server.start()
+
+    targets = {
+        "tcp": f"127.0.0.1:{config.notification_bot_port}",
+        "unix": f"unix:{config.grpc_unix_socket}",
+    }
+    requests = {
+        "DeliverContactMessage": service_pb2.ContactMessageRequest(name="Bench", email="bench@example.com", body="bench"),
+        "AuthorizeWebappUser": service_pb2.WebappUserAuthRequest(euid=encrypt_uid(str(AUTH_UID), secret)),
+    }
+    results = {}
+
+    try:
+
+        for transport, target in targets.items():
+
+            with grpc.insecure_channel(target) as channel:
+                grpc.channel_ready_future(channel).result(timeout=10)
+                stub = service_pb2_grpc.NotificationDeliveryStub(channel)
+
+                for method, request in requests.items():
+                    latencies = measure(stub, method, request, args.calls, args.warmup)
+                    stats = percentiles(latencies)
+                    stats["mean"] = round(sum(latencies) / len(latencies), 3)
+                    results.setdefault(method, {})[transport] = stats
+
+    finally:
+        asyncio.run(server.stop(0))
+        os.rmdir(socket_dir)
+
+    for method, by_transport in results.items():
+        print(method)
+
+        for transport, stats in by_transport.items():
+            print(f"  {transport:<5} mean {stats['mean']:.3f} ms  p50 {stats['p50']:.2f}  p95 {stats['p95']:.2f}  p99 {stats['p99']:.2f}  max {stats['max']:.2f}")
+
+        tcp, unix = by_transport["tcp"]["mean"], by_transport["unix"]["mean"]
+        print(f"  unix vs tcp: {unix / tcp - 1:+.1%} mean latency")
+
+    if args.output:
+
+        with open(args.output, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"commit": git_commit(), "calls": args.calls, "results": results}) + "\n")
+
+if __name__ == "__main__":
+    main()
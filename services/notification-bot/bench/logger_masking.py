@@ -0,0 +1,94 @@
+# SPDX-FileCopyrightText: 2025 Maxim Selin <selinmax05@mail.ru>
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Microbenchmark for structlog secret masking: log events per second through
+mask_secrets_processor alone and through the full configured processor chain.
+
+Usage (from services/notification-bot):
+    python -m bench.logger_masking [--events N]
+"""
+import argparse
+import time
+import types
+import structlog
+from src.logger import set_logger_config_from_config, mask_secrets_processor
+
+BOT_TOKEN = "123456789:AAH" + "x" * 32
+WEBAPP_SECRET = "d2ViYXBwLXNlY3JldC0" + "y" * 24
+ADMIN_KEY = "MIIBIjANBgkqhkiG9w0BAQEFAAOC" + "z" * 200
+
+def _sample_events():
+    """
+    Builds a realistic mix of event dicts: mostly clean hot-path events, some carrying a secret.
+
+    Parameters:
+    - None
+
+    Returns:
+    - list[dict]
+    """
+    return [
+        {"event": "delivery worker got message for user", "extra": {"notify_user_id": 123456789}},
+        {"event": "Notification sent in worker"},
+        {"event": "gRPC DeliverContactMessage called", "extra": {"contact_name": "Jane", "contact_email": "jane@example.com"}},
+        {"event": "/start issued WebApp button", "extra": {"webapp_url": "https://example.com/auth/webapp?euid=abc&token=def"}},
+        {"event": f"HTTP Request: POST https://api.telegram.org/bot{BOT_TOKEN}/sendMessage \"HTTP/1.1 200 OK\""},
+        {"event": "Notification sent in worker"},
+        {"event": "delivery worker got message for user", "extra": {"notify_user_id": 987654321}},
+        {"event": "Failed to deliver notification in worker", "extra": {"notify_error": "Timed out"}},
+    ]
+
+def _run(func, events, count):
+    """
+    Calls func on copies of sample events count times.
+
+    Parameters:
+    - func: callable(event_dict) -> object
+    - events: list[dict]
+    - count: int
+
+    Returns:
+    - float - events per second
+    """
+    n = len(events)
+    start = time.perf_counter()
+
+    for i in range(count):
+        func(dict(events[i % n]))
+
+    return count / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description="Secret masking microbenchmark")
+    parser.add_argument("--events", type=int, default=200_000)
+    args = parser.parse_args()
+
+    set_logger_config_from_config(types.SimpleNamespace(
+        debug=False,
+        notification_bot_token=BOT_TOKEN,
+        webapp_token_secret=WEBAPP_SECRET,
+        admin_key=ADMIN_KEY,
+    ))
+
+    events = _sample_events()
+    processors = structlog.get_config()["processors"]
+
+    def processor_only(event_dict):
+        return mask_secrets_processor(None, "info", event_dict)
+
+    def full_chain(event_dict):
+        for proc in processors:
+            event_dict = proc(None, "info", event_dict)
+
+        return event_dict
+
+    masked = processor_only(dict(events[4]))["event"]
+    assert BOT_TOKEN not in masked, "bot token leaked through masking"
+
+    print(f"mask_secrets_processor: {_run(processor_only, events, args.events):,.0f} events/s")
+    print(f"full processor chain:   {_run(full_chain, events, args.events):,.0f} events/s")
+
+if __name__ == "__main__":
+    main()
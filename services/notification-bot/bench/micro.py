@@ -0,0 +1,258 @@
+# SPDX-FileCopyrightText: 2025 Maxim Selin <selinmax05@mail.ru>
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Microbenchmarks for per-call hot functions (WebApp uid encryption, login tokens, message
+rendering, contact message fan-out enqueue, log masking and JSON rendering) with stored
+baselines and regression thresholds.
+
+Each case is timed timeit-style: the loop count is calibrated so one repeat takes about
+--target-time seconds, and the best of --repeat repeats is reported as ns per call.
+Baselines are machine-specific; `--save` records the current results (with the machine and
+Python they were taken on) and a plain run compares against them, exiting with status 1 when
+any case is slower than baseline * (1 + threshold).
+
+Usage (from services/notification-bot):
+    python -m bench.micro --save                      # record bench/baselines/micro.json
+    python -m bench.micro [--threshold 0.15] [--only decrypt_uid,render_message]
+"""
+import argparse
+import base64
+import json
+import os
+import platform
+import sys
+import time
+import types
+import structlog
+from src.handlers import NotificationHandler, encrypt_uid, decrypt_uid, generate_login_token, validate_login_token
+from src.logger import set_logger_config_from_config, mask_secrets_processor
+from bench.logger_masking import BOT_TOKEN, WEBAPP_SECRET, ADMIN_KEY
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines", "micro.json")
+USER_ID = "123456789"
+SECRET = base64.b64encode(b"k" * 32).decode("ascii")
+CONTACT_BODY = (
+    "Hello! I found your site and would like to discuss a backend role in our team. "
+    "We work with Python, gRPC and PostgreSQL.\n\nBest regards,\nJane\n"
+)
+LOG_EVENT = {
+    "event": "gRPC DeliverContactMessage called",
+    "extra": {"contact_name": "Jane Doe", "contact_email": "jane@example.com"},
+    "level": "info",
+    "timestamp": "2025-01-01T12:00:00.000000Z",
+}
+FANOUT_RECIPIENTS = 100
+LEAKY_LOG_EVENT = {"event": f"HTTP Request: POST https://api.telegram.org/bot{BOT_TOKEN}/sendMessage \"HTTP/1.1 200 OK\""}
+
+class _StaticRecipients:
+    """
+    Recipient source returning a fixed list of 9-digit ids (no database).
+    """
+
+    def __init__(self, count):
+        self.ids = list(range(100000000, 100000000 + count))
+
+    def get_all_authorized_user_ids(self):
+        return self.ids
+
+def enqueue_case(count):
+    """
+    Builds a case enqueueing one contact message for `count` recipients; the queue and pending
+    stats are reset after each call so the measurement does not grow with the loop count.
+
+    Parameters:
+    - count: int - recipients per message
+
+    Returns:
+    - callable()
+    """
+    handler = NotificationHandler(None, _StaticRecipients(count))
+
+    def enqueue():
+        handler.deliver_contact_message("Jane Doe", "jane@example.com", CONTACT_BODY)
+        handler.send_queue.queue.clear()
+        handler.stats.clear_pending()
+
+    return enqueue
+
+def build_cases():
+    """
+    Builds the benchmark cases with realistic inputs (a 9-digit Telegram id, a 32-byte secret,
+    a contact message of typical length, hot-path log events).
+
+    Parameters:
+    - None
+
+    Returns:
+    - dict[str, callable()] - case name -> zero-argument call
+    """
+    set_logger_config_from_config(types.SimpleNamespace(
+        debug=False,
+        notification_bot_token=BOT_TOKEN,
+        webapp_token_secret=WEBAPP_SECRET,
+        admin_key=ADMIN_KEY,
+    ))
+
+    euid = encrypt_uid(USER_ID, SECRET)
+    token = generate_login_token(USER_ID, SECRET)
+    renderer = structlog.processors.JSONRenderer()
+
+    return {
+        "encrypt_uid": lambda: encrypt_uid(USER_ID, SECRET),
+        "decrypt_uid": lambda: decrypt_uid(euid, SECRET),
+        "generate_login_token": lambda: generate_login_token(USER_ID, SECRET),
+        "validate_login_token": lambda: validate_login_token(token, USER_ID, SECRET),
+        "render_message": lambda: NotificationHandler._render_message("Jane Doe", "jane@example.com", CONTACT_BODY),
+        f"enqueue_contact_message_{FANOUT_RECIPIENTS}": enqueue_case(FANOUT_RECIPIENTS),
+        "mask_secrets_processor": lambda: mask_secrets_processor(None, "info", dict(LOG_EVENT)),
+        "mask_secrets_processor_leaky": lambda: mask_secrets_processor(None, "info", dict(LEAKY_LOG_EVENT)),
+        "json_renderer": lambda: renderer(None, "info", dict(LOG_EVENT)),
+    }
+
+def measure(func, repeat, target_time):
+    """
+    Times func timeit-style.
+
+    Parameters:
+    - func: callable() - case under test
+    - repeat: int - timed repeats
+    - target_time: float - approximate seconds per repeat
+
+    Returns:
+    - float - best ns per call
+    """
+    loops = 1
+
+    while True:
+        start = time.perf_counter()
+
+        for _ in range(loops):
+            func()
+
+        elapsed = time.perf_counter() - start
+
+        if elapsed >= target_time / 10:
+            break
+
+        loops *= 10
+
+    loops = max(1, int(loops * target_time / elapsed))
+    best = float("inf")
+
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+
+        for _ in range(loops):
+            func()
+
+        best = min(best, (time.perf_counter_ns() - start) / loops)
+
+    return best
+
+def environment():
+    return {"machine": platform.machine(), "processor": platform.processor(), "python": platform.python_version()}
+
+def load_baseline(path):
+    """
+    Parameters:
+    - path: str
+
+    Returns:
+    - dict|None - {"environment": {...}, "results": {case: ns}} or None if missing
+    """
+    if not os.path.exists(path):
+        return None
+
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def compare(results, baseline, threshold):
+    """
+    Compares results against baseline.
+
+    Parameters:
+    - results: dict[str, float] - ns per call
+    - baseline: dict[str, float] - ns per call
+    - threshold: float - allowed relative slowdown (0.15 = 15%)
+
+    Returns:
+    - list[str] - regressed case names
+    """
+    regressed = []
+
+    for name, value in results.items():
+        base = baseline.get(name)
+
+        if base is None:
+            print(f"  {name:<30} {value:>12,.0f} ns  (no baseline)")
+            continue
+
+        change = value / base - 1
+        flag = "REGRESSION" if change > threshold else ""
+        print(f"  {name:<30} {value:>12,.0f} ns  baseline {base:>12,.0f} ns  {change:+7.1%}  {flag}")
+
+        if flag:
+            regressed.append(name)
+
+    return regressed
+
+def main():
+    parser = argparse.ArgumentParser(description="Hot-path microbenchmarks with regression thresholds")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save", action="store_true", help="store results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed relative slowdown before failing")
+    parser.add_argument("--only", help="comma-separated case names")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--target-time", type=float, default=0.2, help="seconds per repeat")
+    args = parser.parse_args()
+
+    cases = build_cases()
+
+    if args.only:
+        names = args.only.split(",")
+        unknown = set(names) - set(cases)
+
+        if unknown:
+            parser.error(f"unknown cases: {', '.join(sorted(unknown))} (available: {', '.join(cases)})")
+
+        cases = {name: cases[name] for name in names}
+
+    results = {name: round(measure(func, args.repeat, args.target_time), 1) for name, func in cases.items()}
+
+    if args.save:
+        baseline = load_baseline(args.baseline) or {"results": {}}
+        baseline["environment"] = environment()
+        baseline["results"].update(results)
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+        for name, value in results.items():
+            print(f"  {name:<30} {value:>12,.0f} ns")
+
+        print(f"baseline saved to {args.baseline}")
+        return
+
+    baseline = load_baseline(args.baseline)
+
+    if baseline is None:
+        print(f"no baseline at {args.baseline}, run with --save first", file=sys.stderr)
+        sys.exit(2)
+
+    if baseline.get("environment") != environment():
+        print(f"warning: baseline was recorded on {baseline.get('environment')}, comparisons may be meaningless", file=sys.stderr)
+
+    regressed = compare(results, baseline["results"], args.threshold)
+
+    if regressed:
+        print(f"{len(regressed)} case(s) regressed by more than {args.threshold:.0%}: {', '.join(regressed)}")
+        sys.exit(1)
+
+    print(f"no regressions beyond {args.threshold:.0%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+# SPDX-FileCopyrightText: 2025 Maxim Selin <selinmax05@mail.ru>
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Replays a gRPC traffic recording (GRPC_RECORD_DIR, src.api.recorder) against a test instance,
+keeping the recorded arrival times scaled by --speed (1 = as recorded, 10 = ten times faster,
+0 = as fast as --max-inflight allows), and reports per-RPC status counts and latencies.
+
+Recorded pseudonyms become synthetic traffic: each sender gets a stable 10.x.y.z client IP
+(`x-client-ip`) and address, contact fields are filled to their recorded lengths, and each
+authorized user becomes a synthetic Telegram id encrypted with the test instance's WebApp
+secret (invalid tokens are replayed as invalid). Recorded deadlines are kept. Point the test
+instance at a fake Bot API (bench.fake_bot_api) so no real messages are sent.
+
+Usage (from services/notification-bot, generated stubs on PYTHONPATH):
+    python -m bench.replay grpc-20250101-120000-1.nbrec --summary
+    python -m bench.replay grpc-20250101-120000-1.nbrec [--target 127.0.0.1:50051] [--speed 10] \\
+        [--secret $WEBAPP_TOKEN_SECRET] [--max-inflight 512] [--output results.jsonl]
+"""
+import argparse
+import json
+import os
+import threading
+import time
+import grpc
+import service_pb2
+import service_pb2_grpc
+from src.api.recorder import read_recording, KIND_CONTACT, KIND_AUTH
+from src.handlers import encrypt_uid
+from bench.e2e_load import percentiles, git_commit
+
+REPLAY_UID_BASE = 10 ** 12
+INVALID_EUID = "replay-invalid-euid"
+DEFAULT_TIMEOUT = 30.0
+
+def summarize(records):
+    """
+    Traffic shape of a recording.
+
+    Parameters:
+    - records: list[tuple] - from read_recording
+
+    Returns:
+    - dict
+    """
+    duration = records[-1][0] if records else 0.0
+    per_second = {}
+
+    for offset, *_ in records:
+        per_second[int(offset)] = per_second.get(int(offset), 0) + 1
+
+    contacts = [r for r in records if r[1] == KIND_CONTACT]
+    auths = [r for r in records if r[1] == KIND_AUTH]
+    return {
+        "records": len(records),
+        "duration_s": round(duration, 3),
+        "contact_calls": len(contacts),
+        "contact_senders": len({r[2] for r in contacts}),
+        "auth_calls": len(auths),
+        "auth_users": len({r[2] for r in auths if r[2]}),
+        "auth_invalid": sum(1 for r in auths if not r[2]),
+        "mean_rps": round(len(records) / duration, 2) if duration else None,
+        "peak_rps": max(per_second.values(), default=0),
+    }
+
+def build_calls(records, secret):
+    """
+    Turns records into ready-to-send requests, so request building is not timed.
+
+    Parameters:
+    - records: list[tuple] - from read_recording
+    - secret: str|None - test instance WebApp secret (needed for auth records)
+
+    Returns:
+    - list[tuple(offset_s, kind, request, metadata, timeout_s)]
+    """
+    euids = {}
+    calls = []
+
+    for offset, kind, subject, name_len, body_len, timeout_ms in records:
+        timeout = timeout_ms / 1000 if timeout_ms else DEFAULT_TIMEOUT
+
+        if kind == KIND_CONTACT:
+            request = service_pb2.ContactMessageRequest(
+                name="n" * name_len, email=f"s{subject}@replay.invalid", body="x" * body_len
+            )
+            client_ip = f"10.{(subject >> 16) & 0xFF}.{(subject >> 8) & 0xFF}.{subject & 0xFF}"
+            calls.append((offset, "contact", request, (("x-client-ip", client_ip),), timeout))
+
+        elif kind == KIND_AUTH:
+
+            if subject and subject not in euids:
+
+                if not secret:
+                    raise SystemExit("Recording contains auth calls: pass --secret (or set WEBAPP_TOKEN_SECRET)")
+
+                euids[subject] = encrypt_uid(str(REPLAY_UID_BASE + subject), secret)
+
+            request = service_pb2.WebappUserAuthRequest(euid=euids[subject] if subject else INVALID_EUID)
+            calls.append((offset, "auth", request, (), timeout))
+
+    return calls
+
+def replay(target, calls, speed, max_inflight):
+    """
+    Sends the calls on their (scaled) schedule with sync stub futures; with max_inflight calls
+    outstanding, sending waits (visible as schedule lag).
+
+    Parameters:
+    - target: str - gRPC target
+    - calls: list[tuple] - from build_calls
+    - speed: float - schedule speed-up (0 = no pacing)
+    - max_inflight: int
+
+    Returns:
+    - dict - latencies per RPC, status counts, schedule lag, wall time
+    """
+    result = {"contact_ms": [], "auth_ms": [], "statuses": {}, "lag_ms": []}
+    lock = threading.Lock()
+    slots = threading.BoundedSemaphore(max_inflight)
+
+    def on_done(kind, sent_at, future):
+        elapsed = (time.perf_counter() - sent_at) * 1000
+        code = future.code()
+        slots.release()
+
+        with lock:
+
+            if code == grpc.StatusCode.OK:
+                result[f"{kind}_ms"].append(elapsed)
+
+            key = f"{kind}:{code.name}"
+            result["statuses"][key] = result["statuses"].get(key, 0) + 1
+
+    with grpc.insecure_channel(target) as channel:
+        grpc.channel_ready_future(channel).result(timeout=10)
+        stub = service_pb2_grpc.NotificationDeliveryStub(channel)
+        methods = {"contact": stub.DeliverContactMessage, "auth": stub.AuthorizeWebappUser}
+        futures = []
+        start = time.perf_counter()
+
+        for offset, kind, request, metadata, timeout in calls:
+            due = start + offset / speed if speed > 0 else start
+            delay = due - time.perf_counter()
+
+            if delay > 0:
+                time.sleep(delay)
+
+            slots.acquire()
+            sent_at = time.perf_counter()
+            result["lag_ms"].append(max(0.0, (sent_at - due) * 1000))
+            future = methods[kind].future(request, metadata=metadata, timeout=timeout)
+            future.add_done_callback(lambda f, kind=kind, sent_at=sent_at: on_done(kind, sent_at, f))
+            futures.append(future)
+
+        for future in futures:
+
+            try:
+                future.result()
+
+            except grpc.RpcError:
+                pass
+
+        result["wall_s"] = time.perf_counter() - start
+
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a notification-bot gRPC traffic recording")
+    parser.add_argument("recording", help="recording file (.nbrec)")
+    parser.add_argument("--target", default="127.0.0.1:50051", help="gRPC target, host:port or unix:/path")
+    parser.add_argument("--speed", type=float, default=1.0, help="schedule speed-up; 0 sends as fast as possible")
+    parser.add_argument("--max-inflight", type=int, default=512, help="outstanding calls before sending waits")
+    parser.add_argument("--secret", default=os.environ.get("WEBAPP_TOKEN_SECRET"), help="test instance WebApp secret")
+    parser.add_argument("--summary", action="store_true", help="print the traffic shape and exit without sending")
+    parser.add_argument("--output", help="append the result as a JSON line to this file")
+    args = parser.parse_args()
+
+    started_ms, records = read_recording(args.recording)
+    shape = summarize(records)
+    print(f"recording started {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(started_ms / 1000))}: " + ", ".join(f"{k} {v}" for k, v in shape.items()))
+
+    if args.summary or not records:
+        return
+
+    calls = build_calls(records, args.secret)
+    result = replay(args.target, calls, args.speed, args.max_inflight)
+    report = {
+        "commit": git_commit(),
+        "recording": os.path.basename(args.recording),
+        "speed": args.speed,
+        "shape": shape,
+        "wall_s": round(result["wall_s"], 3),
+        "achieved_rps": round(len(calls) / result["wall_s"], 2) if result["wall_s"] else None,
+        "statuses": result["statuses"],
+        "contact_rpc_ms": percentiles(result["contact_ms"]),
+        "auth_rpc_ms": percentiles(result["auth_ms"]),
+        "schedule_lag_ms": percentiles(result["lag_ms"]),
+    }
+    print(json.dumps(report, indent=2))
+
+    if args.output:
+
+        with open(args.output, "a", encoding="utf-8") as f:
+            f.write(json.dumps(report) + "\n")
+
+if __name__ == "__main__":
+    main()
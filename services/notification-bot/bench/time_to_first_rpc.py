@@ -0,0 +1,86 @@
+# SPDX-FileCopyrightText: 2025 Maxim Selin <selinmax05@mail.ru>
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Measures time-to-first-RPC: spawns the service command and polls the gRPC port with a cheap
+DeliverContactMessage call (empty fields, answered with INVALID_ARGUMENT before any DB work)
+until the server responds.
+
+Usage (from services/notification-bot, generated stubs on PYTHONPATH):
+    python -m bench.time_to_first_rpc [--target localhost:50051] [--runs 3] -- ./entrypoint.sh
+"""
+import argparse
+import statistics
+import subprocess
+import time
+import grpc
+import service_pb2
+import service_pb2_grpc
+
+def wait_first_rpc(target, timeout):
+    """
+    Polls target until an RPC gets any response other than UNAVAILABLE.
+
+    Parameters:
+    - target: str - host:port
+    - timeout: float - give up after this many seconds
+
+    Returns:
+    - float|None - seconds until the first response, None on timeout
+    """
+    start = time.perf_counter()
+
+    while time.perf_counter() - start < timeout:
+
+        # A fresh channel per attempt avoids gRPC reconnect backoff skewing the measurement
+        with grpc.insecure_channel(target) as channel:
+            stub = service_pb2_grpc.NotificationDeliveryStub(channel)
+
+            try:
+                stub.DeliverContactMessage(service_pb2.ContactMessageRequest(), timeout=0.5)
+                return time.perf_counter() - start
+
+            except grpc.RpcError as ex:
+
+                if ex.code() not in (grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED):
+                    return time.perf_counter() - start
+
+        time.sleep(0.02)
+
+    return None
+
+def main():
+    parser = argparse.ArgumentParser(description="Time-to-first-RPC after (re)start")
+    parser.add_argument("--target", default="localhost:50051")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("command", nargs=argparse.REMAINDER, help="service command (after --)")
+    args = parser.parse_args()
+    command = [c for c in args.command if c != "--"] or ["./entrypoint.sh"]
+    results = []
+
+    for run in range(args.runs):
+        spawned = time.perf_counter()
+        process = subprocess.Popen(command)
+
+        try:
+            answered = wait_first_rpc(args.target, args.timeout) is not None
+
+            if answered:
+                total = time.perf_counter() - spawned
+                results.append(total)
+                print(f"run {run + 1}: first RPC answered {total:.3f}s after spawn")
+
+            else:
+                print(f"run {run + 1}: no RPC answered within {args.timeout}s")
+
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+    if results:
+        print(f"time-to-first-RPC: median {statistics.median(results):.3f}s, min {min(results):.3f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# SPDX-FileCopyrightText: 2025 Maxim Selin <selinmax05@mail.ru>
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Local stand-in for Telegram's webhook delivery: posts recorded updates to a running
+notification-bot webhook listener and reports per-update acknowledgement latency.
+
+Usage (from services/notification-bot):
+    python -m bench.webhook_standin --url http://localhost:8443/telegram/webhook \\
+        --secret <NOTIFICATION_BOT_WEBHOOK_SECRET> [--updates recorded.jsonl] [--repeat N]
+
+Without --updates a synthetic /start, /status and /logout mix is posted.
+"""
+import argparse
+import http.client
+import json
+import statistics
+import time
+from urllib.parse import urlsplit
+
+def synthetic_updates(count=3):
+    """
+    Builds Telegram Update payloads for /start, /status and /logout from distinct users.
+
+    Parameters:
+    - count: int - number of users
+
+    Returns:
+    - list[dict]
+    """
+    updates = []
+    update_id = 1
+
+    for user_id in range(100000, 100000 + count):
+
+        for command in ("/start", "/status", "/logout"):
+            user = {"id": user_id, "is_bot": False, "first_name": f"user{user_id}"}
+            updates.append({
+                "update_id": update_id,
+                "message": {
+                    "message_id": update_id,
+                    "date": int(time.time()),
+                    "chat": {"id": user_id, "type": "private"},
+                    "from": user,
+                    "text": command,
+                    "entities": [{"type": "bot_command", "offset": 0, "length": len(command)}],
+                },
+            })
+            update_id += 1
+
+    return updates
+
+def load_updates(path):
+    """
+    Loads recorded updates (one Telegram Update JSON object per line).
+
+    Parameters:
+    - path: str
+
+    Returns:
+    - list[dict]
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def post_updates(url, secret, updates, repeat=1):
+    """
+    Posts updates over one keep-alive connection, like Telegram does.
+
+    Parameters:
+    - url: str - webhook URL
+    - secret: str - secret token header value
+    - updates: list[dict]
+    - repeat: int
+
+    Returns:
+    - tuple(list[float] latencies in ms, dict[int, int] status counts)
+    """
+    parts = urlsplit(url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=10)
+    headers = {"Content-Type": "application/json", "X-Telegram-Bot-Api-Secret-Token": secret}
+    latencies = []
+    statuses = {}
+
+    for _ in range(repeat):
+
+        for update in updates:
+            body = json.dumps(update).encode("utf-8")
+            start = time.perf_counter()
+            conn.request("POST", parts.path or "/", body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses[response.status] = statuses.get(response.status, 0) + 1
+
+    conn.close()
+    return latencies, statuses
+
+def main():
+    parser = argparse.ArgumentParser(description="Telegram webhook stand-in")
+    parser.add_argument("--url", default="http://localhost:8443/telegram/webhook")
+    parser.add_argument("--secret", required=True)
+    parser.add_argument("--updates", help="JSONL file with recorded updates")
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    updates = load_updates(args.updates) if args.updates else synthetic_updates()
+    latencies, statuses = post_updates(args.url, args.secret, updates, args.repeat)
+    latencies.sort()
+
+    print(f"posted {len(latencies)} updates, statuses: {statuses}")
+    print(f"ack latency ms: p50={statistics.median(latencies):.2f} max={latencies[-1]:.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,8 @@
 #!/bin/bash
 #
 # Entrypoint script for notification-bot container.
-# Performs gRPC Python code generation, sets up environment, and launches notification-bot.
+# Verifies the gRPC Python stubs generated at image build time still match the proto (failing
+# fast if not: grpcio-tools is not installed at runtime), sets up environment, and launches notification-bot.
 # All errors are surfaced with colored output for container systems/CI logs.
 #
 set -euo pipefail
@@ -22,20 +23,63 @@ success() { echo -e "${COLOR_SUCCESS}$1${COLOR_RESET}"; }
 # Ensure generated gRPC modules are prioritized in PYTHONPATH for runtime imports
 export PYTHONPATH="/app/src/api:${PYTHONPATH:-}"
 
-# Generate Python gRPC classes from proto files. Exits on failure.
+PROTO_FILE="./proto_context/service.proto"
+STUBS_DIR="./src/api"
+STUBS_HASH_FILE="${STUBS_DIR}/service_proto.sha256"
+
+# Prints the SHA-256 hash of the proto file the stubs are generated from.
+#
+# Parameters:
+# - None
+#
+# Returns:
+# - None (hash on stdout)
+proto_hash() {
+    sha256sum "$PROTO_FILE" | cut -d' ' -f1
+}
+
+# Checks whether both generated modules exist and were produced from the current proto file.
 #
 # Parameters:
 # - None
 #
 # Returns:
-# - None (generates Python files)
+# - 0: stubs up to date, 1: missing or stale
+stubs_up_to_date() {
+    [[ -f "${STUBS_DIR}/service_pb2.py" && -f "${STUBS_DIR}/service_pb2_grpc.py" && -f "$STUBS_HASH_FILE" ]] || return 1
+    [[ "$(cat "$STUBS_HASH_FILE")" == "$(proto_hash)" ]]
+}
+
+# Generate Python gRPC classes from proto files and record the proto hash. Exits on failure.
+#
+# Parameters:
+# - None
+#
+# Returns:
+# - None (generates Python files and hash file)
 run_codegen() {
     info "Generating Python gRPC code from proto..."
-    if poetry run python -m grpc_tools.protoc -I./proto_context/ --python_out=./src/api/ --grpc_python_out=./src/api/ ./proto_context/service.proto; then
+    if poetry run python -m grpc_tools.protoc -I./proto_context/ --python_out="$STUBS_DIR/" --grpc_python_out="$STUBS_DIR/" "$PROTO_FILE"; then
+        proto_hash > "$STUBS_HASH_FILE"
         success "gRPC Python code generated successfully"
     else
         error "Failed to generate gRPC code"
-        exit 1
+    fi
+}
+
+# Checks that the build-time stubs match the proto. The runtime image has no grpcio-tools,
+# so missing or stale stubs cannot be regenerated here and startup fails instead.
+#
+# Parameters:
+# - None
+#
+# Returns:
+# - None (exits on missing or stale stubs)
+ensure_codegen() {
+    if stubs_up_to_date; then
+        info "gRPC Python code is up to date (proto hash match)"
+    else
+        error "gRPC Python stubs are missing or stale for ${PROTO_FILE}; rebuild the image (./entrypoint.sh codegen runs at build time)"
     fi
 }
 
@@ -51,16 +95,50 @@ run_service() {
     exec poetry run python src/main.py
 }
 
+# Queries the standard gRPC health service of the running bot (container healthcheck).
+#
+# Parameters:
+# - None
+#
+# Returns:
+# - 0: SERVING (warm-up finished), 1: not ready, shutting down or unreachable
+run_healthcheck() {
+    exec poetry run python -c '
+import os, sys, grpc
+from grpc_health.v1 import health_pb2, health_pb2_grpc
+target = "localhost:" + os.environ.get("NOTIFICATION_BOT_PORT", "50051")
+if os.environ.get("GRPC_TCP_ENABLED", "true").lower() != "true":
+    target = "unix:" + os.environ["GRPC_UNIX_SOCKET"]
+try:
+    with grpc.insecure_channel(target) as channel:
+        status = health_pb2_grpc.HealthStub(channel).Check(health_pb2.HealthCheckRequest(), timeout=3).status
+except grpc.RpcError:
+    sys.exit(1)
+sys.exit(0 if status == health_pb2.HealthCheckResponse.SERVING else 1)
+'
+}
+
 # Main orchestration entrypoint.
 #
 # Parameters:
-# - $@: array - command-line arguments (will be ignored)
+# - $1: string - "codegen" to only generate stubs (image build), "healthcheck" to probe readiness,
+#   anything else starts the service
 #
 # Returns:
 # - None
 main() {
-    run_codegen
-    run_service
+    case "${1:-}" in
+        codegen)
+            run_codegen
+            ;;
+        healthcheck)
+            run_healthcheck
+            ;;
+        *)
+            ensure_codegen
+            run_service
+            ;;
+    esac
 }
 
 main "$@"
@@ -2,6 +2,7 @@
 #
 # SPDX-License-Identifier: MIT
 
-from .server import serve
+from .server import serve, start_server, ServerThread
+from .health import Readiness
 
-__all__ = ["serve"]
+__all__ = ["serve", "start_server", "ServerThread", "Readiness"]
@@ -0,0 +1,124 @@
+# SPDX-FileCopyrightText: 2025 Maxim Selin <selinmax05@mail.ru>
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Readiness of notification-bot, published through the standard gRPC health service
+(grpc.health.v1.Health). The server reports NOT_SERVING, and rejects contact and auth calls
+with UNAVAILABLE, until the warm-up phase marks it ready; on shutdown it goes back to
+NOT_SERVING for good, so orchestrators stop routing before ingress closes.
+"""
+import asyncio
+import threading
+from grpc_health.v1 import health, health_pb2, health_pb2_grpc
+from . import service_pb2
+from .. import startup_profile
+from ..logger import get_logger
+
+logger = get_logger("health")
+
+SERVICE_NAME = service_pb2.DESCRIPTOR.services_by_name["NotificationDelivery"].full_name
+
+class Readiness:
+    """
+    Ready flag shared between the warm-up (Telegram loop) and the gRPC server (its own loop in
+    threaded mode); health status updates always run on the gRPC loop.
+    """
+
+    def __init__(self, ready=False):
+        """
+        Parameters:
+        - ready: bool - initial state (True serves immediately, e.g. in benchmarks)
+
+        Returns:
+        - Readiness
+        """
+        self.ready = ready
+        self._shutting_down = False
+        self._health = None
+        self._loop = None
+        self._lock = threading.Lock()
+
+    async def bind(self, server):
+        """
+        Registers the health service on a gRPC server and publishes the current state.
+        Called on the gRPC server's loop before the server starts.
+
+        Parameters:
+        - server: grpc.aio.Server
+
+        Returns:
+        - None
+        """
+        servicer = health.aio.HealthServicer()
+        health_pb2_grpc.add_HealthServicer_to_server(servicer, server)
+
+        with self._lock:
+            self._health = servicer
+            self._loop = asyncio.get_running_loop()
+
+        await self._publish()
+
+    async def mark_ready(self):
+        """
+        Marks the process ready and reports SERVING (awaitable from any loop; no-op once shutting down).
+
+        Parameters:
+        - None
+
+        Returns:
+        - None
+        """
+        with self._lock:
+
+            if self._shutting_down:
+                return
+
+            self.ready = True
+
+        logger.info("Notification service ready")
+        startup_profile.mark("ready")
+        await self._run_on_server_loop()
+
+    async def mark_shutting_down(self):
+        """
+        Reports NOT_SERVING permanently and rejects new contact and auth calls (awaitable from any loop).
+
+        Parameters:
+        - None
+
+        Returns:
+        - None
+        """
+        with self._lock:
+            self.ready = False
+            self._shutting_down = True
+
+        await self._run_on_server_loop()
+
+    async def _run_on_server_loop(self):
+        with self._lock:
+            loop = self._loop
+
+        if loop is None:
+            # not bound yet: bind() publishes the state
+            return
+
+        if loop is asyncio.get_running_loop():
+            await self._publish()
+
+        elif not loop.is_closed():
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self._publish(), loop))
+
+    async def _publish(self):
+        with self._lock:
+            ready, shutting_down = self.ready, self._shutting_down
+
+        if shutting_down:
+            await self._health.enter_graceful_shutdown()
+            return
+
+        status = health_pb2.HealthCheckResponse.SERVING if ready else health_pb2.HealthCheckResponse.NOT_SERVING
+
+        for service in ("", SERVICE_NAME):
+            await self._health.set(service, status)
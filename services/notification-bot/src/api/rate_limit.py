@@ -0,0 +1,149 @@
+# SPDX-FileCopyrightText: 2025 Maxim Selin <selinmax05@mail.ru>
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Inbound rate limiting for DeliverContactMessage: a token bucket per sender (client IP forwarded
+by app-service in `x-client-ip` metadata, else a hash of the contact email) kept in a bounded
+LRU table, plus a global bucket capping what reaches the delivery pipeline.
+"""
+import time
+import hashlib
+from collections import OrderedDict
+
+CLIENT_IP_METADATA = "x-client-ip"
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at `rate` tokens per second up to `burst`.
+    """
+
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, burst: float, now: float):
+        self.tokens = float(burst)
+        self.updated = now
+
+    def refill(self, rate: float, burst: float, now: float) -> float:
+        """
+        Parameters:
+        - rate: float - tokens per second
+        - burst: float - bucket capacity
+        - now: float - time.monotonic()
+
+        Returns:
+        - float - tokens available
+        """
+        self.tokens = min(burst, self.tokens + (now - self.updated) * rate)
+        self.updated = now
+        return self.tokens
+
+class ContactRateLimiter:
+    """
+    Per-sender and global token buckets. Called from the gRPC event loop only; allow() does not
+    await, so no lock is needed.
+    """
+
+    def __init__(self, rate_per_minute=5.0, burst=3, global_rate_per_minute=120.0, global_burst=30, max_keys=10000):
+        """
+        Parameters:
+        - rate_per_minute: float - per-sender refill rate (0 disables the per-sender limit)
+        - burst: int - per-sender capacity
+        - global_rate_per_minute: float - refill rate over all senders (0 disables the global limit)
+        - global_burst: int - global capacity
+        - max_keys: int - sender buckets kept; the least recently seen is evicted beyond that
+
+        Returns:
+        - ContactRateLimiter
+        """
+        self.rate = rate_per_minute / 60
+        self.burst = burst
+        self.global_rate = global_rate_per_minute / 60
+        self.global_burst = global_burst
+        self.max_keys = max_keys
+        self.rejected_total = 0
+        self._buckets = OrderedDict()
+        self._global = TokenBucket(global_burst, time.monotonic())
+
+    def __len__(self) -> int:
+        """
+        Returns:
+        - int - sender buckets currently kept
+        """
+        return len(self._buckets)
+
+    def allow(self, key: str):
+        """
+        Takes one token from the sender's bucket and the global bucket, or none if either is empty.
+
+        Parameters:
+        - key: str - sender fingerprint
+
+        Returns:
+        - str|None - None if allowed, else the exhausted limit ("sender" or "global")
+        """
+        now = time.monotonic()
+        bucket = None
+
+        if self.rate > 0:
+            bucket = self._buckets.get(key)
+
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(self.burst, now)
+
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+
+            else:
+                self._buckets.move_to_end(key)
+
+            if bucket.refill(self.rate, self.burst, now) < 1:
+                self.rejected_total += 1
+                return "sender"
+
+        if self.global_rate > 0 and self._global.refill(self.global_rate, self.global_burst, now) < 1:
+            self.rejected_total += 1
+            return "global"
+
+        if bucket is not None:
+            bucket.tokens -= 1
+
+        if self.global_rate > 0:
+            self._global.tokens -= 1
+
+        return None
+
+def sender_key(email: str, metadata) -> str:
+    """
+    Builds the sender fingerprint: the client IP from gRPC metadata, else a hash of the email
+    (so raw addresses are not kept in memory).
+
+    Parameters:
+    - email: str
+    - metadata: sequence of (key, value) - grpc invocation metadata
+
+    Returns:
+    - str
+    """
+    for key, value in metadata or ():
+
+        if key == CLIENT_IP_METADATA and value:
+            return "ip:" + value.strip()
+
+    return "email:" + hashlib.sha256(email.strip().lower().encode("utf-8")).hexdigest()[:32]
+
+def build_rate_limiter(config):
+    """
+    Parameters:
+    - config: object - contact_rate_* settings
+
+    Returns:
+    - ContactRateLimiter
+    """
+    return ContactRateLimiter(
+        rate_per_minute=getattr(config, "contact_rate_per_minute", 5.0),
+        burst=getattr(config, "contact_rate_burst", 3),
+        global_rate_per_minute=getattr(config, "contact_global_rate_per_minute", 120.0),
+        global_burst=getattr(config, "contact_global_rate_burst", 30),
+        max_keys=getattr(config, "contact_rate_max_keys", 10000),
+    )
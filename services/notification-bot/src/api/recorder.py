@@ -0,0 +1,224 @@
+# SPDX-FileCopyrightText: 2025 Maxim Selin <selinmax05@mail.ru>
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Opt-in recorder of inbound gRPC traffic for capacity testing (replayed by bench.replay).
+
+A recording is a binary file: a header (magic, format version, wall-clock start) followed by
+fixed-size little-endian records, one per DeliverContactMessage / AuthorizeWebappUser arrival:
+
+    delta_us  uint64  microseconds since the previous record (or the header)
+    kind      uint8   KIND_CONTACT | KIND_AUTH
+    subject   uint32  pseudonymous sender (contact) or user (auth); 0 = missing/invalid token
+    name_len  uint16  contact name length (characters)
+    body_len  uint32  contact body length (characters)
+    timeout   uint32  caller's deadline in milliseconds (0 = none)
+
+No content is kept: names, emails and bodies are reduced to lengths, and senders and users to
+32-bit keyed hashes whose key lives only in memory for the recording, so the same sender keeps
+its pseudonym within a file but it cannot be mapped back to an address or Telegram id.
+
+Gaps between arrivals are kept exactly (uint64 microseconds never overflows in practice). Format
+version 1 stored delta_us as uint32, which clamped gaps longer than about 71.6 minutes; such files
+are still readable, with those idle periods shortened.
+"""
+import os
+import time
+import struct
+import hashlib
+import threading
+from src.logger import get_logger
+
+logger = get_logger("recorder")
+
+MAGIC = b"NBRC"
+VERSION = 2
+HEADER = struct.Struct("<4sBQ")
+RECORD = struct.Struct("<QBIHII")
+# record layout per readable format version
+RECORDS = {1: struct.Struct("<IBIHII"), VERSION: RECORD}
+KIND_CONTACT = 1
+KIND_AUTH = 2
+
+class TrafficRecorder:
+    """
+    Appends anonymized arrival records to a recording file. Disabled (no-op) without an output
+    directory; stops on its own once the file reaches max_bytes.
+    """
+
+    def __init__(self, output_dir=None, max_bytes=64 * 1024 * 1024):
+        """
+        Parameters:
+        - output_dir: str|None - directory receiving the recording; None disables recording
+        - max_bytes: int - recording size cap
+
+        Returns:
+        - TrafficRecorder
+        """
+        self.path = None
+        self.records = 0
+        self.max_bytes = max_bytes
+        self._file = None
+        self._size = 0
+        self._last_ns = 0
+        self._key = os.urandom(16)
+        self._lock = threading.Lock()
+
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+            self.path = os.path.join(output_dir, f"grpc-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.nbrec")
+            self._file = open(self.path, "wb", buffering=64 * 1024)
+            self._file.write(HEADER.pack(MAGIC, VERSION, time.time_ns() // 1_000_000))
+            self._size = HEADER.size
+            self._last_ns = time.monotonic_ns()
+            logger.info("Recording gRPC traffic", extra={"recording": self.path})
+
+    @property
+    def enabled(self) -> bool:
+        return self._file is not None
+
+    def pseudonym(self, value) -> int:
+        """
+        Keyed 32-bit hash of a sender key or user id (never 0).
+
+        Parameters:
+        - value: str|int
+
+        Returns:
+        - int
+        """
+        digest = hashlib.blake2b(str(value).encode("utf-8"), digest_size=4, key=self._key).digest()
+        return int.from_bytes(digest, "little") or 1
+
+    def record_contact(self, sender: str, name: str, body: str, timeout):
+        """
+        Parameters:
+        - sender: str - rate limiter sender key (client IP or email hash)
+        - name: str
+        - body: str
+        - timeout: float|None - seconds left until the caller's deadline
+
+        Returns:
+        - None
+        """
+        if self._file is not None:
+            self._append(KIND_CONTACT, self.pseudonym(sender), min(len(name or ""), 0xFFFF), len(body or ""), timeout)
+
+    def record_auth(self, user_id, timeout):
+        """
+        Parameters:
+        - user_id: int|None - decrypted Telegram id; None for a missing or undecryptable token
+        - timeout: float|None - seconds left until the caller's deadline
+
+        Returns:
+        - None
+        """
+        if self._file is not None:
+            self._append(KIND_AUTH, 0 if user_id is None else self.pseudonym(user_id), 0, 0, timeout)
+
+    def _append(self, kind, subject, name_len, body_len, timeout):
+        now = time.monotonic_ns()
+        timeout_ms = 0 if timeout is None else max(1, min(int(timeout * 1000), 0xFFFFFFFF))
+
+        with self._lock:
+
+            if self._file is None:
+                return
+
+            delta_us = (now - self._last_ns) // 1000
+            self._last_ns = now
+            self._file.write(RECORD.pack(delta_us, kind, subject, name_len, min(body_len, 0xFFFFFFFF), timeout_ms))
+            self._size += RECORD.size
+            self.records += 1
+
+            if self._size + RECORD.size > self.max_bytes:
+                logger.warning("gRPC recording reached its size cap, stopped", extra={"recording": self.path, "records": self.records})
+                self._close()
+
+    def close(self):
+        """
+        Flushes and closes the recording.
+
+        Parameters:
+        - None
+
+        Returns:
+        - None
+        """
+        with self._lock:
+            self._close()
+
+    def _close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            logger.info("gRPC recording closed", extra={"recording": self.path, "records": self.records})
+
+def read_recording(path):
+    """
+    Reads a recording.
+
+    Parameters:
+    - path: str
+
+    Returns:
+    - tuple(int, list[tuple]) - wall-clock start (unix ms) and records as
+      (offset_s, kind, subject, name_len, body_len, timeout_ms), offset_s counted from the start
+
+    Raises:
+    - ValueError if the file is not a recording of a supported version
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    if len(data) < HEADER.size:
+        raise ValueError(f"Not a gRPC recording: {path}")
+
+    magic, version, started_ms = HEADER.unpack_from(data)
+    record = RECORDS.get(version)
+
+    if magic != MAGIC or record is None:
+        raise ValueError(f"Not a gRPC recording (or unsupported version {version}): {path}")
+
+    records = []
+    offset_us = 0
+    # a truncated tail (process killed mid-write) is ignored
+    end = HEADER.size + (len(data) - HEADER.size) // record.size * record.size
+
+    for delta_us, kind, subject, name_len, body_len, timeout_ms in record.iter_unpack(data[HEADER.size:end]):
+        offset_us += delta_us
+        records.append((offset_us / 1_000_000, kind, subject, name_len, body_len, timeout_ms))
+
+    return started_ms, records
+
+_recorder = TrafficRecorder()
+
+def configure_recorder(config):
+    """
+    Replaces the global recorder according to config (grpc_record_dir, grpc_record_max_bytes).
+
+    Parameters:
+    - config: object
+
+    Returns:
+    - TrafficRecorder
+    """
+    global _recorder
+    _recorder = TrafficRecorder(
+        output_dir=getattr(config, "grpc_record_dir", None) or None,
+        max_bytes=getattr(config, "grpc_record_max_bytes", 64 * 1024 * 1024),
+    )
+    return _recorder
+
+def get_recorder() -> TrafficRecorder:
+    """
+    Returns the process-wide recorder (no-op until configure_recorder is called with a directory).
+
+    Parameters:
+    - None
+
+    Returns:
+    - TrafficRecorder
+    """
+    return _recorder
@@ -9,34 +9,60 @@ Implements NotificationDeliveryServicer from service_pb2_grpc.
 
 import grpc
 import grpc.aio
+import hmac
+import os
+import stat
+import asyncio
 import logging
+import threading
 import traceback
 from concurrent import futures
 from . import service_pb2
 from . import service_pb2_grpc
 from ..errors import NotificationException
 from ..handlers import user_auth_manager, decrypt_uid
+from ..tracing import get_tracer
+from ..profiler import get_profiler
+from ..memory_trace import get_memory_tracer
+from ..loop_monitor import start_loop_monitor, get_loop_lag_stats
+from .rate_limit import build_rate_limiter, sender_key
+from .recorder import get_recorder
+from .health import Readiness
+from .. import startup_profile
 
 logger = logging.getLogger(__name__)
 
+ADMIN_KEY_METADATA = "x-admin-key"
+AUTH_INFLIGHT_MAX = 1024
+# Budget (seconds) kept back from every stage so the status still reaches the caller before its deadline;
+# a stage is not started with less than this left
+DEADLINE_MARGIN = 0.05
+
 class NotificationService(service_pb2_grpc.NotificationDeliveryServicer):
     """
     Main gRPC API implementation for notification-bot business logic.
     Exposes async endpoints for Telegram WebApp user authorization and contact message delivery.
     """
 
-    def __init__(self, config, handler):
+    def __init__(self, config, handler, readiness):
         """
         Initialize service with domain handler (delivers messages, manages auth).
 
         Parameters:
         - handler: object - provides deliver_contact_message(), etc
+        - readiness: Readiness - contact and auth calls are rejected until ready
 
         Returns:
         - NotificationService instance
         """
         self.config = config
         self.handler = handler
+        self.readiness = readiness
+        self.rate_limiter = build_rate_limiter(config)
+        # user_id -> [task authorizing it, waiting callers]; duplicate concurrent calls await the same task
+        self._auth_inflight = {}
+        get_memory_tracer().add_probe("delivery", handler.memory_stats)
+        get_memory_tracer().add_probe("grpc", self.memory_stats)
 
         if not hasattr(handler, "user_auth_manager") or handler.user_auth_manager is None:
             logger.error("NotificationService initialized with handler lacking user_auth_manager")
@@ -45,6 +71,10 @@ class NotificationService(service_pb2_grpc.NotificationDeliveryServicer):
         """
         Handles gRPC WebApp user authorization request from app-service.
         Decrypts user_id, optionally sends success notification, and registers authorization.
+        Rejected with UNAVAILABLE until the warm-up phase has marked the service ready.
+        Concurrent calls for the same user (reloads, double taps) share one in-flight authorization,
+        so the success message is sent and the user stored once. Each caller waits at most until its
+        deadline; the authorization is cancelled once every caller has given up.
 
         Parameters:
         - request: WebappUserAuthRequest (protobuf, includes `euid`)
@@ -53,45 +83,153 @@ class NotificationService(service_pb2_grpc.NotificationDeliveryServicer):
         Returns:
         - WebappUserAuthResponse (protobuf): success/error status and error_message if failed
         """
+        if not self.readiness.ready:
+            await context.abort(grpc.StatusCode.UNAVAILABLE, "Notification service is not ready")
+
         euid = getattr(request, 'euid', None)
 
         if not euid:
+            get_recorder().record_auth(None, context.time_remaining())
             await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "Missing euid (encrypted user_id)")
 
         try:
             secret = self.config.webapp_token_secret
             logger.info(f"Decrypting euid: {euid}")   
             user_id = decrypt_uid(euid, secret)
+            get_recorder().record_auth(user_id, context.time_remaining())
 
         except Exception as ex:
+            get_recorder().record_auth(None, context.time_remaining())
             logger.warning(f"Failed to decrypt euid for auth: {ex}\n" + traceback.format_exc())
             await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "Invalid euid or decryption failed: " + str(ex))
 
         try:
-            auth_manager = self.handler.user_auth_manager
-            already_auth = auth_manager.is_authorized(int(user_id))
-
-            # Call notification for first successful authorization
-            if not already_auth:
-
-                try:
-                    await self.handler.send_success_auth_notification(int(user_id))
-
-                except Exception as nerr:
-                    logger.warning(f"Failed to send Telegram success notification: {nerr}")
-
-            auth_manager.authorize(int(user_id))
-            logger.info("User authorized via WebApp")
+            await self._await_authorization(int(user_id), context)
             return service_pb2.WebappUserAuthResponse(success=True, error_message="")
 
+        except grpc.aio.AbortError:
+            raise
+
         except Exception as ex:
             logger.error(f"Exception in user authorization: {ex}\n" + traceback.format_exc())
             await context.abort(grpc.StatusCode.UNKNOWN, "Authorization exception: " + str(ex))
 
+    async def _await_authorization(self, user_id: int, context):
+        """
+        Joins the in-flight authorization for user_id, starting one if there is none, and waits for
+        it within the caller's deadline. The entry is removed when the task completes; beyond
+        AUTH_INFLIGHT_MAX concurrent users calls are not coalesced. When the last waiting caller
+        times out or cancels, the task is cancelled.
+
+        Parameters:
+        - user_id: int
+        - context: grpc.aio.ServicerContext
+
+        Returns:
+        - None
+        """
+        entry = self._auth_inflight.get(user_id)
+
+        if entry is None:
+            entry = [asyncio.ensure_future(self._authorize(user_id)), 0]
+
+            if len(self._auth_inflight) < AUTH_INFLIGHT_MAX:
+                self._auth_inflight[user_id] = entry
+                entry[0].add_done_callback(lambda _: self._forget_authorization(user_id, entry))
+
+        else:
+            logger.info("Coalesced concurrent WebApp authorization")
+
+        task = entry[0]
+        entry[1] += 1
+
+        try:
+            # shield: a caller going away must not cancel the authorization other callers share
+            await self._run_stage(context, "authorization", lambda: asyncio.shield(task))
+
+        finally:
+            entry[1] -= 1
+
+            if not entry[1] and not task.done():
+                self._forget_authorization(user_id, entry)
+                task.cancel()
+                logger.warning("WebApp authorization abandoned by all callers, cancelled")
+
+    def _forget_authorization(self, user_id: int, entry):
+
+        if self._auth_inflight.get(user_id) is entry:
+            del self._auth_inflight[user_id]
+
+    async def _run_stage(self, context, stage: str, start):
+        """
+        Runs one request stage within the caller's remaining deadline (less DEADLINE_MARGIN). A stage
+        that cannot finish in time is not started, one that overruns is abandoned; both abort with
+        DEADLINE_EXCEEDED.
+        Client cancellation cancels the awaited stage.
+
+        Parameters:
+        - context: grpc.aio.ServicerContext
+        - stage: str - stage name for logs and the error message
+        - start: callable() -> awaitable - starts the stage
+
+        Returns:
+        - stage result
+        """
+        remaining = context.time_remaining()
+
+        if remaining is not None:
+
+            if remaining <= DEADLINE_MARGIN:
+                logger.warning("Deadline too close, skipping stage", extra={"stage": stage, "time_remaining": remaining})
+                await context.abort(grpc.StatusCode.DEADLINE_EXCEEDED, f"Deadline exceeded before {stage}")
+
+            remaining -= DEADLINE_MARGIN
+
+        try:
+            return await asyncio.wait_for(start(), remaining)
+
+        except asyncio.TimeoutError:
+            logger.warning("Deadline exceeded, stage abandoned", extra={"stage": stage})
+            await context.abort(grpc.StatusCode.DEADLINE_EXCEEDED, f"Deadline exceeded during {stage}")
+
+        except asyncio.CancelledError:
+            logger.info("Call cancelled by client", extra={"stage": stage})
+            raise
+
+    async def _authorize(self, user_id: int):
+        """
+        Sends the success notification on first authorization and stores the user (DB calls off-loop).
+
+        Parameters:
+        - user_id: int
+
+        Returns:
+        - None
+        """
+        auth_manager = self.handler.user_auth_manager
+        already_auth = await asyncio.to_thread(auth_manager.is_authorized, user_id)
+
+        # Call notification for first successful authorization
+        if not already_auth:
+
+            try:
+                await self.handler.send_success_auth_notification(user_id)
+
+            except Exception as nerr:
+                logger.warning(f"Failed to send Telegram success notification: {nerr}")
+
+        await asyncio.to_thread(auth_manager.authorize, user_id)
+        logger.info("User authorized via WebApp")
+
     async def DeliverContactMessage(self, request, context):
         """
         Handles gRPC contact message delivery from app-service (site visitor/user).
         Validates request and enqueues delivery to all authorized Telegram users.
+        Opens the ingress trace span, continuing a `traceparent` from gRPC metadata if present.
+        Senders over their rate limit, or calls over the global ceiling, are rejected with
+        RESOURCE_EXHAUSTED before any DB or queue work. The recipient query runs within the
+        caller's deadline; nothing is enqueued for a call that expired or was cancelled.
+        Rejected with UNAVAILABLE until the warm-up phase has marked the service ready.
 
         Parameters:
         - request: ContactMessageRequest (protobuf) — includes `name`, `email`, `body`
@@ -105,37 +243,338 @@ class NotificationService(service_pb2_grpc.NotificationDeliveryServicer):
         body = getattr(request, 'body', None)
         logger.info(f"gRPC DeliverContactMessage called", extra={"contact_name": name, "contact_email": email})
 
-        if not (name and email and body):
-            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "Missing required fields (name, email, body)")
+        if not self.readiness.ready:
+            await context.abort(grpc.StatusCode.UNAVAILABLE, "Notification service is not ready")
 
-        try:
-            self.handler.deliver_contact_message(name, email, body)
-            logger.info("Notification delivered successfully", extra={"contact_name": name, "contact_email": email})
-            return service_pb2.ContactMessageResponse(success=True, error_message="")
+        sender = sender_key(email or "", context.invocation_metadata())
+        get_recorder().record_contact(sender, name, body, context.time_remaining())
 
-        except NotificationException as e:
-            logger.error(f"Business error while delivering contact message: {e}", exc_info=True)
-            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        with get_tracer().start_trace("grpc.DeliverContactMessage", context.invocation_metadata()) as span:
 
-        except Exception as ex:
-            logger.error(f"Internal error in DeliverContactMessage: {ex}", exc_info=True)
-            await context.abort(grpc.StatusCode.INTERNAL, "Internal server error")
+            if not (name and email and body):
+                await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "Missing required fields (name, email, body)")
+
+            limited = self.rate_limiter.allow(sender)
+
+            if limited:
+                span.set_attribute("rate_limited", limited)
+                logger.warning("DeliverContactMessage rate limited", extra={"rate_limit": limited, "rejected_total": self.rate_limiter.rejected_total})
+                await context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, "Too many contact messages, try again later")
+
+            try:
+                recipients = await self._run_stage(
+                    context, "recipient query", lambda: asyncio.to_thread(self.handler.authorized_recipients, span.context())
+                )
+                self.handler.deliver_contact_message(name, email, body, trace_parent=span.context(), recipients=recipients)
+                logger.info("Notification delivered successfully", extra={"contact_name": name, "contact_email": email})
+                return service_pb2.ContactMessageResponse(success=True, error_message="")
+
+            except grpc.aio.AbortError:
+                raise
+
+            except NotificationException as e:
+                logger.error(f"Business error while delivering contact message: {e}", exc_info=True)
+                await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+
+            except Exception as ex:
+                logger.error(f"Internal error in DeliverContactMessage: {ex}", exc_info=True)
+                await context.abort(grpc.StatusCode.INTERNAL, "Internal server error")
+
+    async def GetPipelineStats(self, request, context):
+        """
+        Admin RPC: returns delivery queue depth, oldest item age, rolling send/error rates and event-loop lag.
+        Callers authenticate with the admin key (same value as admin_key) in `x-admin-key` metadata.
+
+        Parameters:
+        - request: PipelineStatsRequest (protobuf, empty)
+        - context: grpc.aio.ServicerContext
+
+        Returns:
+        - PipelineStatsResponse (protobuf)
+        """
+        if not self._is_admin(context):
+            logger.warning("GetPipelineStats called without a valid admin key")
+            await context.abort(grpc.StatusCode.PERMISSION_DENIED, "Admin key required")
+
+        return service_pb2.PipelineStatsResponse(
+            **self.handler.pipeline_stats(),
+            loop_lag=[service_pb2.LoopLag(**stats) for stats in get_loop_lag_stats()],
+        )
+
+    async def StartProfiler(self, request, context):
+        """
+        Admin RPC: starts a sampling profiler session covering all threads (no-op if one is running).
+
+        Parameters:
+        - request: StartProfilerRequest (protobuf) - duration_seconds, interval_ms (0 = defaults)
+        - context: grpc.aio.ServicerContext
+
+        Returns:
+        - ProfilerStatus (protobuf)
+        """
+        if not self._is_admin(context):
+            logger.warning("StartProfiler called without a valid admin key")
+            await context.abort(grpc.StatusCode.PERMISSION_DENIED, "Admin key required")
+
+        profiler = get_profiler()
+        interval = request.interval_ms / 1000 if request.interval_ms > 0 else None
+        profiler.start(duration=request.duration_seconds or None, interval=interval)
+        return service_pb2.ProfilerStatus(running=profiler.running, samples=profiler.samples, output_path=profiler.last_output)
+
+    async def StopProfiler(self, request, context):
+        """
+        Admin RPC: stops the running profiler session and returns the collapsed-stack file path.
+
+        Parameters:
+        - request: StopProfilerRequest (protobuf, empty)
+        - context: grpc.aio.ServicerContext
+
+        Returns:
+        - ProfilerStatus (protobuf)
+        """
+        if not self._is_admin(context):
+            logger.warning("StopProfiler called without a valid admin key")
+            await context.abort(grpc.StatusCode.PERMISSION_DENIED, "Admin key required")
+
+        profiler = get_profiler()
+        await asyncio.to_thread(profiler.stop)
+        return service_pb2.ProfilerStatus(running=profiler.running, samples=profiler.samples, output_path=profiler.last_output)
+
+    async def StartMemoryTrace(self, request, context):
+        """
+        Admin RPC: starts tracemalloc allocation tracing (no-op if already tracing).
+
+        Parameters:
+        - request: StartMemoryTraceRequest (protobuf) - frames (0 = default)
+        - context: grpc.aio.ServicerContext
+
+        Returns:
+        - MemoryTraceStatus (protobuf)
+        """
+        if not self._is_admin(context):
+            logger.warning("StartMemoryTrace called without a valid admin key")
+            await context.abort(grpc.StatusCode.PERMISSION_DENIED, "Admin key required")
+
+        tracer = get_memory_tracer()
+        tracer.start(frames=request.frames or None)
+        return service_pb2.MemoryTraceStatus(**tracer.status())
+
+    async def TakeMemorySnapshot(self, request, context):
+        """
+        Admin RPC: writes a memory report (taken off the event loop) and returns its path.
 
-async def serve(config, handler):
+        Parameters:
+        - request: MemorySnapshotRequest (protobuf) - top (0 = default)
+        - context: grpc.aio.ServicerContext
+
+        Returns:
+        - MemoryTraceStatus (protobuf)
+        """
+        if not self._is_admin(context):
+            logger.warning("TakeMemorySnapshot called without a valid admin key")
+            await context.abort(grpc.StatusCode.PERMISSION_DENIED, "Admin key required")
+
+        tracer = get_memory_tracer()
+        path = await asyncio.to_thread(tracer.snapshot, request.top or None)
+        return service_pb2.MemoryTraceStatus(output_path=path, **tracer.status())
+
+    async def StopMemoryTrace(self, request, context):
+        """
+        Admin RPC: stops allocation tracing.
+
+        Parameters:
+        - request: StopMemoryTraceRequest (protobuf, empty)
+        - context: grpc.aio.ServicerContext
+
+        Returns:
+        - MemoryTraceStatus (protobuf)
+        """
+        if not self._is_admin(context):
+            logger.warning("StopMemoryTrace called without a valid admin key")
+            await context.abort(grpc.StatusCode.PERMISSION_DENIED, "Admin key required")
+
+        tracer = get_memory_tracer()
+        await asyncio.to_thread(tracer.stop)
+        return service_pb2.MemoryTraceStatus(**tracer.status())
+
+    def memory_stats(self) -> dict:
+        """
+        Sizes of the service's long-lived tables (memory report probe).
+
+        Parameters:
+        - None
+
+        Returns:
+        - dict
+        """
+        return {
+            "rate_limiter_keys": len(self.rate_limiter),
+            "auth_inflight": len(self._auth_inflight),
+        }
+
+    def _is_admin(self, context):
+        """
+        Checks the `x-admin-key` metadata against the configured admin key (constant time).
+
+        Parameters:
+        - context: grpc.aio.ServicerContext
+
+        Returns:
+        - bool
+        """
+        expected = "".join((self.config.admin_key or "").split())
+
+        if not expected:
+            return False
+
+        for key, value in context.invocation_metadata() or ():
+
+            if key == ADMIN_KEY_METADATA and isinstance(value, str):
+                return hmac.compare_digest("".join(value.split()).encode(), expected.encode())
+
+        return False
+
+async def start_server(config, handler, readiness=None):
     """
-    Entrypoint for async gRPC server; binds and serves NotificationService using asyncio event loop.
+    Builds, binds and starts the async gRPC server on the current event loop without blocking.
+    Listens on TCP notification_bot_port and/or the Unix domain socket grpc_unix_socket, and
+    serves the gRPC health service next to NotificationDelivery.
 
     Parameters:
     - config: Config (contains environment, port, etc)
     - handler: NotificationHandler (business logic, delivery, user tracking)
+    - readiness: Readiness|None - readiness set by the warm-up phase (None: ready immediately)
 
     Returns:
-    - None (runs gRPC server until termination)
+    - grpc.aio.Server - started server (caller owns its shutdown)
     """
+    readiness = readiness or Readiness(ready=True)
     server = grpc.aio.server()
-    service = NotificationService(config, handler)
+    service = NotificationService(config, handler, readiness)
     service_pb2_grpc.add_NotificationDeliveryServicer_to_server(service, server)
-    server.add_insecure_port(f'[::]:{config.notification_bot_port}')
+    await readiness.bind(server)
+    listeners = []
+
+    if getattr(config, "grpc_tcp_enabled", True):
+        listeners.append(f'[::]:{config.notification_bot_port}')
+
+    if getattr(config, "grpc_unix_socket", ""):
+        _prepare_unix_socket(config.grpc_unix_socket)
+        listeners.append(f'unix:{config.grpc_unix_socket}')
+
+    for address in listeners:
+        server.add_insecure_port(address)
+
     await server.start()
-    logger.info(f'Notification gRPC Server started at {config.notification_bot_port}')
+    logger.info(f'Notification gRPC Server started at {", ".join(listeners)}')
+    startup_profile.mark("grpc_server_started")
+    return server
+
+def _prepare_unix_socket(path):
+    """
+    Creates the socket's directory and removes a stale socket left by a previous process
+    (binding fails while the file exists).
+
+    Parameters:
+    - path: str - socket path
+
+    Returns:
+    - None
+
+    Raises:
+    - RuntimeError if the path exists and is not a socket
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    try:
+        mode = os.stat(path).st_mode
+
+    except FileNotFoundError:
+        return
+
+    if not stat.S_ISSOCK(mode):
+        raise RuntimeError(f"GRPC_UNIX_SOCKET path exists and is not a socket: {path}")
+
+    os.remove(path)
+
+class ServerThread:
+    """
+    Runs the async gRPC server on a dedicated daemon thread and event loop (threaded runtime mode),
+    and lets another loop stop it gracefully.
+    """
+
+    def __init__(self, config, handler, readiness=None):
+        """
+        Parameters:
+        - config: Config
+        - handler: NotificationHandler
+        - readiness: Readiness|None - see start_server
+
+        Returns:
+        - ServerThread
+        """
+        self.config = config
+        self.handler = handler
+        self.readiness = readiness
+        self._loop = None
+        self._server = None
+        self._thread = threading.Thread(target=self._run, name="grpc-server", daemon=True)
+
+    def start(self):
+        """
+        Starts the server thread.
+
+        Parameters:
+        - None
+
+        Returns:
+        - None
+        """
+        self._thread.start()
+
+    async def stop(self, grace):
+        """
+        Stops accepting RPCs and waits up to grace seconds for in-flight ones (awaitable from any loop).
+
+        Parameters:
+        - grace: float - seconds
+
+        Returns:
+        - None
+        """
+        if self._loop is None or self._server is None:
+            return
+
+        await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self._server.stop(grace), self._loop))
+        logger.info("Notification gRPC Server stopped")
+
+    def _run(self):
+        asyncio.run(self._serve())
+
+    async def _serve(self):
+        self._loop = asyncio.get_running_loop()
+        self._server = await start_server(self.config, self.handler, self.readiness)
+        monitor = start_loop_monitor("grpc", self.config)
+
+        try:
+            await self._server.wait_for_termination()
+
+        finally:
+
+            if monitor is not None:
+                await monitor.stop()
+
+async def serve(config, handler, readiness=None):
+    """
+    Entrypoint for async gRPC server; binds and serves NotificationService using asyncio event loop.
+
+    Parameters:
+    - config: Config (contains environment, port, etc)
+    - handler: NotificationHandler (business logic, delivery, user tracking)
+    - readiness: Readiness|None - see start_server
+
+    Returns:
+    - None (runs gRPC server until termination)
+    """
+    server = await start_server(config, handler, readiness)
     await server.wait_for_termination()
@@ -3,5 +3,7 @@
 # SPDX-License-Identifier: MIT
 
 from .builder import build_application
+from .processor import PerUserUpdateProcessor
 
-__all__ = ["build_application"]
+# WebhookServer is imported from src.bot.webhook on demand (webhook mode only)
+__all__ = ["build_application", "PerUserUpdateProcessor"]
@@ -0,0 +1,176 @@
+# SPDX-FileCopyrightText: 2025 Maxim Selin <selinmax05@mail.ru>
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Broadcast delivery for notification-bot: each notification is posted once to a private Telegram
+channel or group, and its membership follows the authorized set. Authorized users get a
+join-request invite link, join requests are approved only for authorized users, and users
+are removed from the chat on logout. The bot must be an admin allowed to invite and ban users.
+
+The invite link is created once per chat and kept in a small JSON state file, together with
+whether the users authorized before broadcast mode was enabled have been sent it.
+"""
+import os
+import html
+import json
+import asyncio
+from telegram import Update
+from telegram.error import TelegramError
+from telegram.ext import ContextTypes, ChatJoinRequestHandler
+from src.logger import get_logger
+
+logger = get_logger("broadcast")
+
+INVITE_LINK_NAME = "notification-bot"
+
+class BroadcastChannel:
+    """
+    Broadcast target chat and its membership synchronization.
+    """
+
+    def __init__(self, chat_id: int, state_path=None):
+        """
+        Parameters:
+        - chat_id: int - private channel/supergroup id (e.g. -1001234567890)
+        - state_path: str|None - JSON file keeping the invite link across restarts (None: in memory only)
+
+        Returns:
+        - BroadcastChannel
+        """
+        self.chat_id = chat_id
+        self.state_path = state_path
+        self.announced = False
+        self._invite_link = None
+        self._load_state()
+
+    async def invite_link(self, bot) -> str:
+        """
+        Returns the join-request invite link, creating (and persisting) it only if this chat has none yet.
+
+        Parameters:
+        - bot: telegram.Bot
+
+        Returns:
+        - str
+        """
+        if self._invite_link is None:
+            link = await bot.create_chat_invite_link(self.chat_id, name=INVITE_LINK_NAME, creates_join_request=True)
+            self._invite_link = link.invite_link
+            logger.info("Created broadcast invite link", extra={"broadcast_chat_id": self.chat_id})
+            await asyncio.to_thread(self._save_state)
+
+        return self._invite_link
+
+    @staticmethod
+    def invite_message(link: str) -> str:
+        """
+        Parameters:
+        - link: str - invite link
+
+        Returns:
+        - str - plain text telling an authorized user to join the broadcast chat (HTML-safe)
+        """
+        return f"Notifications from SiteCard are posted to the notification channel, request to join it here: {html.escape(link)}"
+
+    async def mark_announced(self):
+        """
+        Records that the users authorized before broadcast mode was enabled have been sent the link.
+
+        Parameters:
+        - None
+
+        Returns:
+        - None
+        """
+        self.announced = True
+        await asyncio.to_thread(self._save_state)
+
+    def _load_state(self):
+        """
+        Restores the invite link and announcement flag saved for this chat (state of another chat is ignored).
+
+        Parameters:
+        - None
+
+        Returns:
+        - None
+        """
+        if not self.state_path or not os.path.exists(self.state_path):
+            return
+
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+
+        except (OSError, ValueError) as ex:
+            logger.warning("Failed to read broadcast state, a new invite link will be created", extra={"error": str(ex)})
+            return
+
+        if state.get("chat_id") == self.chat_id:
+            self._invite_link = state.get("invite_link") or None
+            self.announced = bool(state.get("announced"))
+
+    def _save_state(self):
+        if not self.state_path:
+            return
+
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        tmp_path = f"{self.state_path}.tmp"
+
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"chat_id": self.chat_id, "invite_link": self._invite_link, "announced": self.announced}, f)
+
+        os.replace(tmp_path, self.state_path)
+
+    async def revoke(self, bot, user_id: int):
+        """
+        Removes a user from the chat (ban + unban, so a later authorization can rejoin).
+
+        Parameters:
+        - bot: telegram.Bot
+        - user_id: int
+
+        Returns:
+        - None
+        """
+        try:
+            await bot.ban_chat_member(self.chat_id, user_id)
+            await bot.unban_chat_member(self.chat_id, user_id, only_if_banned=True)
+            logger.info("Removed user from broadcast chat", extra={"broadcast_chat_id": self.chat_id})
+
+        except TelegramError as ex:
+            logger.warning("Failed to remove user from broadcast chat", extra={"broadcast_chat_id": self.chat_id, "error": str(ex)})
+
+    async def on_join_request(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """
+        Approves join requests from authorized users and declines all others.
+
+        Parameters:
+        - update: telegram.Update (chat_join_request)
+        - context: telegram.ext.ContextTypes.DEFAULT_TYPE
+
+        Returns:
+        - None
+        """
+        request = update.chat_join_request
+        user_auth_manager = context.bot_data.get("user_auth_manager")
+        authorized = bool(user_auth_manager) and await asyncio.to_thread(user_auth_manager.is_authorized, request.from_user.id)
+
+        if authorized:
+            await request.approve()
+            logger.info("Approved broadcast chat join request")
+
+        else:
+            await request.decline()
+            logger.info("Declined broadcast chat join request from unauthorized user")
+
+    def build_join_request_handler(self):
+        """
+        Parameters:
+        - None
+
+        Returns:
+        - ChatJoinRequestHandler for the broadcast chat
+        """
+        return ChatJoinRequestHandler(self.on_join_request, chat_id=self.chat_id)
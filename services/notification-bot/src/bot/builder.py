@@ -6,7 +6,10 @@
 Builder for initializing Telegram Application with handlers for notification-bot.
 """
 from telegram.ext import ApplicationBuilder, CommandHandler
-from .commands import start_handler, about_handler, logout_handler, build_logout_callback_handler, status_handler
+from .commands import start_handler, about_handler, logout_handler, build_logout_callback_handler, status_handler, stats_handler
+from .processor import PerUserUpdateProcessor
+from .transport import build_send_request, build_get_updates_request
+from .broadcast import BroadcastChannel
 from src.logger import get_logger
 from src.handlers import user_auth_manager
 
@@ -15,14 +18,25 @@ def build_application(config, user_auth_manager_instance=None):
     Initializes and configures all command/callback handlers for the Telegram bot.
 
     Parameters:
-    - config: object - config with notification_bot_token (string)
+    - config: object - config with notification_bot_token (string), telegram_api_base_url (string), bot_concurrent_updates (int), telegram_* transport settings
     - user_auth_manager_instance: object (optional) - DB/session manager for auth
 
     Returns:
     - telegram.ext.Application - application with all handlers/bot data set
     """
     logger = get_logger("builder")
-    application = ApplicationBuilder().token(config.notification_bot_token).build()
+    concurrent_updates = getattr(config, "bot_concurrent_updates", 1)
+    application = (
+        ApplicationBuilder()
+        .token(config.notification_bot_token)
+        .base_url(config.telegram_api_base_url)
+        .concurrent_updates(PerUserUpdateProcessor(concurrent_updates))
+        .request(build_send_request(config))
+        .get_updates_request(build_get_updates_request(config))
+        .build()
+    )
+    logger.info("Configured per-user update processor", extra={"concurrent_updates": concurrent_updates})
+    logger.info("Configured Bot API transport", extra={"pool_size": config.telegram_pool_size, "http2": config.telegram_http2})
     application.bot_data["config"] = config
 
     # Inject user authorization management
@@ -43,4 +57,14 @@ def build_application(config, user_auth_manager_instance=None):
     application.add_handler(CommandHandler("status", status_handler))
     logger.info("Registered /status handler")
 
+    application.add_handler(CommandHandler("stats", stats_handler))
+    logger.info("Registered /stats handler")
+
+    # Broadcast mode: one post per notification to a chat whose membership follows the authorized set
+    if getattr(config, "delivery_mode", "direct") == "broadcast":
+        channel = BroadcastChannel(config.broadcast_chat_id, getattr(config, "broadcast_state_path", None))
+        application.bot_data["broadcast_channel"] = channel
+        application.add_handler(channel.build_join_request_handler())
+        logger.info("Registered broadcast chat join request handler", extra={"broadcast_chat_id": config.broadcast_chat_id})
+
     return application
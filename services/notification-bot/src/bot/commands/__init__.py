@@ -6,5 +6,6 @@ from .start import start_handler
 from .about import about_handler
 from .logout import logout_handler, build_logout_callback_handler
 from .status import status_handler
+from .stats import stats_handler
 
-__all__ = ["start_handler", "about_handler", "logout_handler", "build_logout_callback_handler", "status_handler"]
+__all__ = ["start_handler", "about_handler", "logout_handler", "build_logout_callback_handler", "status_handler", "stats_handler"]
@@ -6,7 +6,7 @@
 About command handler for notification-bot. Details bot purpose, links, and metadata.
 """
 import platform
-import telegram
+from functools import lru_cache
 from datetime import datetime
 from telegram import Update
 from telegram.ext import ContextTypes
@@ -14,13 +14,26 @@ from src.logger import get_logger
 
 logger = get_logger("cmd.about")
 
-ABOUT_TEXT = (
-    "*Notification-Bot for SiteCard platform*\n\n"
-    "Delivers contact form notifications.\n"
-    f"\n*Python*: `{platform.python_version()}` | *PTB*: `{telegram.__version__}` "
-    "\n\nSupported commands: /start, /about, /logout, /status\n"
-    "Source & docs: [GitHub](https://github.com/Mournweiss/site-card)"
-)
+@lru_cache(maxsize=1)
+def get_about_text():
+    """
+    Builds the /about text once, on first request (keeps version lookups off the import path).
+
+    Parameters:
+    - None
+
+    Returns:
+    - str - Markdown text
+    """
+    import telegram
+
+    return (
+        "*Notification-Bot for SiteCard platform*\n\n"
+        "Delivers contact form notifications.\n"
+        f"\n*Python*: `{platform.python_version()}` | *PTB*: `{telegram.__version__}` "
+        "\n\nSupported commands: /start, /about, /logout, /status, /stats\n"
+        "Source & docs: [GitHub](https://github.com/Mournweiss/site-card)"
+    )
 
 async def about_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """
@@ -34,5 +47,5 @@ async def about_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     - None
     """
     logger.info("/about requested")
-    await update.message.reply_text(ABOUT_TEXT, parse_mode='Markdown')
+    await update.message.reply_text(get_about_text(), parse_mode='Markdown')
     return None
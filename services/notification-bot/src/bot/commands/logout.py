@@ -5,6 +5,7 @@
 """
 Logout command handler and confirmation dialog for notification-bot.
 """
+import asyncio
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes, CallbackQueryHandler
 from src.logger import get_logger
@@ -50,6 +51,7 @@ def build_logout_callback_handler():
     async def logout_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
         """
         Nested callback: handles Yes/No inline action, manages sessions.
+        DB calls run in a worker thread; per-user ordering is kept by PerUserUpdateProcessor.
 
         Parameters:
         - update: telegram.Update
@@ -73,8 +75,13 @@ def build_logout_callback_handler():
 
             try:
 
-                if user_auth_manager.is_authorized(user_id):
-                    user_auth_manager.unauthorize(user_id)
+                if await asyncio.to_thread(user_auth_manager.is_authorized, user_id):
+                    await asyncio.to_thread(user_auth_manager.unauthorize, user_id)
+                    broadcast_channel = context.bot_data.get("broadcast_channel")
+
+                    if broadcast_channel is not None:
+                        await broadcast_channel.revoke(context.bot, user_id)
+
                     logger.info("User logged out via callback")
                     await query.edit_message_text(SUCCESS_LOGOUT_TEXT, parse_mode="HTML")
 
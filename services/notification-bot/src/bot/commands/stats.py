@@ -0,0 +1,69 @@
+# SPDX-FileCopyrightText: 2025 Maxim Selin <selinmax05@mail.ru>
+#
+# SPDX-License-Identifier: MIT
+
+"""
+stats command handler for notification-bot. Shows delivery pipeline state to authorized admins.
+"""
+import asyncio
+from telegram import Update
+from telegram.ext import ContextTypes
+from src.logger import get_logger
+from src.loop_monitor import get_loop_lag_stats
+
+logger = get_logger("cmd.stats")
+
+def format_stats(stats: dict, loop_lag=()) -> str:
+    """
+    Renders a pipeline stats snapshot (and event-loop lag summaries) as a plain-text reply.
+
+    Parameters:
+    - stats: dict - NotificationHandler.pipeline_stats()
+    - loop_lag: iterable[dict] - get_loop_lag_stats()
+
+    Returns:
+    - str
+    """
+    lines = [
+        f"{lag['loop']} loop lag: p99 {lag['p99_lag_ms']:.0f}ms, max {lag['max_lag_ms']:.0f}ms, {lag['stalls']} stalls"
+        for lag in loop_lag
+    ]
+    text = (
+        "Delivery pipeline\n\n"
+        f"Queue depth: {stats['queue_depth']}\n"
+        f"Oldest item age: {stats['oldest_item_age_seconds']:.1f}s\n\n"
+        f"Last {stats['window_seconds']}s:\n"
+        f"Enqueued: {stats['enqueue_rate']:.2f}/s\n"
+        f"Sent: {stats['send_rate']:.2f}/s\n"
+        f"Errors: {stats['error_rate']:.1%}\n\n"
+        f"Totals: {stats['enqueued_total']} enqueued, {stats['sent_total']} sent, {stats['failed_total']} failed"
+    )
+    return "\n\n".join([text, "\n".join(lines)]) if lines else text
+
+async def stats_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """
+    Handles /stats: replies with queue depth, delivery lag, rolling rates and event-loop lag.
+    Only users authorized via the admin-key WebApp flow may see it.
+
+    Parameters:
+    - update: telegram.Update
+    - context: telegram.ext.ContextTypes.DEFAULT_TYPE
+
+    Returns:
+    - None
+    """
+    user_id = update.effective_user.id
+    user_auth_manager = context.bot_data.get("user_auth_manager")
+    handler = context.bot_data.get("notification_handler")
+
+    if not (user_auth_manager and await asyncio.to_thread(user_auth_manager.is_authorized, user_id)):
+        logger.info("/stats denied: user is not authorized")
+        await update.message.reply_text("You are not authorized. Use /start to authorize.")
+        return
+
+    if handler is None:
+        await update.message.reply_text("Delivery pipeline is not running.")
+        return
+
+    logger.info("/stats requested")
+    await update.message.reply_text(format_stats(handler.pipeline_stats(), get_loop_lag_stats()))
@@ -5,6 +5,7 @@
 """
 status command handler for notification-bot. Checks if the user is currently authorized.
 """
+import asyncio
 from telegram import Update
 from telegram.ext import ContextTypes
 from src.logger import get_logger
@@ -13,7 +14,9 @@ logger = get_logger("cmd.status")
 
 async def status_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """
-    Handles /status: replies whether user is currently authorized to receive notifications.
+    Handles /status: replies whether user is currently authorized to receive notifications
+    (with the broadcast chat invite link in broadcast mode).
+    The DB lookup runs in a worker thread so concurrent updates keep flowing.
 
     Parameters:
     - update: telegram.Update
@@ -25,9 +28,16 @@ async def status_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user_id = update.effective_user.id
     user_auth_manager = context.bot_data.get("user_auth_manager")
 
-    if user_auth_manager and user_auth_manager.is_authorized(user_id):
+    if user_auth_manager and await asyncio.to_thread(user_auth_manager.is_authorized, user_id):
         logger.info("/status check: user is authorized")
-        await update.message.reply_text("You are currently authorized to receive notifications.")
+        message = "You are currently authorized to receive notifications."
+        broadcast_channel = context.bot_data.get("broadcast_channel")
+
+        if broadcast_channel is not None:
+            link = await broadcast_channel.invite_link(context.bot)
+            message += "\n" + broadcast_channel.invite_message(link)
+
+        await update.message.reply_text(message)
 
     else:
         logger.info("/status check: user is not authorized")
@@ -0,0 +1,92 @@
+# SPDX-FileCopyrightText: 2025 Maxim Selin <selinmax05@mail.ru>
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Update processor for notification-bot: processes updates concurrently while serializing
+updates from the same user (e.g. /logout confirmation never races that user's /status).
+"""
+import asyncio
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+# PTB's process_update takes the base class semaphore before do_process_update; it is sized so it
+# never blocks, and the real limit is applied once an update is at the front of its user's queue.
+UNBOUNDED_UPDATES = 2 ** 31 - 1
+
+class PerUserUpdateProcessor(BaseUpdateProcessor):
+    """
+    Concurrent update processor with one FIFO lock per active user. An update takes one of
+    concurrency_limit slots only after the user's earlier updates have finished, so updates
+    waiting behind their own user hold no slot and a bursting user cannot stall the others.
+    Lock entries live only while the user has updates pending.
+    """
+
+    __slots__ = ("concurrency_limit", "_slots", "_locks")
+
+    def __init__(self, max_concurrent_updates: int):
+        """
+        Parameters:
+        - max_concurrent_updates: int - global concurrency limit (>= 1)
+
+        Returns:
+        - PerUserUpdateProcessor
+
+        Raises:
+        - ValueError if max_concurrent_updates is not positive
+        """
+        if max_concurrent_updates < 1:
+            raise ValueError("max_concurrent_updates must be a positive integer")
+
+        super().__init__(UNBOUNDED_UPDATES)
+        self.concurrency_limit = max_concurrent_updates
+        self._slots = asyncio.BoundedSemaphore(max_concurrent_updates)
+        self._locks = {}
+
+    async def do_process_update(self, update, coroutine):
+        """
+        Awaits the update coroutine in a concurrency slot, taken after the sender's lock when the
+        update has a user.
+
+        Parameters:
+        - update: object - usually telegram.Update
+        - coroutine: Awaitable - PTB handler dispatch for this update
+
+        Returns:
+        - None
+        """
+        user = update.effective_user if isinstance(update, Update) else None
+
+        if user is None:
+
+            async with self._slots:
+                await coroutine
+
+            return
+
+        entry = self._locks.get(user.id)
+
+        if entry is None:
+            entry = [asyncio.Lock(), 0]
+            self._locks[user.id] = entry
+
+        entry[1] += 1
+
+        try:
+
+            async with entry[0]:
+
+                async with self._slots:
+                    await coroutine
+
+        finally:
+            entry[1] -= 1
+
+            if entry[1] == 0:
+                del self._locks[user.id]
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        self._locks.clear()
@@ -0,0 +1,76 @@
+# SPDX-FileCopyrightText: 2025 Maxim Selin <selinmax05@mail.ru>
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Pooled HTTPX transports for Telegram Bot API calls: one request object for getUpdates
+long polling and a separate, larger keep-alive pool for send_message fan-out.
+"""
+import httpx
+from telegram.request import HTTPXRequest
+from src import startup_profile
+
+class _StartupProfiledRequest(HTTPXRequest):
+    """
+    getUpdates request that records the first poll as a startup milestone.
+    """
+
+    __slots__ = ()
+
+    async def do_request(self, *args, **kwargs):
+        startup_profile.mark("first_poll")
+        return await super().do_request(*args, **kwargs)
+
+def _build_request(config, pool_size: int, request_class=HTTPXRequest) -> HTTPXRequest:
+    """
+    Builds an HTTPXRequest with configured timeouts, keep-alive pool and HTTP version.
+
+    Parameters:
+    - config: Config - telegram_* transport settings
+    - pool_size: int - max (and max keep-alive) connections
+    - request_class: type - HTTPXRequest or subclass
+
+    Returns:
+    - telegram.request.HTTPXRequest
+    """
+    return request_class(
+        connection_pool_size=pool_size,
+        connect_timeout=config.telegram_connect_timeout,
+        read_timeout=config.telegram_read_timeout,
+        write_timeout=config.telegram_write_timeout,
+        pool_timeout=config.telegram_pool_timeout,
+        http_version="2" if config.telegram_http2 else "1.1",
+        httpx_kwargs={
+            "limits": httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=pool_size,
+                keepalive_expiry=config.telegram_keepalive_expiry,
+            ),
+        },
+    )
+
+def build_send_request(config) -> HTTPXRequest:
+    """
+    Request object for all Bot API calls except getUpdates (send_message fan-out, replies).
+
+    Parameters:
+    - config: Config
+
+    Returns:
+    - telegram.request.HTTPXRequest
+    """
+    return _build_request(config, config.telegram_pool_size)
+
+def build_get_updates_request(config) -> HTTPXRequest:
+    """
+    Request object dedicated to getUpdates long polling (a single persistent connection).
+    Under --profile-startup it also records the first poll milestone.
+
+    Parameters:
+    - config: Config
+
+    Returns:
+    - telegram.request.HTTPXRequest
+    """
+    request_class = _StartupProfiledRequest if startup_profile.is_enabled() else HTTPXRequest
+    return _build_request(config, 1, request_class)
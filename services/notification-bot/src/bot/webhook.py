@@ -0,0 +1,178 @@
+# SPDX-FileCopyrightText: 2025 Maxim Selin <selinmax05@mail.ru>
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Embedded webhook listener for notification-bot: receives updates pushed by Telegram over HTTP,
+verifies the secret token header and feeds them into the Application update queue.
+"""
+import asyncio
+import hmac
+import json
+from telegram import Update
+from src.logger import get_logger
+from src import startup_profile
+
+logger = get_logger("webhook")
+
+SECRET_TOKEN_HEADER = "x-telegram-bot-api-secret-token"
+MAX_BODY_BYTES = 1024 * 1024
+IDLE_TIMEOUT = 75.0
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    403: "Forbidden",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+}
+
+class WebhookServer:
+    """
+    Minimal asyncio HTTP/1.1 listener accepting Telegram webhook POSTs (keep-alive aware).
+    """
+
+    def __init__(self, application, listen: str, port: int, path: str, secret_token: str):
+        """
+        Parameters:
+        - application: telegram.ext.Application - receives updates via update_queue
+        - listen: str - bind address
+        - port: int - bind port
+        - path: str - URL path Telegram posts to
+        - secret_token: str - expected X-Telegram-Bot-Api-Secret-Token value
+
+        Returns:
+        - WebhookServer
+        """
+        self.application = application
+        self.listen = listen
+        self.port = port
+        self.path = path
+        self.secret_token = secret_token
+        self._server = None
+        self._writers = set()
+
+    async def start(self):
+        """
+        Binds and starts accepting connections on the running loop.
+
+        Parameters:
+        - None
+
+        Returns:
+        - None
+        """
+        self._server = await asyncio.start_server(self._handle_connection, self.listen, self.port)
+        logger.info("Webhook listener started", extra={"webhook_listen": self.listen, "webhook_port": self.port, "webhook_path": self.path})
+        startup_profile.mark("webhook_listener_started")
+
+    async def stop(self):
+        """
+        Stops listening and closes open connections (idempotent).
+
+        Parameters:
+        - None
+
+        Returns:
+        - None
+        """
+        if self._server is None:
+            return
+
+        self._server.close()
+
+        for writer in list(self._writers):
+            writer.close()
+
+        await self._server.wait_closed()
+        self._server = None
+        logger.info("Webhook listener stopped")
+
+    async def _handle_connection(self, reader, writer):
+        self._writers.add(writer)
+
+        try:
+
+            while True:
+
+                async with asyncio.timeout(IDLE_TIMEOUT):
+                    request_line = await reader.readline()
+
+                    if not request_line:
+                        break
+
+                    method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                    headers = {}
+
+                    while True:
+                        line = await reader.readline()
+
+                        if line in (b"\r\n", b"\n", b""):
+                            break
+
+                        key, _, value = line.decode("latin-1").partition(":")
+                        headers[key.strip().lower()] = value.strip()
+
+                    length = int(headers.get("content-length", 0))
+
+                    if length > MAX_BODY_BYTES:
+                        await self._respond(writer, 413, keep_alive=False)
+                        break
+
+                    body = await reader.readexactly(length) if length else b""
+
+                status = await self._dispatch(method, path.split("?", 1)[0], headers, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                await self._respond(writer, status, keep_alive)
+
+                if not keep_alive:
+                    break
+
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError, ValueError):
+            pass
+
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _dispatch(self, method, path, headers, body):
+        """
+        Validates a webhook request and enqueues the decoded update.
+
+        Parameters:
+        - method: str
+        - path: str
+        - headers: dict[str, str] (lower-case keys)
+        - body: bytes
+
+        Returns:
+        - int - HTTP status code
+        """
+        if path != self.path:
+            return 404
+
+        if method != "POST":
+            return 405
+
+        if not hmac.compare_digest(headers.get(SECRET_TOKEN_HEADER, "").encode(), self.secret_token.encode()):
+            logger.warning("Webhook request with invalid secret token rejected")
+            return 403
+
+        try:
+            update = Update.de_json(json.loads(body), self.application.bot)
+
+        except Exception as ex:
+            logger.warning("Malformed webhook update rejected", extra={"webhook_error": str(ex)})
+            return 400
+
+        await self.application.update_queue.put(update)
+        return 200
+
+    @staticmethod
+    async def _respond(writer, status, keep_alive):
+        connection = "keep-alive" if keep_alive else "close"
+        writer.write(
+            f"HTTP/1.1 {status} {REASONS[status]}\r\nContent-Length: 0\r\nConnection: {connection}\r\n\r\n".encode("latin-1")
+        )
+        await writer.drain()
@@ -5,8 +5,6 @@
 """
 DB client for user auth, manages authorized_bot_users (add, remove, check, list).
 """
-import psycopg2
-import psycopg2.extras
 import datetime
 from typing import Optional, List
 
@@ -32,6 +30,7 @@ class NotificationUserRepository:
     def _get_conn(self):
         """
         Gets or creates/reuses a single DB connection for this repo.
+        psycopg2 is imported lazily on first connection to keep it off the startup path.
 
         Parameters:
         - None
@@ -40,6 +39,8 @@ class NotificationUserRepository:
         - psycopg2.Connection object
         """
         if self._conn is None or self._conn.closed:
+            import psycopg2
+
             self._conn = psycopg2.connect(
                 host=self.config.pg_host,
                 port=self.config.pg_port,
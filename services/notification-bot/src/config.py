@@ -6,10 +6,49 @@
 Typed configuration and .env loader for notification-bot.
 """
 import os
+import re
 import base64
 from dataclasses import dataclass
 from typing import Optional
 
+RUNTIME_MODES = ("threaded", "single_loop")
+UPDATE_MODES = ("polling", "webhook")
+DELIVERY_MODES = ("direct", "broadcast")
+WEBHOOK_SECRET_RE = re.compile(r"^[A-Za-z0-9_-]{1,256}$")
+
+def parse_log_sampling(raw: str) -> tuple:
+    """
+    Parses LOG_SAMPLING ("event key=max per second;other event=N") into (event, rate) pairs.
+
+    Parameters:
+    - raw: str
+
+    Returns:
+    - tuple[(str, int), ...]
+
+    Raises:
+    - RuntimeError on malformed entries
+    """
+    pairs = []
+
+    for item in raw.split(";"):
+
+        if not item.strip():
+            continue
+
+        event, sep, rate = item.rpartition("=")
+
+        if not sep or not event.strip():
+            raise RuntimeError(f"Invalid LOG_SAMPLING entry: {item!r} (expected 'event=rate')")
+
+        try:
+            pairs.append((event.strip(), int(rate)))
+
+        except ValueError:
+            raise RuntimeError(f"Invalid LOG_SAMPLING rate in entry: {item!r}")
+
+    return tuple(pairs)
+
 @dataclass(frozen=True)
 class Config:
     """
@@ -25,6 +64,55 @@ class Config:
     - pg_user: str
     - pg_password: str
     - pg_database: str
+    - runtime_mode: str ("threaded" or "single_loop", default "threaded")
+    - log_async_sink: bool (render logs on caller, write them from a background thread)
+    - log_buffer_size: int (async log sink ring buffer capacity, default 10000)
+    - log_sampling: tuple[(str, int), ...] (event key -> max events per second)
+    - trace_file: str (rotating JSONL span file; empty disables tracing)
+    - trace_sample_rate: float (0..1, share of traces sampled without upstream decision)
+    - trace_max_bytes: int (trace file rotation size)
+    - trace_backup_count: int (rotated trace files kept)
+    - update_mode: str ("polling" or "webhook", default "polling")
+    - webhook_url: str (public URL registered with Telegram; empty skips registration)
+    - webhook_listen: str (webhook listener bind address)
+    - webhook_port: int (webhook listener port, default 8443)
+    - webhook_path: str (URL path Telegram posts updates to)
+    - webhook_secret: str (X-Telegram-Bot-Api-Secret-Token value, required in webhook mode)
+    - bot_concurrent_updates: int (max Telegram updates processed concurrently, default 16)
+    - telegram_pool_size: int (keep-alive connection pool for Bot API sends, default 64)
+    - telegram_keepalive_expiry: float (seconds an idle Bot API connection is kept open)
+    - telegram_connect_timeout / telegram_read_timeout / telegram_write_timeout: float (seconds)
+    - telegram_pool_timeout: float (seconds to wait for a free pooled connection)
+    - telegram_http2: bool (use HTTP/2 for Bot API calls)
+    - telegram_api_base_url: str (Bot API base URL, token appended; local Bot API server or benchmark stand-in)
+    - grpc_shutdown_grace: float (seconds in-flight RPCs may finish on shutdown, default 5)
+    - drain_deadline: float (seconds the delivery queue may drain on shutdown, default 20)
+    - pending_spool_path: str (JSONL file for undelivered notifications left after draining)
+    - pipeline_stats_window: int (seconds covered by delivery rate counters, default 60)
+    - profiler_dir: str (directory for sampling profiler collapsed-stack files)
+    - profiler_interval_ms: float (sampling interval, default 10)
+    - profiler_max_seconds: float (profiler sessions stop automatically after this, default 300)
+    - profiler_short_switch_interval: bool (lower the GIL switch interval during profiler sessions, default False)
+    - loop_lag_interval_ms: float (event-loop lag probe interval, default 100)
+    - loop_lag_threshold_ms: float (lag reported with the blocking stack, default 100; 0 disables)
+    - delivery_mode: str ("direct" messages per authorized user or one "broadcast" post, default "direct")
+    - broadcast_chat_id: Optional[int] (private channel/group id, required in broadcast mode)
+    - broadcast_state_path: str (JSON file keeping the broadcast invite link across restarts)
+    - contact_rate_per_minute: float (DeliverContactMessage calls per sender per minute, default 5; 0 disables)
+    - contact_rate_burst: int (per-sender burst, default 3)
+    - contact_global_rate_per_minute: float (DeliverContactMessage calls per minute over all senders, default 120; 0 disables)
+    - contact_global_rate_burst: int (global burst, default 30)
+    - contact_rate_max_keys: int (sender buckets kept before LRU eviction, default 10000)
+    - recipient_failure_limit: int (consecutive permanent send failures before a recipient is unauthorized, default 3; 0 disables)
+    - delivery_send_concurrency: int (Bot API sends in flight at once, one per recipient, default 8)
+    - grpc_unix_socket: str (Unix domain socket path for a gRPC listener, default "" = none)
+    - grpc_tcp_enabled: bool (listen on TCP notification_bot_port, default True)
+    - memory_snapshot_dir: str (directory for memory snapshot reports)
+    - memory_trace_frames: int (stack frames stored per traced allocation, default 1)
+    - memory_snapshot_top: int (allocation sites listed per report section, default 25)
+    - grpc_record_dir: str (directory for anonymized gRPC traffic recordings; empty disables recording)
+    - grpc_record_max_bytes: int (recording size cap)
+    - warmup_timeout: float (seconds each warm-up step may take before it is skipped, default 10)
     """
     admin_key: str
     notification_bot_token: str
@@ -37,6 +125,57 @@ class Config:
     pg_user: str = "postgres"
     pg_password: str = "postgres"
     pg_database: str = "sitecard"
+    runtime_mode: str = "threaded"
+    log_async_sink: bool = False
+    log_buffer_size: int = 10000
+    log_sampling: tuple = ()
+    trace_file: str = ""
+    trace_sample_rate: float = 1.0
+    trace_max_bytes: int = 10 * 1024 * 1024
+    trace_backup_count: int = 3
+    update_mode: str = "polling"
+    webhook_url: str = ""
+    webhook_listen: str = "0.0.0.0"
+    webhook_port: int = 8443
+    webhook_path: str = "/telegram/webhook"
+    webhook_secret: str = ""
+    bot_concurrent_updates: int = 16
+    telegram_pool_size: int = 64
+    telegram_keepalive_expiry: float = 60.0
+    telegram_connect_timeout: float = 5.0
+    telegram_read_timeout: float = 10.0
+    telegram_write_timeout: float = 10.0
+    telegram_pool_timeout: float = 5.0
+    telegram_http2: bool = False
+    telegram_api_base_url: str = "https://api.telegram.org/bot"
+    grpc_shutdown_grace: float = 5.0
+    drain_deadline: float = 20.0
+    pending_spool_path: str = "data/pending_notifications.jsonl"
+    pipeline_stats_window: int = 60
+    profiler_dir: str = "data/profiles"
+    profiler_interval_ms: float = 10.0
+    profiler_max_seconds: float = 300.0
+    profiler_short_switch_interval: bool = False
+    loop_lag_interval_ms: float = 100.0
+    loop_lag_threshold_ms: float = 100.0
+    delivery_mode: str = "direct"
+    broadcast_chat_id: Optional[int] = None
+    broadcast_state_path: str = "data/broadcast_state.json"
+    contact_rate_per_minute: float = 5.0
+    contact_rate_burst: int = 3
+    contact_global_rate_per_minute: float = 120.0
+    contact_global_rate_burst: int = 30
+    contact_rate_max_keys: int = 10000
+    recipient_failure_limit: int = 3
+    delivery_send_concurrency: int = 8
+    grpc_unix_socket: str = ""
+    grpc_tcp_enabled: bool = True
+    memory_snapshot_dir: str = "data/memory"
+    memory_trace_frames: int = 1
+    memory_snapshot_top: int = 25
+    grpc_record_dir: str = ""
+    grpc_record_max_bytes: int = 64 * 1024 * 1024
+    warmup_timeout: float = 10.0
 
     @staticmethod
     def from_env():
@@ -50,7 +189,7 @@ class Config:
         - Config instance
 
         Raises:
-        - RuntimeError if any required key missing
+        - RuntimeError if any required key missing or invalid
         """
         missing = []
         private_key_path = os.environ.get("PRIVATE_KEY_PATH")
@@ -72,6 +211,57 @@ class Config:
         pg_password = os.environ.get("PGPASSWORD", "postgres")
         pg_database = os.environ.get("PGDATABASE", "sitecard")
         webapp_secret_path = os.environ.get("WEBAPP_SECRET_PATH")
+        runtime_mode = os.environ.get("NOTIFICATION_BOT_RUNTIME_MODE", "threaded").lower()
+        log_async_sink = os.environ.get("LOG_ASYNC_SINK", "false").lower() == "true"
+        log_buffer_size = int(os.environ.get("LOG_BUFFER_SIZE", 10000))
+        log_sampling = parse_log_sampling(os.environ.get("LOG_SAMPLING", ""))
+        trace_file = os.environ.get("TRACE_FILE", "")
+        trace_sample_rate = float(os.environ.get("TRACE_SAMPLE_RATE", 1.0))
+        trace_max_bytes = int(os.environ.get("TRACE_MAX_BYTES", 10 * 1024 * 1024))
+        trace_backup_count = int(os.environ.get("TRACE_BACKUP_COUNT", 3))
+        update_mode = os.environ.get("NOTIFICATION_BOT_UPDATE_MODE", "polling").lower()
+        webhook_url = os.environ.get("NOTIFICATION_BOT_WEBHOOK_URL", "")
+        webhook_listen = os.environ.get("NOTIFICATION_BOT_WEBHOOK_LISTEN", "0.0.0.0")
+        webhook_port = int(os.environ.get("NOTIFICATION_BOT_WEBHOOK_PORT", 8443))
+        webhook_path = os.environ.get("NOTIFICATION_BOT_WEBHOOK_PATH", "/telegram/webhook")
+        webhook_secret = os.environ.get("NOTIFICATION_BOT_WEBHOOK_SECRET", "")
+        bot_concurrent_updates = int(os.environ.get("NOTIFICATION_BOT_CONCURRENT_UPDATES", 16))
+        telegram_pool_size = int(os.environ.get("TELEGRAM_POOL_SIZE", 64))
+        telegram_keepalive_expiry = float(os.environ.get("TELEGRAM_KEEPALIVE_EXPIRY", 60.0))
+        telegram_connect_timeout = float(os.environ.get("TELEGRAM_CONNECT_TIMEOUT", 5.0))
+        telegram_read_timeout = float(os.environ.get("TELEGRAM_READ_TIMEOUT", 10.0))
+        telegram_write_timeout = float(os.environ.get("TELEGRAM_WRITE_TIMEOUT", 10.0))
+        telegram_pool_timeout = float(os.environ.get("TELEGRAM_POOL_TIMEOUT", 5.0))
+        telegram_http2 = os.environ.get("TELEGRAM_HTTP2", "false").lower() == "true"
+        telegram_api_base_url = os.environ.get("TELEGRAM_API_BASE_URL", "https://api.telegram.org/bot")
+        grpc_shutdown_grace = float(os.environ.get("GRPC_SHUTDOWN_GRACE", 5.0))
+        drain_deadline = float(os.environ.get("SHUTDOWN_DRAIN_DEADLINE", 20.0))
+        pending_spool_path = os.environ.get("PENDING_SPOOL_PATH", "data/pending_notifications.jsonl")
+        pipeline_stats_window = int(os.environ.get("PIPELINE_STATS_WINDOW", 60))
+        profiler_dir = os.environ.get("PROFILER_DIR", "data/profiles")
+        profiler_interval_ms = float(os.environ.get("PROFILER_INTERVAL_MS", 10.0))
+        profiler_max_seconds = float(os.environ.get("PROFILER_MAX_SECONDS", 300.0))
+        profiler_short_switch_interval = os.environ.get("PROFILER_SHORT_SWITCH_INTERVAL", "false").lower() == "true"
+        loop_lag_interval_ms = float(os.environ.get("LOOP_LAG_INTERVAL_MS", 100.0))
+        loop_lag_threshold_ms = float(os.environ.get("LOOP_LAG_THRESHOLD_MS", 100.0))
+        delivery_mode = os.environ.get("NOTIFICATION_DELIVERY_MODE", "direct").lower()
+        broadcast_chat_id = os.environ.get("NOTIFICATION_BROADCAST_CHAT_ID", "")
+        broadcast_state_path = os.environ.get("NOTIFICATION_BROADCAST_STATE_PATH", "data/broadcast_state.json")
+        contact_rate_per_minute = float(os.environ.get("CONTACT_RATE_LIMIT_PER_MINUTE", 5.0))
+        contact_rate_burst = int(os.environ.get("CONTACT_RATE_LIMIT_BURST", 3))
+        contact_global_rate_per_minute = float(os.environ.get("CONTACT_GLOBAL_RATE_LIMIT_PER_MINUTE", 120.0))
+        contact_global_rate_burst = int(os.environ.get("CONTACT_GLOBAL_RATE_LIMIT_BURST", 30))
+        contact_rate_max_keys = int(os.environ.get("CONTACT_RATE_LIMIT_MAX_KEYS", 10000))
+        recipient_failure_limit = int(os.environ.get("RECIPIENT_FAILURE_LIMIT", 3))
+        delivery_send_concurrency = int(os.environ.get("DELIVERY_SEND_CONCURRENCY", 8))
+        grpc_unix_socket = os.environ.get("GRPC_UNIX_SOCKET", "").strip()
+        grpc_tcp_enabled = os.environ.get("GRPC_TCP_ENABLED", "true").lower() == "true"
+        memory_snapshot_dir = os.environ.get("MEMORY_SNAPSHOT_DIR", "data/memory")
+        memory_trace_frames = int(os.environ.get("MEMORY_TRACE_FRAMES", 1))
+        memory_snapshot_top = int(os.environ.get("MEMORY_SNAPSHOT_TOP", 25))
+        grpc_record_dir = os.environ.get("GRPC_RECORD_DIR", "")
+        grpc_record_max_bytes = int(os.environ.get("GRPC_RECORD_MAX_BYTES", 64 * 1024 * 1024))
+        warmup_timeout = float(os.environ.get("WARMUP_TIMEOUT", 10.0))
 
         if not webapp_secret_path:
             missing.append("WEBAPP_SECRET_PATH")
@@ -90,6 +280,77 @@ class Config:
         if missing:
             raise RuntimeError(f"Missing config envs: {', '.join(missing)}")
 
+        if runtime_mode not in RUNTIME_MODES:
+            raise RuntimeError(f"Invalid NOTIFICATION_BOT_RUNTIME_MODE: {runtime_mode} (expected one of: {', '.join(RUNTIME_MODES)})")
+
+        if update_mode not in UPDATE_MODES:
+            raise RuntimeError(f"Invalid NOTIFICATION_BOT_UPDATE_MODE: {update_mode} (expected one of: {', '.join(UPDATE_MODES)})")
+
+        if log_buffer_size < 1:
+            raise RuntimeError("LOG_BUFFER_SIZE must be a positive integer")
+
+        if not 0 <= trace_sample_rate <= 1:
+            raise RuntimeError("TRACE_SAMPLE_RATE must be between 0 and 1")
+
+        if bot_concurrent_updates < 1:
+            raise RuntimeError("NOTIFICATION_BOT_CONCURRENT_UPDATES must be a positive integer")
+
+        if telegram_pool_size < 1:
+            raise RuntimeError("TELEGRAM_POOL_SIZE must be a positive integer")
+
+        if grpc_shutdown_grace < 0 or drain_deadline < 0:
+            raise RuntimeError("GRPC_SHUTDOWN_GRACE and SHUTDOWN_DRAIN_DEADLINE must not be negative")
+
+        if pipeline_stats_window < 1:
+            raise RuntimeError("PIPELINE_STATS_WINDOW must be a positive integer")
+
+        if profiler_interval_ms <= 0 or profiler_max_seconds <= 0:
+            raise RuntimeError("PROFILER_INTERVAL_MS and PROFILER_MAX_SECONDS must be positive")
+
+        if loop_lag_interval_ms <= 0:
+            raise RuntimeError("LOOP_LAG_INTERVAL_MS must be positive")
+
+        if delivery_mode not in DELIVERY_MODES:
+            raise RuntimeError(f"Invalid NOTIFICATION_DELIVERY_MODE: {delivery_mode} (expected one of: {', '.join(DELIVERY_MODES)})")
+
+        if delivery_mode == "broadcast":
+
+            try:
+                broadcast_chat_id = int(broadcast_chat_id)
+
+            except ValueError:
+                raise RuntimeError("NOTIFICATION_BROADCAST_CHAT_ID must be the numeric id of a private channel or group in broadcast mode")
+
+        else:
+            broadcast_chat_id = None
+
+        if contact_rate_per_minute < 0 or contact_global_rate_per_minute < 0:
+            raise RuntimeError("CONTACT_RATE_LIMIT_PER_MINUTE and CONTACT_GLOBAL_RATE_LIMIT_PER_MINUTE must not be negative")
+
+        if contact_rate_burst < 1 or contact_global_rate_burst < 1 or contact_rate_max_keys < 1:
+            raise RuntimeError("CONTACT_RATE_LIMIT_BURST, CONTACT_GLOBAL_RATE_LIMIT_BURST and CONTACT_RATE_LIMIT_MAX_KEYS must be positive integers")
+
+        if recipient_failure_limit < 0:
+            raise RuntimeError("RECIPIENT_FAILURE_LIMIT must not be negative")
+
+        if delivery_send_concurrency < 1:
+            raise RuntimeError("DELIVERY_SEND_CONCURRENCY must be a positive integer")
+
+        if not grpc_tcp_enabled and not grpc_unix_socket:
+            raise RuntimeError("GRPC_TCP_ENABLED=false requires GRPC_UNIX_SOCKET")
+
+        if memory_trace_frames < 1 or memory_snapshot_top < 1:
+            raise RuntimeError("MEMORY_TRACE_FRAMES and MEMORY_SNAPSHOT_TOP must be positive integers")
+
+        if grpc_record_max_bytes < 1024:
+            raise RuntimeError("GRPC_RECORD_MAX_BYTES must be at least 1024")
+
+        if warmup_timeout <= 0:
+            raise RuntimeError("WARMUP_TIMEOUT must be positive")
+
+        if update_mode == "webhook" and not WEBHOOK_SECRET_RE.match(webhook_secret):
+            raise RuntimeError("NOTIFICATION_BOT_WEBHOOK_SECRET must be 1-256 chars of A-Z, a-z, 0-9, _ or - in webhook mode")
+
         try:
             with open(private_key_path, "rb") as f:
                 admin_key = base64.b64encode(f.read()).decode('ascii').replace('\n','')
@@ -116,4 +377,55 @@ class Config:
             pg_password=pg_password,
             pg_database=pg_database,
             webapp_token_secret=webapp_token_secret,
+            runtime_mode=runtime_mode,
+            log_async_sink=log_async_sink,
+            log_buffer_size=log_buffer_size,
+            log_sampling=log_sampling,
+            trace_file=trace_file,
+            trace_sample_rate=trace_sample_rate,
+            trace_max_bytes=trace_max_bytes,
+            trace_backup_count=trace_backup_count,
+            update_mode=update_mode,
+            webhook_url=webhook_url,
+            webhook_listen=webhook_listen,
+            webhook_port=webhook_port,
+            webhook_path=webhook_path,
+            webhook_secret=webhook_secret,
+            bot_concurrent_updates=bot_concurrent_updates,
+            telegram_pool_size=telegram_pool_size,
+            telegram_keepalive_expiry=telegram_keepalive_expiry,
+            telegram_connect_timeout=telegram_connect_timeout,
+            telegram_read_timeout=telegram_read_timeout,
+            telegram_write_timeout=telegram_write_timeout,
+            telegram_pool_timeout=telegram_pool_timeout,
+            telegram_http2=telegram_http2,
+            telegram_api_base_url=telegram_api_base_url,
+            grpc_shutdown_grace=grpc_shutdown_grace,
+            drain_deadline=drain_deadline,
+            pending_spool_path=pending_spool_path,
+            pipeline_stats_window=pipeline_stats_window,
+            profiler_dir=profiler_dir,
+            profiler_interval_ms=profiler_interval_ms,
+            profiler_max_seconds=profiler_max_seconds,
+            profiler_short_switch_interval=profiler_short_switch_interval,
+            loop_lag_interval_ms=loop_lag_interval_ms,
+            loop_lag_threshold_ms=loop_lag_threshold_ms,
+            delivery_mode=delivery_mode,
+            broadcast_chat_id=broadcast_chat_id,
+            broadcast_state_path=broadcast_state_path,
+            contact_rate_per_minute=contact_rate_per_minute,
+            contact_rate_burst=contact_rate_burst,
+            contact_global_rate_per_minute=contact_global_rate_per_minute,
+            contact_global_rate_burst=contact_global_rate_burst,
+            contact_rate_max_keys=contact_rate_max_keys,
+            recipient_failure_limit=recipient_failure_limit,
+            delivery_send_concurrency=delivery_send_concurrency,
+            grpc_unix_socket=grpc_unix_socket,
+            grpc_tcp_enabled=grpc_tcp_enabled,
+            memory_snapshot_dir=memory_snapshot_dir,
+            memory_trace_frames=memory_trace_frames,
+            memory_snapshot_top=memory_snapshot_top,
+            grpc_record_dir=grpc_record_dir,
+            grpc_record_max_bytes=grpc_record_max_bytes,
+            warmup_timeout=warmup_timeout,
         )
@@ -8,15 +8,14 @@ Provides Authorization/Deauthorization/checks for use in gRPC, bot commands.
 """
 import threading
 import time
-import jwt
 import base64
 import os
 from src.clients import NotificationUserRepository
 from typing import Optional
-from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
-from cryptography.hazmat.backends import default_backend
 from urllib.parse import urlencode
 
+# jwt and cryptography are imported on first use (first /start or auth RPC), not at startup
+
 class UserAuthManager:
     """
     Abstraction for Telegram user authorization.
@@ -99,6 +98,8 @@ def generate_login_token(user_id: str, secret: str, expiry_secs: int = 180) -> s
     Example:
     - token = generate_login_token("12345", secret)
     """
+    import jwt
+
     now = int(time.time())
     payload = {'uid': str(user_id), 'exp': now + expiry_secs}
     return jwt.encode(payload, secret, algorithm="HS256")
@@ -118,6 +119,8 @@ def validate_login_token(token: str, user_id: str, secret: str) -> bool:
     Example:
     - validate_login_token(token, "12345", secret)
     """
+    import jwt
+
     try:
         payload = jwt.decode(token, secret, algorithms=["HS256"])
         uid_match = payload.get("uid") == str(user_id)
@@ -144,6 +147,8 @@ def decrypt_uid(euid: str, secret: str) -> str:
     Example:
     - decrypt_uid(euid, secret)
     """
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
     try:
         data = base64.urlsafe_b64decode(euid.encode("utf-8"))
         iv, ct_tag = data[:12], data[12:]
@@ -156,8 +161,7 @@ def decrypt_uid(euid: str, secret: str) -> str:
 
         cipher = Cipher(
             algorithms.AES(key),
-            modes.GCM(iv, tag),
-            backend=default_backend()
+            modes.GCM(iv, tag)
         )
 
         decryptor = cipher.decryptor()
@@ -181,10 +185,12 @@ def encrypt_uid(user_id: str, secret: str) -> str:
     Example:
     - encrypt_uid("12345", secret)
     """
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
     raw = str(user_id).encode('utf-8')
     key = base64.b64decode(secret)[:32]
     iv = os.urandom(12)
-    cipher = Cipher(algorithms.AES(key), modes.GCM(iv), backend=default_backend())
+    cipher = Cipher(algorithms.AES(key), modes.GCM(iv))
     encryptor = cipher.encryptor()
     ct = encryptor.update(raw) + encryptor.finalize()
     tag = encryptor.tag
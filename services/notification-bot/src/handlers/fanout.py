@@ -0,0 +1,62 @@
+# SPDX-FileCopyrightText: 2025 Maxim Selin <selinmax05@mail.ru>
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Fan-out job: one queued contact message with its rendered payload held once, the recipient ids
+in a compact int64 array and per-job delivery progress.
+"""
+from array import array
+
+class FanoutJob:
+    """
+    A contact message pending delivery to a set of recipients.
+    """
+
+    __slots__ = ("msg", "recipients", "trace", "enqueued_at", "sent", "failed", "dropped")
+
+    def __init__(self, msg: str, recipients, trace=None, enqueued_at: float = 0.0):
+        """
+        Parameters:
+        - msg: str - rendered message
+        - recipients: iterable[int] - Telegram chat ids
+        - trace: tuple|None - (ingress SpanContext, enqueue time_ns) if sampled
+        - enqueued_at: float - PipelineStats enqueue time
+
+        Returns:
+        - FanoutJob
+        """
+        self.msg = msg
+        self.recipients = array("q", recipients)
+        self.trace = trace
+        self.enqueued_at = enqueued_at
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+
+    @property
+    def progress(self) -> int:
+        """
+        Recipients finished so far (sent, failed or dropped).
+
+        Parameters:
+        - None
+
+        Returns:
+        - int
+        """
+        return self.sent + self.failed + self.dropped
+
+    @property
+    def finished(self) -> bool:
+        return self.progress >= len(self.recipients)
+
+    def status(self) -> dict:
+        """
+        Parameters:
+        - None
+
+        Returns:
+        - dict - recipients, sent, failed, dropped
+        """
+        return {"recipients": len(self.recipients), "sent": self.sent, "failed": self.failed, "dropped": self.dropped}
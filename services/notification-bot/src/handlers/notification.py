@@ -4,43 +4,118 @@
 
 """
 Notification delivery handler, manages delivery queue, input validation, and async delivery to authorized Telegram users.
+Each contact message is queued once as a fan-out job; the worker serves its recipients round-robin across
+per-recipient sub-queues with a bounded number of concurrent sends, and recipients that keep failing permanently (bot blocked, account deleted) are
+unauthorized automatically.
 """
 import asyncio
+import json
+import os
 import time
+from collections import deque
 from queue import Queue, Empty
+from telegram.error import BadRequest, Forbidden
 from src.logger import get_logger
+from src.tracing import get_tracer
+from .fanout import FanoutJob
+from .stats import PipelineStats
 from ..errors import NotificationException
 
+PERMANENT_BAD_REQUESTS = ("chat not found", "user not found", "peer_id_invalid")
+
+def is_permanent_failure(ex: Exception) -> bool:
+    """
+    Tells whether a send error will repeat for this chat on every retry.
+
+    Parameters:
+    - ex: Exception - error raised by bot.send_message
+
+    Returns:
+    - bool
+    """
+    if isinstance(ex, Forbidden):
+        return True
+
+    return isinstance(ex, BadRequest) and any(reason in ex.message.lower() for reason in PERMANENT_BAD_REQUESTS)
+
 class NotificationHandler:
     """
     Handles enqueuing and async delivery of contact notifications to authorized Telegram users.
     Provides input validation, message rendering, threaded queue, and background polling.
     """
 
-    def __init__(self, application, user_auth_manager):
+    def __init__(self, application, user_auth_manager, single_loop=False, stats_window=60, broadcast_channel=None, failure_limit=3, send_concurrency=8):
         """
         Initialize handler with bot Application and authorization manager.
 
         Parameters:
         - application: telegram.Application - main bot
         - user_auth_manager: UserAuthManager - manages authorized user IDs
+        - single_loop: bool - gRPC and Telegram share one event loop, so an asyncio.Queue
+          replaces the thread-safe queue and the worker awaits items instead of polling
+        - stats_window: int - rolling window (seconds) of pipeline rate counters
+        - broadcast_channel: BroadcastChannel|None - post each notification once to this chat
+          instead of messaging every authorized user
+        - failure_limit: int - consecutive permanent send failures after which a recipient is
+          unauthorized and its queued items dropped (0 disables)
+        - send_concurrency: int - Bot API sends in flight at once (to distinct recipients)
 
         Returns:
         - NotificationHandler
         """
         self.application = application
         self.user_auth_manager = user_auth_manager
-        self.send_queue = Queue()
+        self.single_loop = single_loop
+        self.send_queue = asyncio.Queue() if single_loop else Queue()
         self._worker_started = False
+        self._worker_task = None
+        self.send_concurrency = send_concurrency
+        # uid -> job being sent to it
+        self._in_flight = {}
+        self._loop = None
+        self.stats = PipelineStats(stats_window)
+        self.broadcast_channel = broadcast_channel
+        self.failure_limit = failure_limit
+        # Worker-side state: jobs moved off send_queue into per-recipient FIFOs, served round-robin.
+        # _scheduled holds recipients with jobs that are either waiting in _ready or being sent;
+        # a recipient being sent to is not in _ready, so it never has two sends in flight.
+        self._recipients = {}
+        self._ready = deque()
+        self._scheduled = set()
+        self._failures = {}
+
+    def authorized_recipients(self, trace_parent=None) -> list:
+        """
+        Returns the chat ids a contact message goes to: the broadcast chat, or all authorized
+        users (DB query, traced).
+
+        Parameters:
+        - trace_parent: SpanContext|None - ingress span context
+
+        Returns:
+        - list[int]
+        """
+        if self.broadcast_channel is not None:
+            return [self.broadcast_channel.chat_id]
+
+        with get_tracer().start_span("db.get_authorized_user_ids", trace_parent) as span:
+            user_ids = self.user_auth_manager.get_all_authorized_user_ids()
+            span.set_attribute("recipients", len(user_ids))
 
-    def deliver_contact_message(self, name: str, email: str, body: str):
+        return user_ids
+
+    def deliver_contact_message(self, name: str, email: str, body: str, trace_parent=None, recipients=None):
         """
-        Validates and enqueues a contact message for delivery to all authorized users.
+        Validates and enqueues a contact message for delivery to all authorized users
+        (or to the broadcast chat, without the recipient query) as a single fan-out job.
+        The job carries the trace context and enqueue time for queue/send spans.
 
         Parameters:
         - name: str - sender name
         - email: str - sender email
         - body: str - message content
+        - trace_parent: SpanContext|None - ingress span context (None if unsampled)
+        - recipients: list[int]|None - already queried recipients (default: authorized_recipients())
 
         Returns:
         - None (enqueues message)
@@ -48,7 +123,7 @@ class NotificationHandler:
         Raises:
         - NotificationException if fields are missing or invalid
         """
-        user_ids = self.user_auth_manager.get_all_authorized_user_ids()
+        user_ids = recipients if recipients is not None else self.authorized_recipients(trace_parent)
 
         if not all([name, email, body]):
             raise NotificationException("All contact fields are required")
@@ -58,42 +133,220 @@ class NotificationHandler:
 
         msg = self._render_message(name, email, body)
 
-        for uid in user_ids:
-            self.send_queue.put((uid, msg))
+        if not user_ids:
+            return
+
+        trace = (trace_parent, time.time_ns()) if trace_parent is not None else None
+        self.send_queue.put_nowait(FanoutJob(msg, user_ids, trace, self.stats.on_enqueue(len(user_ids))))
 
     async def deliver_worker(self, poll_interval=1.0):
         """
         Async worker: polls queue, delivers notifications in background.
+        In single-loop mode awaits the asyncio.Queue directly instead of polling.
+        Jobs are expanded into per-recipient sub-queues served round-robin by up to send_concurrency
+        concurrent sends, at most one per recipient, so a slow or timing-out chat only holds its own
+        send slot while the other recipients keep being served.
+
+        Parameters:
+        - poll_interval: float - sleep time if queue empty (threaded mode only)
+
+        Returns:
+        - None
+        """
+        logger = get_logger("telegram_notify_worker")
+        sends = set()
+        incoming = None
+
+        logger.info("delivery worker started", extra={"send_concurrency": self.send_concurrency})
+
+        try:
+
+            while True:
+                self._route_incoming()
+
+                while self._ready and len(sends) < self.send_concurrency:
+                    uid = self._ready.popleft()
+                    job = self._recipients[uid].popleft()
+
+                    if not self._recipients[uid]:
+                        del self._recipients[uid]
+
+                    task = asyncio.create_task(self._send(uid, job), name=f"notification_send:{uid}")
+                    sends.add(task)
+                    task.add_done_callback(sends.discard)
+
+                if self.single_loop:
+
+                    if incoming is None:
+                        incoming = asyncio.ensure_future(self.send_queue.get())
+
+                    done, _ = await asyncio.wait(sends | {incoming}, return_when=asyncio.FIRST_COMPLETED)
+
+                    if incoming in done:
+                        self._route(incoming.result())
+                        incoming = None
+
+                elif sends:
+                    await asyncio.wait(sends, timeout=poll_interval, return_when=asyncio.FIRST_COMPLETED)
+
+                else:
+                    await asyncio.sleep(poll_interval)
+
+        finally:
+            # Cancelled sends keep their _in_flight entry, so they are persisted (at-least-once)
+            pending = list(sends) + ([incoming] if incoming is not None else [])
+
+            for task in pending:
+                task.cancel()
+
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _send(self, uid: int, job):
+        """
+        Sends one job to one recipient, then schedules the recipient's next job (if any).
+        Exactly one _send runs per recipient at a time.
 
         Parameters:
-        - poll_interval: float - sleep time if queue empty
+        - uid: int - recipient chat id
+        - job: FanoutJob
 
         Returns:
         - None
         """
         logger = get_logger("telegram_notify_worker")
+        tracer = get_tracer()
+        self._in_flight[uid] = job
+        self.stats.on_dequeue(job.enqueued_at)
+        logger.info(f"delivery worker got message for user", extra={"notify_user_id": uid})
+        trace_parent, enqueued_ns = job.trace if job.trace is not None else (None, None)
+        tracer.start_span("queue.wait", trace_parent, start_ns=enqueued_ns).end()
+        send_span = tracer.start_span("telegram.send_message", trace_parent, attributes={"notify_user_id": uid})
+
+        try:
+            await self.application.bot.send_message(uid, job.msg, parse_mode='HTML')
+            send_span.end()
+            job.sent += 1
+            self.stats.on_send(True)
+            self._failures.pop(uid, None)
+            logger.info("Notification sent in worker")
+
+        except Exception as ex:
+            send_span.end(error=ex)
+            job.failed += 1
+            self.stats.on_send(False)
+            logger.warning("Failed to deliver notification in worker", extra={"notify_error": str(ex)})
+            permanent = is_permanent_failure(ex)
+
+        else:
+            permanent = False
+
+        del self._in_flight[uid]
+
+        if job.finished:
+            self._log_finished(job)
+
+        if permanent:
+            await self._on_permanent_failure(uid)
 
-        logger.info("delivery worker started")
+        # Jobs routed to the recipient meanwhile were not scheduled while it was busy
+        if uid in self._recipients:
+            self._ready.append(uid)
 
+        else:
+            self._scheduled.discard(uid)
+
+    def _route(self, job):
+        """
+        Appends a job to each recipient's sub-queue, scheduling recipients that were idle.
+
+        Parameters:
+        - job: FanoutJob
+
+        Returns:
+        - None
+        """
+        recipients = self._recipients
+        ready = self._ready
+        scheduled = self._scheduled
+
+        for uid in job.recipients:
+            pending = recipients.get(uid)
+
+            if pending is None:
+                pending = recipients[uid] = deque()
+
+                # a recipient being sent to is rescheduled when its send finishes
+                if uid not in scheduled:
+                    scheduled.add(uid)
+                    ready.append(uid)
+
+            pending.append(job)
+
+    @staticmethod
+    def _log_finished(job):
+        get_logger("telegram_notify_worker").info("Contact message delivery finished", extra=job.status())
+
+    def _route_incoming(self):
+        """
+        Moves everything currently in send_queue into the per-recipient sub-queues.
+
+        Parameters:
+        - None
+
+        Returns:
+        - None
+        """
         while True:
 
             try:
-                uid, msg = self.send_queue.get_nowait()
-                logger.info(f"delivery worker got message for user", extra={"notify_user_id": uid})
+                self._route(self.send_queue.get_nowait())
+
+            except (Empty, asyncio.QueueEmpty):
+                return
+
+    async def _on_permanent_failure(self, uid: int):
+        """
+        Counts a permanent send failure; at failure_limit in a row the recipient is unauthorized
+        and its pending jobs are dropped for it. The broadcast chat is never unauthorized.
+
+        Parameters:
+        - uid: int - recipient chat id
 
-                try:
-                    await self.application.bot.send_message(uid, msg, parse_mode='HTML')
-                    logger.info("Notification sent in worker")
+        Returns:
+        - None
+        """
+        failures = self._failures.get(uid, 0) + 1
+
+        if not self.failure_limit or self.broadcast_channel is not None or failures < self.failure_limit:
+            self._failures[uid] = failures
+            return
 
-                except Exception as ex:
-                    logger.warning("Failed to deliver notification in worker", extra={"notify_error": str(ex)})
+        self._failures.pop(uid, None)
+        dropped = self._recipients.pop(uid, None) or ()
 
-            except Empty:
-                await asyncio.sleep(poll_interval)
+        # only called from the recipient's own _send, so it has no _ready entry to remove
+        for job in dropped:
+            self.stats.on_dequeue(job.enqueued_at)
+            job.dropped += 1
+
+            if job.finished:
+                self._log_finished(job)
+
+        logger = get_logger("telegram_notify_worker")
+
+        try:
+            await asyncio.to_thread(self.user_auth_manager.unauthorize, uid)
+            logger.warning(
+                "Unauthorized unreachable recipient",
+                extra={"notify_user_id": uid, "failures": failures, "dropped": len(dropped)},
+            )
+
+        except Exception as ex:
+            logger.error("Failed to unauthorize unreachable recipient", extra={"notify_user_id": uid, "error": str(ex)})
 
     async def start_worker(self):
         """
-        Starts the async delivery worker loop as background task (idempotent).
+        Starts the async delivery worker loop as background task on the running loop (idempotent).
 
         Parameters:
         - None
@@ -102,22 +355,319 @@ class NotificationHandler:
         - None
         """
         if not self._worker_started:
-            self.application.create_task(self.deliver_worker())
+            self._loop = asyncio.get_running_loop()
+            self._worker_task = asyncio.create_task(self.deliver_worker(), name="notification_delivery_worker")
             self._worker_started = True
 
+    async def stop_worker(self):
+        """
+        Cancels the delivery worker task and waits for it to finish (idempotent).
+
+        Parameters:
+        - None
+
+        Returns:
+        - None
+        """
+        task = self._worker_task
+
+        if task is None:
+            return
+
+        self._worker_task = None
+        self._worker_started = False
+        task.cancel()
+
+        try:
+            await task
+
+        except asyncio.CancelledError:
+            pass
+
+    def pending_count(self) -> int:
+        """
+        Returns the number of queued (job, recipient) deliveries plus sends currently in flight.
+
+        Parameters:
+        - None
+
+        Returns:
+        - int
+        """
+        return self.stats.pending + len(self._in_flight)
+
+    def memory_stats(self) -> dict:
+        """
+        Sizes of the delivery structures (memory report probe).
+
+        Parameters:
+        - None
+
+        Returns:
+        - dict
+        """
+        return {
+            "pending_deliveries": self.pending_count(),
+            "incoming_jobs": self.send_queue.qsize(),
+            "recipient_queues": len(self._recipients),
+            "sends_in_flight": len(self._in_flight),
+            "failure_counters": len(self._failures),
+            "pending_enqueue_times": self.stats.pending_enqueue_times,
+        }
+
+    def pipeline_stats(self) -> dict:
+        """
+        Returns current delivery pipeline state (see PipelineStats.snapshot).
+
+        Parameters:
+        - None
+
+        Returns:
+        - dict
+        """
+        return self.stats.snapshot(self.pending_count())
+
+    async def drain(self, deadline: float) -> int:
+        """
+        Lets the worker keep sending until the queue is empty or the deadline passes, then stops it.
+        Must run on the loop the worker runs on; new items must no longer be enqueued.
+
+        Parameters:
+        - deadline: float - max seconds to wait
+
+        Returns:
+        - int - items left undelivered (to be persisted)
+        """
+        logger = get_logger("telegram_notify_worker")
+        loop = asyncio.get_running_loop()
+        until = loop.time() + deadline
+        logger.info("Draining delivery queue", extra={"pending": self.pending_count(), "deadline": deadline})
+
+        while self._worker_task is not None and self.pending_count() and loop.time() < until:
+            await asyncio.sleep(0.05)
+
+        await self.stop_worker()
+        left = self.pending_count()
+
+        if left:
+            logger.warning("Drain deadline passed with undelivered notifications", extra={"pending": left})
+
+        else:
+            logger.info("Delivery queue drained")
+
+        return left
+
+    def persist_pending(self, path: str) -> int:
+        """
+        Writes undelivered jobs with their remaining recipients (including an interrupted in-flight
+        send) to a JSONL spool file for the next process; removes a stale spool when nothing is pending.
+        Worker must be stopped.
+
+        Parameters:
+        - path: str - spool file path
+
+        Returns:
+        - int - (job, recipient) deliveries persisted
+        """
+        remaining = {}
+
+        for uid, job in self._in_flight.items():
+            remaining.setdefault(job, []).append(uid)
+
+        self._in_flight.clear()
+
+        for uid, pending in self._recipients.items():
+
+            for job in pending:
+                remaining.setdefault(job, []).append(uid)
+
+        self._recipients.clear()
+        self._ready.clear()
+        self._scheduled.clear()
+
+        while True:
+
+            try:
+                job = self.send_queue.get_nowait()
+
+            except (Empty, asyncio.QueueEmpty):
+                break
+
+            remaining.setdefault(job, []).extend(job.recipients)
+
+        self.stats.clear_pending()
+        count = sum(len(uids) for uids in remaining.values())
+
+        if not count:
+
+            if os.path.exists(path):
+                os.remove(path)
+
+            return 0
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+
+        with open(tmp_path, "w", encoding="utf-8") as f:
+
+            for job, uids in remaining.items():
+                f.write(json.dumps({"uids": uids, "msg": job.msg}) + "\n")
+
+        os.replace(tmp_path, path)
+        get_logger("telegram_notify_worker").warning("Persisted undelivered notifications", extra={"pending": count, "spool_path": path})
+        return count
+
+    def restore_pending(self, path: str) -> int:
+        """
+        Re-enqueues notifications persisted by a previous process (one job per line, or the older
+        one-recipient-per-line format). The spool file is kept until the next persist_pending rewrites
+        or removes it, so a crash before a clean shutdown loses nothing. Lines that cannot be parsed
+        are skipped and appended to `<path>.corrupt`; a spool with no readable line is then removed,
+        so a damaged file never stops startup.
+
+        Parameters:
+        - path: str - spool file path
+
+        Returns:
+        - int - (job, recipient) deliveries restored
+        """
+        if not os.path.exists(path):
+            return 0
+
+        logger = get_logger("telegram_notify_worker")
+        corrupt_path = f"{path}.corrupt"
+        jobs = []
+        bad_lines = []
+
+        try:
+
+            with open(path, "rb") as f:
+                lines = f.readlines()
+
+        except OSError as ex:
+            logger.error("Failed to read undelivered notifications", extra={"spool_path": path, "error": str(ex)})
+            return 0
+
+        for number, line in enumerate(lines, start=1):
+
+            if not line.strip():
+                continue
+
+            try:
+                jobs.append(self._parse_spool_line(line))
+
+            except (ValueError, TypeError, KeyError) as ex:
+                bad_lines.append(line if line.endswith(b"\n") else line + b"\n")
+                logger.warning("Skipped unreadable spool line", extra={"spool_path": path, "line": number, "error": repr(ex)})
+
+        if bad_lines:
+
+            try:
+
+                with open(corrupt_path, "ab") as f:
+                    f.writelines(bad_lines)
+
+                if not jobs:
+                    os.remove(path)
+
+                logger.error(
+                    "Spool file had unreadable lines, kept them aside",
+                    extra={"spool_path": path, "corrupt_path": corrupt_path, "skipped": len(bad_lines)},
+                )
+
+            except OSError as ex:
+                logger.error("Failed to set aside unreadable spool lines", extra={"spool_path": path, "error": str(ex)})
+
+        count = 0
+
+        for msg, uids in jobs:
+            self.send_queue.put_nowait(FanoutJob(msg, uids, None, self.stats.on_enqueue(len(uids))))
+            count += len(uids)
+
+        logger.info("Restored undelivered notifications", extra={"pending": count, "spool_path": path})
+        return count
+
+    @staticmethod
+    def _parse_spool_line(line: bytes):
+        """
+        Parses one spool line written by persist_pending.
+
+        Parameters:
+        - line: bytes
+
+        Returns:
+        - tuple(str, list[int]) - message and recipient ids
+
+        Raises:
+        - ValueError, TypeError or KeyError if the line is not a valid spool entry
+        """
+        item = json.loads(line)
+        uids = item["uids"] if "uids" in item else [item["uid"]]
+        msg = item["msg"]
+
+        if not isinstance(msg, str) or not isinstance(uids, list) or not uids:
+            raise ValueError("spool entry needs a msg string and a non-empty uids list")
+
+        if not all(isinstance(uid, int) and not isinstance(uid, bool) for uid in uids):
+            raise ValueError("spool entry uids must be integers")
+
+        return msg, uids
+
+    async def announce_broadcast_invite(self) -> int:
+        """
+        Queues the broadcast chat invite link for the users authorized before broadcast mode was
+        enabled (they never got it with their success auth message). Runs once per chat: the
+        announcement is recorded in the broadcast state, and the messages go through the delivery
+        queue, so they are spooled like notifications if the process stops first.
+
+        Parameters:
+        - None
+
+        Returns:
+        - int - users the link was queued for
+        """
+        channel = self.broadcast_channel
+
+        if channel is None or channel.announced:
+            return 0
+
+        link = await channel.invite_link(self.application.bot)
+        user_ids = await asyncio.to_thread(self.user_auth_manager.get_all_authorized_user_ids)
+
+        if user_ids:
+            msg = "SiteCard notifications have moved to a channel.\n" + channel.invite_message(link)
+            self.send_queue.put_nowait(FanoutJob(msg, user_ids, None, self.stats.on_enqueue(len(user_ids))))
+
+        await channel.mark_announced()
+        get_logger("broadcast").info("Queued broadcast invite for authorized users", extra={"recipients": len(user_ids)})
+        return len(user_ids)
+
     async def send_success_auth_notification(self, user_id: int):
         """
-        Sends a notification message to the user about successful authorization.
+        Sends a notification message to the user about successful authorization
+        (with the broadcast chat invite link in broadcast mode). Called from another loop
+        (the gRPC thread), the send is run on the bot's loop, which owns its HTTP connections.
 
         Parameters:
             user_id (int): Telegram user ID
 
         Returns: None
         """
+        loop = self._loop
+
+        if loop is not None and loop is not asyncio.get_running_loop():
+            future = asyncio.run_coroutine_threadsafe(self.send_success_auth_notification(user_id), loop)
+            return await asyncio.wrap_future(future)
+
         logger = get_logger("success_auth_notification")
         message = "You have successfully authorized.\nYou will now receive notifications from SiteCard."
 
         try:
+
+            if self.broadcast_channel is not None:
+                link = await self.broadcast_channel.invite_link(self.application.bot)
+                message = "You have successfully authorized.\n" + self.broadcast_channel.invite_message(link)
+
             await self.application.bot.send_message(user_id, message)
             logger.info("Sent WebApp success auth message")
 
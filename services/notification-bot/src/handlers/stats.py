@@ -0,0 +1,211 @@
+# SPDX-FileCopyrightText: 2025 Maxim Selin <selinmax05@mail.ru>
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Rolling-window counters for the notification delivery pipeline (queue depth, age of the oldest
+queued item, enqueue/send/error rates). Updates are O(1); reads walk one bucket per second of window.
+"""
+import math
+import threading
+import time
+
+class RollingCounter:
+    """
+    Event count over the last `window` seconds, kept in per-second ring buckets.
+    """
+
+    __slots__ = ("window", "_counts", "_seconds")
+
+    def __init__(self, window: int = 60):
+        """
+        Parameters:
+        - window: int - seconds covered
+
+        Returns:
+        - RollingCounter
+        """
+        self.window = window
+        self._counts = [0] * window
+        self._seconds = [0] * window
+
+    def add(self, now: float, n: int = 1):
+        """
+        Counts n events at monotonic time now (O(1)); a bucket left over from an older second is reset.
+
+        Parameters:
+        - now: float - time.monotonic()
+        - n: int
+
+        Returns:
+        - None
+        """
+        second = int(now)
+        index = second % self.window
+
+        if self._seconds[index] != second:
+            self._seconds[index] = second
+            self._counts[index] = 0
+
+        self._counts[index] += n
+
+    def total(self, now: float) -> int:
+        """
+        Parameters:
+        - now: float - time.monotonic()
+
+        Returns:
+        - int - events within the window ending at now
+        """
+        oldest = int(now) - self.window
+        return sum(count for count, second in zip(self._counts, self._seconds) if second > oldest)
+
+class PipelineStats:
+    """
+    Delivery pipeline counters shared by the enqueueing side (gRPC thread or loop) and the worker.
+    """
+
+    def __init__(self, window: int = 60):
+        """
+        Parameters:
+        - window: int - rolling window for rates (seconds)
+
+        Returns:
+        - PipelineStats
+        """
+        self.window = window
+        self.enqueued = RollingCounter(window)
+        self.sent = RollingCounter(window)
+        self.failed = RollingCounter(window)
+        self.enqueued_total = 0
+        self.sent_total = 0
+        self.failed_total = 0
+        self.pending = 0
+        # enqueue time -> items still pending; times only grow, so dict order is age order
+        self._pending_times = {}
+        self._lock = threading.Lock()
+
+    @property
+    def pending_enqueue_times(self) -> int:
+        """
+        Returns:
+        - int - distinct enqueue times still tracked for pending items
+        """
+        with self._lock:
+            return len(self._pending_times)
+
+    def on_enqueue(self, n: int = 1) -> float:
+        """
+        Records n items entering the queue at the same time.
+
+        Parameters:
+        - n: int
+
+        Returns:
+        - float - enqueue time to pass back to on_dequeue for each of the items
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            self.enqueued.add(now, n)
+            self.enqueued_total += n
+
+            if n > 0:
+                self.pending += n
+
+                while now in self._pending_times:
+                    now = math.nextafter(now, math.inf)
+
+                self._pending_times[now] = n
+
+        return now
+
+    def on_dequeue(self, enqueued_at: float):
+        """
+        Records the worker taking an item off the queue (in any order).
+
+        Parameters:
+        - enqueued_at: float - value returned by on_enqueue for the item
+
+        Returns:
+        - None
+        """
+        with self._lock:
+            left = self._pending_times.get(enqueued_at)
+
+            if left is None:
+                return
+
+            self.pending -= 1
+
+            if left > 1:
+                self._pending_times[enqueued_at] = left - 1
+
+            else:
+                del self._pending_times[enqueued_at]
+
+    def on_send(self, ok: bool):
+        """
+        Records a finished send attempt.
+
+        Parameters:
+        - ok: bool - delivered or failed
+
+        Returns:
+        - None
+        """
+        now = time.monotonic()
+
+        with self._lock:
+
+            if ok:
+                self.sent.add(now)
+                self.sent_total += 1
+
+            else:
+                self.failed.add(now)
+                self.failed_total += 1
+
+    def clear_pending(self):
+        """
+        Forgets queued items (after they were persisted for the next process).
+
+        Parameters:
+        - None
+
+        Returns:
+        - None
+        """
+        with self._lock:
+            self._pending_times.clear()
+            self.pending = 0
+
+    def snapshot(self, queue_depth: int) -> dict:
+        """
+        Parameters:
+        - queue_depth: int - items waiting plus a send in flight
+
+        Returns:
+        - dict - queue_depth, oldest_item_age_seconds, window_seconds, enqueue_rate, send_rate,
+          error_rate (failed share of send attempts in the window), enqueued_total, sent_total, failed_total
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            oldest_age = now - next(iter(self._pending_times)) if self._pending_times else 0.0
+            enqueued = self.enqueued.total(now)
+            sent = self.sent.total(now)
+            failed = self.failed.total(now)
+            totals = (self.enqueued_total, self.sent_total, self.failed_total)
+
+        return {
+            "queue_depth": queue_depth,
+            "oldest_item_age_seconds": round(oldest_age, 3),
+            "window_seconds": self.window,
+            "enqueue_rate": round(enqueued / self.window, 3),
+            "send_rate": round(sent / self.window, 3),
+            "error_rate": round(failed / (sent + failed), 4) if sent + failed else 0.0,
+            "enqueued_total": totals[0],
+            "sent_total": totals[1],
+            "failed_total": totals[2],
+        }
@@ -9,29 +9,86 @@ import sys
 import structlog
 import logging
 import re
+import time
+import atexit
+import threading
+from collections import deque
 from typing import Optional
-from src.errors import TelegramDeliveryException
 
 _config_instance = None
 _debug_mode = None
-_token_value = None
+_secret_masker = None
+_log_sink = None
+_event_sampler = None
+
+SECRET_PLACEHOLDER = "<SECRET>"
+
+class SecretMasker:
+    """
+    Precompiled matcher replacing every configured secret literal with SECRET_PLACEHOLDER.
+    Built once per config load; a substring pre-check skips the regex for clean text.
+    """
+
+    __slots__ = ("secrets", "_pattern")
+
+    def __init__(self, secrets):
+        """
+        Compiles one alternation pattern for all non-empty secrets (longest first).
+
+        Parameters:
+        - secrets: iterable[str|None] - secret values to mask
+
+        Returns:
+        - SecretMasker
+        """
+        self.secrets = tuple(sorted({s for s in secrets if s}, key=len, reverse=True))
+        self._pattern = re.compile("|".join(re.escape(s) for s in self.secrets)) if self.secrets else None
+
+    def mask(self, text: str) -> str:
+        """
+        Masks all secret occurrences in text.
+
+        Parameters:
+        - text: str
+
+        Returns:
+        - str (unchanged object if no secret is present)
+        """
+        for secret in self.secrets:
+
+            if secret in text:
+                return self._pattern.sub(SECRET_PLACEHOLDER, text)
+
+        return text
 
 def set_logger_config_from_config(config):
     """
-    Applies and activates logger config using global config instance; sets debug and token settings.
+    Applies and activates logger config using global config instance; sets debug and masked secrets.
+    Event sampling (log_sampling) applies with and without the async sink.
 
     Parameters:
-    - config: object - must have debug, notification_bot_token
+    - config: object - must have debug, notification_bot_token; webapp_token_secret, admin_key are masked too
 
     Returns:
     - None (side effect)
     """
-    global _config_instance, _debug_mode, _token_value
+    global _config_instance, _debug_mode, _secret_masker, _event_sampler
     _config_instance = config
     _debug_mode = getattr(config, 'debug', None)
-    _token_value = getattr(config, 'notification_bot_token', None)
+    _secret_masker = SecretMasker(
+        getattr(config, name, None)
+        for name in ("notification_bot_token", "webapp_token_secret", "admin_key")
+    )
+    sampling = dict(getattr(config, 'log_sampling', ()) or ())
+    _event_sampler = EventSampler(sampling) if sampling else None
     _setup_logging(_debug_mode)
 
+    if getattr(config, 'log_async_sink', False):
+        _enable_async_sink(_debug_mode, getattr(config, 'log_buffer_size', 10000), _event_sampler)
+
+    elif _event_sampler is not None:
+        _configure_stdlib(_event_sampler)
+
 def _setup_logging(debug):
     log_level = logging.DEBUG if debug else logging.INFO
     logging.basicConfig(
@@ -40,93 +97,276 @@ def _setup_logging(debug):
         level=log_level
     )
 
-def _get_logger_token():
+def mask_secrets_processor(logger, method_name, event_dict):
     """
-    Gets current notification_bot_token from config for masking.
+    structlog processor: replaces configured secrets (bot token, WebApp secret, admin key)
+    in top-level string values with <SECRET>. Non-string values are left untouched.
 
     Parameters:
-    - None (uses global state)
+    - logger: structlog logger
+    - method_name: str
+    - event_dict: dict
 
     Returns:
-    - str - token
-
-    Raises:
-    - TelegramDeliveryException if unavailable
+    - dict (with sensitive values masked)
     """
-    global _config_instance, _token_value
+    masker = _secret_masker
+
+    if masker is None or not masker.secrets:
+        return event_dict
 
-    if _token_value:
-        return _token_value
+    mask = masker.mask
 
-    if _config_instance and hasattr(_config_instance, 'notification_bot_token'):
-        return _config_instance.notification_bot_token
+    for k, v in event_dict.items():
 
-    raise TelegramDeliveryException("NOTIFICATION_BOT_TOKEN must be set in config")
+        if isinstance(v, str):
+            event_dict[k] = mask(v)
 
-def mask_secrets_processor(logger, method_name, event_dict):
+    return event_dict
+
+class EventSampler:
+    """
+    structlog processor: rate-based sampling per event key.
+    Events with a configured limit pass at most `limit` times per second; the rest are dropped
+    before masking/rendering. Warnings and errors are never sampled.
     """
-    structlog processor: finds and replaces logged Telegram tokens with <SECRET>.
 
-    Parameters:
-    - logger: structlog logger
-    - method_name: str
-    - event_dict: dict
+    __slots__ = ("rates", "sampled_out", "_windows")
 
-    Returns:
-    - dict (with sensitive values masked)
-    """
-    try:
-        token = _get_logger_token()
+    UNSAMPLED_METHODS = frozenset(("warning", "warn", "error", "err", "exception", "critical", "fatal"))
 
-    except TelegramDeliveryException:
-        return event_dict
+    def __init__(self, rates):
+        """
+        Parameters:
+        - rates: dict[str, int] - event key -> max events per second
 
-    if not token:
+        Returns:
+        - EventSampler
+        """
+        self.rates = dict(rates)
+        self.sampled_out = 0
+        self._windows = {}
+
+    def __call__(self, logger, method_name, event_dict):
+        """
+        Drops the event when its per-second budget is exhausted.
+
+        Parameters:
+        - logger: structlog logger
+        - method_name: str
+        - event_dict: dict
+
+        Returns:
+        - dict (unchanged)
+
+        Raises:
+        - structlog.DropEvent if sampled out
+        """
+        limit = self.rates.get(event_dict.get("event"))
+
+        if limit is None or method_name in self.UNSAMPLED_METHODS:
+            return event_dict
+
+        event = event_dict["event"]
+        second = int(time.monotonic())
+        window = self._windows.get(event)
+
+        if window is None or window[0] != second:
+            window = [second, 0]
+            self._windows[event] = window
+
+        if window[1] >= limit:
+            self.sampled_out += 1
+            raise structlog.DropEvent
+
+        window[1] += 1
         return event_dict
 
-    regex_token = re.escape(token)
-    pattern_url = rf"https://api\.telegram\.org/bot{regex_token}"
+class AsyncLogSink:
+    """
+    Bounded ring buffer of rendered log lines drained to a stream by a background writer thread.
+    Producers never block: when the buffer is full the newest line is dropped and counted.
+    """
 
-    def mask_text(text):
+    def __init__(self, stream=None, capacity=10000, flush_interval=0.05):
         """
-        Mask token and API URLs in provided text for logging safety.
+        Starts the writer thread.
 
         Parameters:
-        - text: str
+        - stream: file-like (default sys.stdout)
+        - capacity: int - max buffered lines
+        - flush_interval: float - max seconds between writer wake-ups
 
         Returns:
-        - str (safely masked)
+        - AsyncLogSink
         """
-        if not isinstance(text, str):
-            return text
+        self.stream = stream or sys.stdout
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._buffer = deque()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="log_sink_writer", daemon=True)
+        self._thread.start()
 
-        masked = re.sub(regex_token, "<SECRET>", text)
-        masked = re.sub(pattern_url, "https://api.telegram.org/bot[SECRET]", masked)
-        return masked
+    def write(self, line: str):
+        """
+        Enqueues one rendered line (non-blocking).
 
-    for k, v in event_dict.items():
+        Parameters:
+        - line: str
 
-        if isinstance(v, str):
-            event_dict[k] = mask_text(v)
+        Returns:
+        - None
+        """
+        if len(self._buffer) >= self.capacity:
+            self.dropped += 1
+            return
 
-    if isinstance(event_dict.get("event"), str):
-        event_dict["event"] = mask_text(event_dict["event"])
+        self._buffer.append(line)
 
-    return event_dict
+        if not self._wakeup.is_set():
+            self._wakeup.set()
+
+    def _drain(self):
+        buffer = self._buffer
+        lines = []
+
+        while buffer:
+            lines.append(buffer.popleft())
+
+        if lines:
+            self.stream.write("\n".join(lines) + "\n")
+            self.stream.flush()
+
+    def _run(self):
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self._drain()
+
+        self._drain()
+
+    def close(self, timeout=2.0):
+        """
+        Stops the writer thread after flushing buffered lines (idempotent).
+
+        Parameters:
+        - timeout: float - max seconds to wait for the writer
 
-structlog.configure(
-    processors=[
+        Returns:
+        - None
+        """
+        if self._closed:
+            return
+
+        self._closed = True
+        self._wakeup.set()
+        self._thread.join(timeout)
+
+class _SinkLogger:
+    """
+    Minimal structlog output logger forwarding rendered events to an AsyncLogSink.
+    """
+
+    __slots__ = ("_write",)
+
+    def __init__(self, sink):
+        self._write = sink.write
+
+    def msg(self, message):
+        self._write(message)
+
+    debug = info = warning = warn = error = err = exception = critical = fatal = log = msg
+
+def _build_processors(sampler=None):
+    """
+    Builds the structlog processor chain (sampling first, so dropped events cost nothing).
+
+    Parameters:
+    - sampler: EventSampler|None
+
+    Returns:
+    - list[callable]
+    """
+    processors = [
         mask_secrets_processor,
         structlog.processors.add_log_level,
         structlog.processors.TimeStamper(fmt="iso"),
         structlog.processors.format_exc_info,
         structlog.processors.JSONRenderer()
-    ],
-    wrapper_class=structlog.stdlib.BoundLogger,
-    context_class=dict,
-    logger_factory=structlog.stdlib.LoggerFactory(),
-    cache_logger_on_first_use=True,
-)
+    ]
+
+    if sampler is not None:
+        processors.insert(0, sampler)
+
+    return processors
+
+def _configure_stdlib(sampler=None):
+    """
+    Configures structlog to render events through stdlib logging (the default output).
+
+    Parameters:
+    - sampler: EventSampler|None
+
+    Returns:
+    - None (side effect)
+    """
+    structlog.configure(
+        processors=_build_processors(sampler),
+        wrapper_class=structlog.stdlib.BoundLogger,
+        context_class=dict,
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        cache_logger_on_first_use=True,
+    )
+
+def _enable_async_sink(debug, capacity, sampler=None):
+    """
+    Reconfigures structlog to render events on the caller and write them through an AsyncLogSink.
+
+    Parameters:
+    - debug: bool - enables debug level
+    - capacity: int - ring buffer size
+    - sampler: EventSampler|None - per-event rate sampling
+
+    Returns:
+    - None (side effect)
+    """
+    global _log_sink
+
+    if _log_sink is not None:
+        _log_sink.close()
+
+    _log_sink = AsyncLogSink(sys.stdout, capacity)
+    sink = _log_sink
+    atexit.register(sink.close)
+
+    structlog.configure(
+        processors=_build_processors(sampler),
+        wrapper_class=structlog.make_filtering_bound_logger(logging.DEBUG if debug else logging.INFO),
+        context_class=dict,
+        logger_factory=lambda *args: _SinkLogger(sink),
+        cache_logger_on_first_use=True,
+    )
+
+def get_log_sink_stats():
+    """
+    Returns async sink/sampler counters (sink counters are zero when the async sink is disabled).
+
+    Parameters:
+    - None
+
+    Returns:
+    - dict: buffered, dropped, sampled_out
+    """
+    return {
+        "buffered": len(_log_sink._buffer) if _log_sink else 0,
+        "dropped": _log_sink.dropped if _log_sink else 0,
+        "sampled_out": _event_sampler.sampled_out if _event_sampler else 0,
+    }
+
+_configure_stdlib()
 
 def get_logger(name=None):
     """
@@ -0,0 +1,251 @@
+# SPDX-FileCopyrightText: 2025 Maxim Selin <selinmax05@mail.ru>
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Event-loop lag monitor for notification-bot. A probe task on each monitored loop (Telegram and
+gRPC) sleeps for a fixed interval and records how late it wakes up into a histogram. A shared
+watchdog thread notices a probe that is overdue while the loop is still stalled and captures the
+stack of the loop thread, i.e. of the coroutine doing blocking work, so the call can be located.
+"""
+import sys
+import time
+import asyncio
+import threading
+import traceback
+from bisect import bisect_left
+from src.logger import get_logger
+
+logger = get_logger("loop_monitor")
+
+LAG_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+STACK_LIMIT = 20
+
+class LoopLagMonitor:
+    """
+    Scheduling-delay probe for one event loop.
+    """
+
+    def __init__(self, name: str, interval: float = 0.1, threshold: float = 0.1):
+        """
+        Parameters:
+        - name: str - loop label in logs and stats ("telegram", "grpc", ...)
+        - interval: float - probe sleep (seconds)
+        - threshold: float - lag (seconds) reported as a stall with the blocking stack
+
+        Returns:
+        - LoopLagMonitor
+        """
+        self.name = name
+        self.interval = interval
+        self.threshold = threshold
+        self.buckets = [0] * (len(LAG_BUCKETS_MS) + 1)
+        self.samples = 0
+        self.stalls = 0
+        self.max_lag_ms = 0.0
+        self._thread_id = None
+        self._last_beat = None
+        self._reported_beat = None
+        self._blocking_stack = None
+        self._task = None
+
+    def start(self):
+        """
+        Starts the probe on the running loop (call from the loop thread).
+
+        Parameters:
+        - None
+
+        Returns:
+        - None
+        """
+        self._thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._task = asyncio.get_running_loop().create_task(self._probe(), name=f"loop-lag-monitor-{self.name}")
+        _watchdog.add(self)
+        logger.info("Event loop lag monitor started", extra={"loop": self.name, "lag_threshold_ms": self.threshold * 1000})
+
+    async def stop(self):
+        """
+        Stops the probe (call from the monitored loop).
+
+        Parameters:
+        - None
+
+        Returns:
+        - None
+        """
+        _watchdog.remove(self)
+
+        if self._task is not None:
+            self._task.cancel()
+
+            try:
+                await self._task
+
+            except asyncio.CancelledError:
+                pass
+
+            self._task = None
+
+    async def _probe(self):
+
+        while True:
+            self._last_beat = start = time.monotonic()
+            await asyncio.sleep(self.interval)
+            self.observe(time.monotonic() - start - self.interval)
+
+    def observe(self, lag: float):
+        """
+        Records one scheduling delay; lag above threshold is logged with the stack captured while stalled.
+
+        Parameters:
+        - lag: float - seconds the probe woke up late
+
+        Returns:
+        - None
+        """
+        lag_ms = max(lag, 0.0) * 1000
+        self.buckets[bisect_left(LAG_BUCKETS_MS, lag_ms)] += 1
+        self.samples += 1
+        self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+
+        if lag >= self.threshold:
+            self.stalls += 1
+            logger.warning(
+                "Event loop lag above threshold",
+                extra={"loop": self.name, "lag_ms": round(lag_ms, 1), "blocking_stack": self._blocking_stack},
+            )
+
+        self._blocking_stack = None
+
+    def check(self, now: float):
+        """
+        Watchdog hook: captures and logs the loop thread's stack once per stall while it is blocked.
+
+        Parameters:
+        - now: float - time.monotonic()
+
+        Returns:
+        - None
+        """
+        beat = self._last_beat
+
+        if beat is None or beat == self._reported_beat:
+            return
+
+        blocked = now - beat - self.interval
+
+        if blocked < self.threshold:
+            return
+
+        self._reported_beat = beat
+        frame = sys._current_frames().get(self._thread_id)
+        self._blocking_stack = "".join(traceback.format_stack(frame, limit=STACK_LIMIT)) if frame is not None else None
+        logger.warning(
+            "Event loop blocked",
+            extra={"loop": self.name, "blocked_ms": round(blocked * 1000, 1), "blocking_stack": self._blocking_stack},
+        )
+
+    def snapshot(self) -> dict:
+        """
+        Parameters:
+        - None
+
+        Returns:
+        - dict - loop, samples, stalls, max_lag_ms, p99_lag_ms (upper bound of the p99 histogram bucket)
+        """
+        p99 = 0.0
+
+        if self.samples:
+            rank = self.samples * 0.99
+            seen = 0
+
+            for index, count in enumerate(self.buckets):
+                seen += count
+
+                if seen >= rank:
+                    p99 = float(LAG_BUCKETS_MS[index]) if index < len(LAG_BUCKETS_MS) else self.max_lag_ms
+                    break
+
+        return {
+            "loop": self.name,
+            "samples": self.samples,
+            "stalls": self.stalls,
+            "max_lag_ms": round(self.max_lag_ms, 1),
+            "p99_lag_ms": min(p99, round(self.max_lag_ms, 1)),
+        }
+
+class _Watchdog:
+    """
+    Single daemon thread checking all registered monitors for overdue probes.
+    """
+
+    def __init__(self):
+        self._monitors = []
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def add(self, monitor):
+        with self._lock:
+            self._monitors.append(monitor)
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="loop-lag-watchdog", daemon=True)
+                self._thread.start()
+
+    def remove(self, monitor):
+        with self._lock:
+
+            if monitor in self._monitors:
+                self._monitors.remove(monitor)
+
+    def _run(self):
+
+        while True:
+
+            with self._lock:
+                monitors = list(self._monitors)
+
+            period = min((m.threshold for m in monitors), default=0.1) / 2
+            time.sleep(max(period, 0.01))
+            now = time.monotonic()
+
+            for monitor in monitors:
+                monitor.check(now)
+
+_watchdog = _Watchdog()
+_registry = {}
+
+def start_loop_monitor(name: str, config):
+    """
+    Starts a lag monitor on the running loop unless disabled (loop_lag_threshold_ms <= 0).
+
+    Parameters:
+    - name: str - loop label
+    - config: object - loop_lag_interval_ms, loop_lag_threshold_ms
+
+    Returns:
+    - LoopLagMonitor|None
+    """
+    threshold_ms = getattr(config, "loop_lag_threshold_ms", 100.0)
+
+    if threshold_ms <= 0:
+        return None
+
+    monitor = LoopLagMonitor(name, getattr(config, "loop_lag_interval_ms", 100.0) / 1000, threshold_ms / 1000)
+    monitor.start()
+    _registry[name] = monitor
+    return monitor
+
+def get_loop_lag_stats():
+    """
+    Returns snapshots of all started monitors.
+
+    Parameters:
+    - None
+
+    Returns:
+    - list[dict]
+    """
+    return [monitor.snapshot() for monitor in list(_registry.values())]
@@ -4,23 +4,195 @@
 
 """
 Main entrypoint for notification-bot, initializes config, handlers, Telegram app, gRPC server.
+Run with --profile-startup to report import times and time to gRPC start / first poll.
 """
+import sys
 import logging
-import threading
 import asyncio
 import atexit
+import signal
+from src import startup_profile
+
+# Import timing must be active before the subsystems below are imported
+if __name__ == "__main__" and "--profile-startup" in sys.argv[1:]:
+    startup_profile.enable()
+
 from src.config import Config
+from src.logger import set_logger_config_from_config
+from src.tracing import configure_tracing
+from src.profiler import configure_profiler, get_profiler
+from src.memory_trace import configure_memory_tracer
+from src.loop_monitor import start_loop_monitor
 from src.errors import NotificationException
 from src.clients import NotificationUserRepository
 from src.handlers import UserAuthManager, user_auth_manager as global_user_auth_manager
 from src.bot import build_application
-from src.api import serve
+from src.api import start_server, ServerThread, Readiness
+from src.api.recorder import configure_recorder
 from src.handlers import NotificationHandler
+from src.warmup import warm_up
+
+async def start_updates(config, application):
+    """
+    Starts receiving Telegram updates: long polling, or the embedded webhook listener
+    (registered with Telegram when webhook_url is set).
+
+    Parameters:
+    - config: Config
+    - application: telegram.ext.Application (initialized)
+
+    Returns:
+    - WebhookServer|None - started webhook listener in webhook mode
+    """
+    if config.update_mode != "webhook":
+        await application.updater.start_polling()
+        return None
+
+    # Webhook support is only imported when the mode is selected
+    from telegram import Update
+    from src.bot.webhook import WebhookServer
+
+    webhook_server = WebhookServer(
+        application,
+        config.webhook_listen,
+        config.webhook_port,
+        config.webhook_path,
+        config.webhook_secret,
+    )
+    await webhook_server.start()
+
+    if config.webhook_url:
+        await application.bot.set_webhook(
+            url=config.webhook_url,
+            secret_token=config.webhook_secret,
+            allowed_updates=Update.ALL_TYPES,
+        )
+
+    return webhook_server
+
+async def stop_updates(application, webhook_server):
+    """
+    Stops whichever update source start_updates started.
+
+    Parameters:
+    - application: telegram.ext.Application
+    - webhook_server: WebhookServer|None
+
+    Returns:
+    - None
+    """
+    if webhook_server is not None:
+        await webhook_server.stop()
+
+    if application.updater and application.updater.running:
+        await application.updater.stop()
+
+async def drain_and_persist(config, handler):
+    """
+    Drains the delivery queue within config.drain_deadline and spools whatever is left to
+    config.pending_spool_path, to be re-enqueued on next start. Runs on the worker's loop
+    after gRPC ingress has stopped.
+
+    Parameters:
+    - config: Config
+    - handler: NotificationHandler
+
+    Returns:
+    - int - notifications persisted
+    """
+    await handler.drain(config.drain_deadline)
+    return handler.persist_pending(config.pending_spool_path)
+
+def install_profiler_signal(loop):
+    """
+    Makes SIGUSR2 start a sampling profiler session, or stop the running one. The toggle runs as
+    a loop callback instead of in signal context, so it can never interrupt a StartProfiler call
+    holding the profiler lock on the same thread.
+
+    Parameters:
+    - loop: asyncio.AbstractEventLoop - running on the main thread
+
+    Returns:
+    - None
+    """
+    if hasattr(signal, "SIGUSR2"):
+        loop.add_signal_handler(signal.SIGUSR2, get_profiler().toggle)
+
+async def run_event_loop(config, application, handler, readiness, with_grpc=True, grpc_thread=None):
+    """
+    Runs the Telegram Application (and, with_grpc, the gRPC aio server) on the current event loop.
+    Startup order: Telegram initialize -> warm-up (starts the delivery worker) -> Application start
+    -> updates -> gRPC server -> ready. Shutdown first reports NOT_SERVING, then runs in reverse
+    order on SIGINT/SIGTERM, so no RPC can enqueue into a stopped worker; the delivery queue is
+    drained (bounded by drain_deadline) and leftovers persisted before exit.
+
+    Parameters:
+    - config: Config
+    - application: telegram.ext.Application
+    - handler: NotificationHandler (created with single_loop=True when with_grpc)
+    - readiness: Readiness - marked ready once everything is started
+    - with_grpc: bool - serve gRPC on this loop (single_loop runtime mode)
+    - grpc_thread: ServerThread|None - gRPC server running on its own thread, stopped first on shutdown
+
+    Returns:
+    - None (runs until a stop signal is received)
+    """
+    logger = logging.getLogger(__name__)
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    install_profiler_signal(loop)
+
+    server = None
+    webhook_server = None
+    monitor = start_loop_monitor("event_loop" if with_grpc else "telegram", config)
+
+    try:
+        await application.initialize()
+        await warm_up(config, application, handler)
+        await application.start()
+        webhook_server = await start_updates(config, application)
+
+        if with_grpc:
+            server = await start_server(config, handler, readiness)
+
+        await readiness.mark_ready()
+        logger.info("Event loop runtime started")
+        await stop_event.wait()
+        logger.info("Event loop runtime stopping")
+
+    finally:
+        await readiness.mark_shutting_down()
+
+        if server is not None:
+            await server.stop(config.grpc_shutdown_grace)
+
+        if grpc_thread is not None:
+            await grpc_thread.stop(config.grpc_shutdown_grace)
+
+        await stop_updates(application, webhook_server)
+
+        if application.running:
+            await application.stop()
+
+        await drain_and_persist(config, handler)
+        await application.shutdown()
+
+        if monitor is not None:
+            await monitor.stop()
 
 def main():
     """
     Initializes and runs all notification-bot systems: config, Telegram bot, notification handler, and gRPC server.
     Registers cleanup for DB repo, starts async notification delivery and polling.
+    With runtime_mode "single_loop" everything runs on one event loop (see run_event_loop),
+    otherwise the gRPC server gets its own thread and loop. update_mode "webhook" replaces
+    run_polling with the embedded webhook listener. Notifications persisted by a previous
+    shutdown are re-enqueued before delivery starts. gRPC contact and auth calls are accepted
+    only after the warm-up phase (see src.warmup) has marked the process ready.
 
     Parameters:
     - None
@@ -37,6 +209,23 @@ def main():
         logging.error(f"Configuration error: {e}")
         exit(1)
 
+    set_logger_config_from_config(config)
+    configure_tracing(config)
+    configure_profiler(config)
+    memory_tracer = configure_memory_tracer(config)
+    atexit.register(configure_recorder(config).close)
+
+    # SIGUSR2 toggles the profiler once an event loop runs (install_profiler_signal); until then
+    # it is ignored rather than terminating the process
+    if hasattr(signal, "SIGUSR2"):
+        signal.signal(signal.SIGUSR2, signal.SIG_IGN)
+
+    startup_profile.expect((
+        "grpc_server_started",
+        "ready",
+        "webhook_listener_started" if config.update_mode == "webhook" else "first_poll",
+    ))
+
     user_repo = NotificationUserRepository(config)
     global global_user_auth_manager
     global_user_auth_manager = UserAuthManager(user_repo)
@@ -57,13 +246,37 @@ def main():
 
     # Build and register Telegram app, data and notification handler
     application = build_application(config, global_user_auth_manager)
-    handler = NotificationHandler(application, global_user_auth_manager)
+    single_loop = config.runtime_mode == "single_loop"
+    handler = NotificationHandler(
+        application,
+        global_user_auth_manager,
+        single_loop=single_loop,
+        stats_window=config.pipeline_stats_window,
+        broadcast_channel=application.bot_data.get("broadcast_channel"),
+        failure_limit=config.recipient_failure_limit,
+        send_concurrency=config.delivery_send_concurrency,
+    )
     application.bot_data["notification_handler"] = handler
+    memory_tracer.add_probe("telegram", lambda: {
+        "user_data": len(application.user_data),
+        "chat_data": len(application.chat_data),
+        "bot_data_keys": len(application.bot_data),
+    })
+    handler.restore_pending(config.pending_spool_path)
+    readiness = Readiness()
+
+    if single_loop:
+        asyncio.run(run_event_loop(config, application, handler, readiness))
+        return
+
+    # Warm up (starting the delivery worker) and report ready
+    telegram_monitor = None
 
-    # Run delivery worker
     async def startup_callback(app):
         """
-        Starts background delivery worker after Telegram Application event loop is running.
+        Installs the SIGUSR2 profiler toggle and runs the warm-up phase, which starts the background
+        delivery worker, and the loop lag monitor after Telegram Application event loop is running,
+        then marks the process ready.
 
         Parameters:
         - app: telegram.ext.Application
@@ -71,27 +284,41 @@ def main():
         Returns:
         - None
         """
-        handler = app.bot_data["notification_handler"]
-        await handler.start_worker()
+        nonlocal telegram_monitor
+        install_profiler_signal(asyncio.get_running_loop())
+        await warm_up(config, app, app.bot_data["notification_handler"])
+        telegram_monitor = start_loop_monitor("telegram", config)
+        await readiness.mark_ready()
 
-    application.post_init = startup_callback
+    # Run async gRPC server on its own thread and loop
+    grpc_thread = ServerThread(config, handler, readiness)
 
-    # Run async gRPC server
-    def grpc_target():
+    if config.update_mode == "webhook":
+        grpc_thread.start()
+        asyncio.run(run_event_loop(config, application, handler, readiness, with_grpc=False, grpc_thread=grpc_thread))
+        return
+
+    async def shutdown_callback(app):
         """
-        Runs async gRPC notification server in a separate thread using asyncio event loop.
+        Reports NOT_SERVING and stops gRPC ingress, then drains and persists the delivery queue after polling has stopped,
+        and stops the Telegram loop lag monitor.
 
         Parameters:
-        - None
+        - app: telegram.ext.Application
 
         Returns:
         - None
         """
-        asyncio.run(serve(config, handler))
+        await readiness.mark_shutting_down()
+        await grpc_thread.stop(config.grpc_shutdown_grace)
+        await drain_and_persist(config, app.bot_data["notification_handler"])
 
-    grpc_thread = threading.Thread(target=grpc_target, daemon=True)
-    grpc_thread.start()
+        if telegram_monitor is not None:
+            await telegram_monitor.stop()
 
+    application.post_init = startup_callback
+    application.post_stop = shutdown_callback
+    grpc_thread.start()
     application.run_polling()
 
 if __name__ == "__main__":
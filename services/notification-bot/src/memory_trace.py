@@ -0,0 +1,267 @@
+# SPDX-FileCopyrightText: 2025 Maxim Selin <selinmax05@mail.ru>
+#
+# SPDX-License-Identifier: MIT
+
+"""
+On-demand memory instrumentation for notification-bot. A snapshot writes a text report with RSS,
+the sizes of known long-lived structures (delivery queues, rate limiter table, logger registry,
+PTB user/chat data, ...) and, while tracemalloc tracing is on, the top allocation sites by file
+and line plus the growth since the previous snapshot. Tracing is off by default and costs nothing
+until started by the StartMemoryTrace admin RPC (or PYTHONTRACEMALLOC at interpreter start).
+"""
+import gc
+import os
+import time
+import logging
+import threading
+import tracemalloc
+from src.logger import get_logger, get_log_sink_stats
+
+logger = get_logger("memory_trace")
+
+# Traces of the tracing machinery itself are not interesting
+SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+def rss_bytes() -> int:
+    """
+    Returns the current resident set size (0 where /proc is unavailable).
+
+    Parameters:
+    - None
+
+    Returns:
+    - int
+    """
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+    except (OSError, ValueError, IndexError):
+        return 0
+
+def process_structures() -> dict:
+    """
+    Process-wide structure sizes (logger registry, async log sink, garbage collector).
+
+    Parameters:
+    - None
+
+    Returns:
+    - dict
+    """
+    sink = get_log_sink_stats()
+    return {
+        "stdlib_loggers": len(logging.Logger.manager.loggerDict),
+        "log_sink_buffered": sink["buffered"],
+        "gc_objects": len(gc.get_objects()),
+        "gc_generation_counts": gc.get_count(),
+        "threads": threading.active_count(),
+    }
+
+class MemoryTracer:
+    """
+    tracemalloc session control and snapshot reports; structure probes are registered by the
+    components owning the structures.
+    """
+
+    def __init__(self, output_dir="data/memory", frames=1, top=25):
+        """
+        Parameters:
+        - output_dir: str - directory receiving report files
+        - frames: int - stack frames stored per traced allocation
+        - top: int - allocation sites listed per report section
+
+        Returns:
+        - MemoryTracer
+        """
+        self.output_dir = output_dir
+        self.frames = frames
+        self.top = top
+        self.snapshots = 0
+        self._previous = None
+        self._probes = {"process": process_structures}
+        self._lock = threading.Lock()
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def add_probe(self, name: str, probe):
+        """
+        Registers (or replaces) a structure probe reported in every snapshot.
+
+        Parameters:
+        - name: str - section prefix
+        - probe: callable() -> dict
+
+        Returns:
+        - None
+        """
+        self._probes[name] = probe
+
+    def start(self, frames=None) -> bool:
+        """
+        Starts allocation tracing (no-op if already tracing).
+
+        Parameters:
+        - frames: int|None - overrides the stored frames per allocation
+
+        Returns:
+        - bool - True if tracing was started by this call
+        """
+        with self._lock:
+
+            if tracemalloc.is_tracing():
+                return False
+
+            tracemalloc.start(frames or self.frames)
+            self.snapshots = 0
+            self._previous = None
+
+        logger.info("Memory tracing started", extra={"trace_frames": frames or self.frames})
+        return True
+
+    def stop(self):
+        """
+        Stops allocation tracing and frees the traces and the kept snapshot.
+
+        Parameters:
+        - None
+
+        Returns:
+        - None
+        """
+        with self._lock:
+            tracemalloc.stop()
+            self._previous = None
+
+        logger.info("Memory tracing stopped")
+
+    def status(self) -> dict:
+        """
+        Parameters:
+        - None
+
+        Returns:
+        - dict - tracing, snapshots, traced_bytes, traced_peak_bytes, rss_bytes
+        """
+        traced, peak = tracemalloc.get_traced_memory()
+        return {
+            "tracing": self.tracing,
+            "snapshots": self.snapshots,
+            "traced_bytes": traced,
+            "traced_peak_bytes": peak,
+            "rss_bytes": rss_bytes(),
+        }
+
+    def snapshot(self, top=None) -> str:
+        """
+        Writes a memory report: RSS, structure sizes and, while tracing, top allocation sites and the
+        difference to the previous snapshot of this tracing session. Blocking; call off the event loop.
+
+        Parameters:
+        - top: int|None - overrides the number of allocation sites listed
+
+        Returns:
+        - str - report path
+        """
+        top = top or self.top
+
+        with self._lock:
+            lines = [f"# notification-bot memory snapshot ({time.strftime('%Y-%m-%d %H:%M:%S')}, pid {os.getpid()})"]
+            lines.append(f"rss_bytes: {rss_bytes()}")
+            lines.append("")
+            lines.append("[structures]")
+
+            for name, probe in list(self._probes.items()):
+
+                try:
+                    values = probe()
+
+                except Exception as ex:
+                    values = {"error": str(ex)}
+
+                for key, value in values.items():
+                    lines.append(f"{name}.{key}: {value}")
+
+            if tracemalloc.is_tracing():
+                snap = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+                traced, peak = tracemalloc.get_traced_memory()
+                self.snapshots += 1
+                lines.append("")
+                lines.append(f"[tracemalloc] snapshot {self.snapshots}, traced_bytes: {traced}, traced_peak_bytes: {peak}")
+                lines.append("")
+                lines.append(f"[top {top} allocation sites]")
+                lines.extend(str(stat) for stat in snap.statistics("lineno")[:top])
+
+                if self._previous is not None:
+                    lines.append("")
+                    lines.append(f"[top {top} changes since snapshot {self.snapshots - 1}]")
+                    lines.extend(str(stat) for stat in snap.compare_to(self._previous, "lineno")[:top])
+
+                self._previous = snap
+
+            else:
+                lines.append("")
+                lines.append("[tracemalloc] not tracing (start it to list allocation sites)")
+
+            path = self._write(lines)
+
+        logger.info("Memory snapshot written", extra={"memory_report": path})
+        return path
+
+    def _write(self, lines):
+        """
+        Parameters:
+        - lines: list[str]
+
+        Returns:
+        - str - file path
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f"mem-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{self.snapshots}.txt")
+
+        while os.path.exists(path):
+            path = path[:-len(".txt")] + "-1.txt"
+
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+        return path
+
+_memory_tracer = MemoryTracer()
+
+def configure_memory_tracer(config):
+    """
+    Replaces the global memory tracer according to config (memory_snapshot_dir, memory_trace_frames, memory_snapshot_top).
+
+    Parameters:
+    - config: object
+
+    Returns:
+    - MemoryTracer
+    """
+    global _memory_tracer
+    _memory_tracer = MemoryTracer(
+        output_dir=getattr(config, "memory_snapshot_dir", "data/memory"),
+        frames=getattr(config, "memory_trace_frames", 1),
+        top=getattr(config, "memory_snapshot_top", 25),
+    )
+    return _memory_tracer
+
+def get_memory_tracer() -> MemoryTracer:
+    """
+    Returns the process-wide memory tracer.
+
+    Parameters:
+    - None
+
+    Returns:
+    - MemoryTracer
+    """
+    return _memory_tracer
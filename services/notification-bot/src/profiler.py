@@ -0,0 +1,257 @@
+# SPDX-FileCopyrightText: 2025 Maxim Selin <selinmax05@mail.ru>
+#
+# SPDX-License-Identifier: MIT
+
+"""
+On-demand in-process sampling profiler for notification-bot. A timer thread samples
+sys._current_frames() for every thread (PTB loop, gRPC loop, helpers) and aggregates stacks;
+on stop they are written in collapsed ("folded") format readable by flamegraph.pl, speedscope
+or inferno. Started/stopped by SIGUSR2 or the StartProfiler/StopProfiler admin RPCs.
+"""
+import os
+import sys
+import time
+import threading
+from src.logger import get_logger
+
+logger = get_logger("profiler")
+
+SAMPLING_SWITCH_INTERVAL = 0.0002
+
+class SamplingProfiler:
+    """
+    Wall-clock stack sampler; one profiling session at a time.
+    """
+
+    def __init__(self, output_dir="data/profiles", interval=0.01, max_duration=300.0, short_switch_interval=False):
+        """
+        Parameters:
+        - output_dir: str - directory receiving .folded files
+        - interval: float - seconds between samples
+        - max_duration: float - sessions stop automatically after this many seconds
+        - short_switch_interval: bool - lower the process-wide GIL switch interval during sessions
+          (less bias towards idle stacks, more overhead on every thread)
+
+        Returns:
+        - SamplingProfiler
+        """
+        self.output_dir = output_dir
+        self.interval = interval
+        self.max_duration = max_duration
+        self.short_switch_interval = short_switch_interval
+        self.samples = 0
+        self.last_output = ""
+        self._sessions = 0
+        self._stacks = {}
+        self._labels = {}
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self, duration=None, interval=None, short_switch_interval=None) -> bool:
+        """
+        Starts a sampling session (no-op if one is running).
+
+        Parameters:
+        - duration: float|None - seconds until automatic stop (capped by max_duration)
+        - interval: float|None - overrides the sampling interval for this session
+        - short_switch_interval: bool|None - overrides short_switch_interval for this session
+
+        Returns:
+        - bool - True if a new session was started
+        """
+        with self._lock:
+
+            if self._thread is not None:
+                return False
+
+            duration = min(duration or self.max_duration, self.max_duration)
+            interval = interval or self.interval
+            short_switch = self.short_switch_interval if short_switch_interval is None else short_switch_interval
+            self._stacks = {}
+            self.samples = 0
+            self._sessions += 1
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, args=(interval, duration, short_switch), name="sampling-profiler", daemon=True
+            )
+            self._thread.start()
+
+        logger.info(
+            "Sampling profiler started",
+            extra={"profile_interval": interval, "profile_duration": duration, "profile_short_switch_interval": short_switch},
+        )
+        return True
+
+    def stop(self) -> str:
+        """
+        Stops the running session and writes its collapsed stacks.
+
+        Parameters:
+        - None
+
+        Returns:
+        - str - output path ("" if nothing was running or the session failed)
+        """
+        with self._lock:
+            thread = self._thread
+
+        if thread is None:
+            return ""
+
+        self._stop.set()
+        thread.join()
+        return self.last_output
+
+    def toggle(self):
+        """
+        Starts a session, or asks the running one to stop and write its output without waiting
+        for it (SIGUSR2 entry point, run as an event loop callback; must not block the loop).
+
+        Parameters:
+        - None
+
+        Returns:
+        - None
+        """
+        if self.running:
+            self._stop.set()
+
+        else:
+            self.start()
+
+    def _run(self, interval, duration, short_switch):
+        own_id = threading.get_ident()
+        deadline = time.monotonic() + duration
+        stacks = self._stacks
+        # The sampler only runs once it gets the GIL; with the default 5 ms switch interval it mostly
+        # gets it when a loop thread blocks in select(), biasing samples towards idle. A short switch
+        # interval makes a busy thread yield mid-work, but applies to every thread in the process,
+        # so it is opt-in.
+        switch_interval = sys.getswitchinterval()
+
+        if short_switch:
+            sys.setswitchinterval(min(switch_interval, SAMPLING_SWITCH_INTERVAL))
+
+        path = ""
+
+        # Whatever fails (sampling or writing), the session must end so the next start() can run
+        try:
+
+            try:
+
+                while not self._stop.wait(interval) and time.monotonic() < deadline:
+                    names = {thread.ident: thread.name for thread in threading.enumerate()}
+
+                    for thread_id, frame in sys._current_frames().items():
+
+                        if thread_id == own_id:
+                            continue
+
+                        key = self._collapse(names.get(thread_id, f"thread-{thread_id}"), frame)
+                        stacks[key] = stacks.get(key, 0) + 1
+
+                    self.samples += 1
+
+            finally:
+                sys.setswitchinterval(switch_interval)
+
+            path = self._write(stacks)
+
+        except Exception as ex:
+            logger.error("Sampling profiler failed", extra={"profile_samples": self.samples, "error": repr(ex)})
+
+        finally:
+
+            with self._lock:
+                self.last_output = path
+                self._thread = None
+
+        if path:
+            logger.info("Sampling profiler stopped", extra={"profile_samples": self.samples, "profile_output": path})
+
+    def _collapse(self, thread_name, frame):
+        """
+        Builds the folded key "thread;outermost;...;innermost" for a frame chain.
+
+        Parameters:
+        - thread_name: str
+        - frame: frame - innermost frame
+
+        Returns:
+        - str
+        """
+        labels = self._labels
+        parts = []
+
+        while frame is not None:
+            code = frame.f_code
+            label = labels.get(code)
+
+            if label is None:
+                label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+                labels[code] = label
+
+            parts.append(label)
+            frame = frame.f_back
+
+        parts.append(thread_name.replace(";", ":"))
+        parts.reverse()
+        return ";".join(parts)
+
+    def _write(self, stacks):
+        """
+        Writes collapsed stacks ("frame;frame;frame count" per line).
+
+        Parameters:
+        - stacks: dict[str, int]
+
+        Returns:
+        - str - file path
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f"cpu-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{self._sessions}.folded")
+
+        with open(path, "w", encoding="utf-8") as f:
+
+            for key, count in sorted(stacks.items()):
+                f.write(f"{key} {count}\n")
+
+        return path
+
+_profiler = SamplingProfiler()
+
+def configure_profiler(config):
+    """
+    Replaces the global profiler according to config (profiler_dir, profiler_interval_ms, profiler_max_seconds).
+
+    Parameters:
+    - config: object
+
+    Returns:
+    - SamplingProfiler
+    """
+    global _profiler
+    _profiler = SamplingProfiler(
+        output_dir=getattr(config, "profiler_dir", "data/profiles"),
+        interval=getattr(config, "profiler_interval_ms", 10) / 1000,
+        max_duration=getattr(config, "profiler_max_seconds", 300.0),
+        short_switch_interval=getattr(config, "profiler_short_switch_interval", False),
+    )
+    return _profiler
+
+def get_profiler() -> SamplingProfiler:
+    """
+    Returns the process-wide sampling profiler.
+
+    Parameters:
+    - None
+
+    Returns:
+    - SamplingProfiler
+    """
+    return _profiler
@@ -0,0 +1,245 @@
+# SPDX-FileCopyrightText: 2025 Maxim Selin <selinmax05@mail.ru>
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Startup profiling for notification-bot (`src/main.py --profile-startup`): per-module import-time
+breakdown plus wall time from process start to startup milestones (gRPC server started, first poll).
+Everything here is a no-op unless enable() was called.
+"""
+import os
+import sys
+import time
+import threading
+
+_profiler = None
+
+class _TimedLoader:
+    """
+    Loader wrapper timing exec_module; all other attributes are delegated to the real loader.
+    """
+
+    def __init__(self, loader, profiler):
+        self._loader = loader
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        stack = self._profiler._stack
+        stack.append(0.0)
+        start = time.perf_counter()
+
+        try:
+            self._loader.exec_module(module)
+
+        finally:
+            total = time.perf_counter() - start
+            children = stack.pop()
+
+            if stack:
+                stack[-1] += total
+
+            self._profiler.imports[module.__name__] = (total, total - children)
+
+class StartupProfiler:
+    """
+    Meta path finder recording import times, and a registry of startup milestones.
+    """
+
+    def __init__(self):
+        self.process_start = _process_start_time()
+        self.imports = {}
+        self.milestones = {}
+        self.expected = set()
+        self._stack = []
+        self._lock = threading.Lock()
+        self._reported = False
+
+    def find_spec(self, fullname, path, target=None):
+        """
+        Delegates lookup to the remaining meta path finders and wraps the found loader.
+
+        Parameters:
+        - fullname: str
+        - path: list|None
+        - target: module|None
+
+        Returns:
+        - ModuleSpec|None
+        """
+        if threading.current_thread() is not threading.main_thread():
+            return None
+
+        for finder in sys.meta_path:
+
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+
+            spec = finder.find_spec(fullname, path, target)
+
+            if spec is not None:
+                break
+
+        else:
+            return None
+
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self)
+
+        return spec
+
+    def expect(self, milestones):
+        """
+        Parameters:
+        - milestones: iterable[str] - milestones after which the report is printed
+
+        Returns:
+        - None
+        """
+        self.expected = set(milestones)
+
+    def mark(self, name):
+        """
+        Records the first occurrence of a milestone; prints the report once all expected ones happened.
+
+        Parameters:
+        - name: str
+
+        Returns:
+        - None
+        """
+        with self._lock:
+
+            if name in self.milestones:
+                return
+
+            self.milestones[name] = time.time() - self.process_start
+            done = bool(self.expected) and self.expected.issubset(self.milestones) and not self._reported
+
+            if done:
+                self._reported = True
+
+        if done:
+            disable_import_timing()
+            print(self.report(), file=sys.stderr, flush=True)
+
+    def report(self, top=25):
+        """
+        Formats the import breakdown and milestone timings.
+
+        Parameters:
+        - top: int - number of modules listed
+
+        Returns:
+        - str
+        """
+        lines = ["Startup profile", "", "Milestones (seconds since process start):"]
+
+        for name, elapsed in sorted(self.milestones.items(), key=lambda item: item[1]):
+            lines.append(f"  {elapsed:8.3f}  {name}")
+
+        packages = {}
+
+        for module, (_, self_time) in self.imports.items():
+            root = module.split(".", 1)[0]
+            packages[root] = packages.get(root, 0.0) + self_time
+
+        lines += ["", "Import time by top-level package (self, ms):"]
+
+        for root, self_time in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+            lines.append(f"  {self_time * 1000:9.1f}  {root}")
+
+        lines += ["", f"Slowest {top} module imports (cumulative ms | self ms):"]
+
+        for module, (total, self_time) in sorted(self.imports.items(), key=lambda item: -item[1][0])[:top]:
+            lines.append(f"  {total * 1000:9.1f} | {self_time * 1000:9.1f}  {module}")
+
+        return "\n".join(lines)
+
+def _process_start_time():
+    """
+    Returns the process start as a UNIX timestamp (from /proc on Linux, otherwise now).
+
+    Parameters:
+    - None
+
+    Returns:
+    - float
+    """
+    try:
+
+        with open("/proc/self/stat", "rb") as f:
+            start_ticks = int(f.read().rsplit(b")", 1)[1].split()[19])
+
+        with open("/proc/uptime", "rb") as f:
+            uptime = float(f.read().split()[0])
+
+        return time.time() - uptime + start_ticks / os.sysconf("SC_CLK_TCK")
+
+    except (OSError, ValueError, IndexError):
+        return time.time()
+
+def enable():
+    """
+    Starts import timing and milestone recording (call before importing subsystems).
+
+    Parameters:
+    - None
+
+    Returns:
+    - StartupProfiler
+    """
+    global _profiler
+
+    if _profiler is None:
+        _profiler = StartupProfiler()
+        sys.meta_path.insert(0, _profiler)
+
+    return _profiler
+
+def expect(milestones):
+    """
+    Sets the milestones after which the report is printed (no-op unless enabled).
+
+    Parameters:
+    - milestones: iterable[str]
+
+    Returns:
+    - None
+    """
+    if _profiler is not None:
+        _profiler.expect(milestones)
+
+def disable_import_timing():
+    """
+    Removes the import timer from sys.meta_path (milestones keep working).
+
+    Parameters:
+    - None
+
+    Returns:
+    - None
+    """
+    if _profiler is not None and _profiler in sys.meta_path:
+        sys.meta_path.remove(_profiler)
+
+def is_enabled() -> bool:
+    return _profiler is not None
+
+def mark(name):
+    """
+    Records a startup milestone (no-op unless profiling is enabled).
+
+    Parameters:
+    - name: str
+
+    Returns:
+    - None
+    """
+    if _profiler is not None:
+        _profiler.mark(name)
@@ -0,0 +1,323 @@
+# SPDX-FileCopyrightText: 2025 Maxim Selin <selinmax05@mail.ru>
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Lightweight span tracing for notification-bot: gRPC ingress -> DB -> queue -> Telegram send.
+Trace context follows the W3C `traceparent` format in gRPC metadata; finished spans are written
+as JSON lines to a rotating local file by a background thread, so the event loops never block on
+file I/O or rotation. Disabled (no-op) unless configured with a trace file.
+"""
+import os
+import json
+import time
+import queue
+import atexit
+import random
+import logging
+import logging.handlers
+from typing import NamedTuple, Optional
+
+TRACEPARENT_KEY = "traceparent"
+
+class SpanContext(NamedTuple):
+    """
+    Propagated identity of a sampled span.
+    """
+    trace_id: str
+    span_id: str
+
+class Span:
+    """
+    A timed operation within a trace; written to the exporter on end().
+    """
+
+    __slots__ = ("_tracer", "name", "trace_id", "span_id", "parent_id", "start_ns", "attributes", "_ended")
+
+    def __init__(self, tracer, name, trace_id, parent_id=None, start_ns=None, attributes=None):
+        """
+        Parameters:
+        - tracer: Tracer - owner/exporter
+        - name: str - stage name
+        - trace_id: str - 32 hex chars
+        - parent_id: str|None - parent span id
+        - start_ns: int|None - wall-clock start (time.time_ns), defaults to now
+        - attributes: dict|None
+
+        Returns:
+        - Span
+        """
+        self._tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.start_ns = start_ns if start_ns is not None else time.time_ns()
+        self.attributes = attributes or {}
+        self._ended = False
+
+    def context(self) -> Optional[SpanContext]:
+        """
+        Returns the context to pass to child spans.
+
+        Parameters:
+        - None
+
+        Returns:
+        - SpanContext
+        """
+        return SpanContext(self.trace_id, self.span_id)
+
+    def set_attribute(self, key, value):
+        """
+        Attaches an attribute to the span.
+
+        Parameters:
+        - key: str
+        - value: JSON-serializable
+
+        Returns:
+        - None
+        """
+        self.attributes[key] = value
+
+    def end(self, error=None):
+        """
+        Finishes the span and exports it (idempotent).
+
+        Parameters:
+        - error: Exception|str|None - marks span status as error
+
+        Returns:
+        - None
+        """
+        if self._ended:
+            return
+
+        self._ended = True
+        end_ns = time.time_ns()
+        self._tracer._export({
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "duration_ms": round((end_ns - self.start_ns) / 1e6, 3),
+            "status": "error" if error is not None else "ok",
+            "error": str(error) if error is not None else None,
+            "attributes": self.attributes,
+        })
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end(error=exc)
+        return False
+
+class _NoopSpan:
+    """
+    Span stand-in for unsampled or disabled tracing; every operation is free.
+    """
+
+    __slots__ = ()
+
+    def context(self):
+        return None
+
+    def set_attribute(self, key, value):
+        pass
+
+    def end(self, error=None):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+NOOP_SPAN = _NoopSpan()
+
+class Tracer:
+    """
+    Creates spans and exports finished ones to a rotating JSONL file. Span records are queued
+    (QueueHandler) and written by a QueueListener thread.
+    """
+
+    def __init__(self, path=None, sample_rate=1.0, max_bytes=10 * 1024 * 1024, backup_count=3):
+        """
+        Parameters:
+        - path: str|None - trace file (parent directory created if missing); None disables tracing
+        - sample_rate: float - probability of sampling a trace without upstream decision (0..1)
+        - max_bytes: int - rotate file after this size
+        - backup_count: int - rotated files to keep
+
+        Returns:
+        - Tracer
+        """
+        self.sample_rate = sample_rate
+        self._file_logger = None
+        self._listener = None
+
+        if path:
+            directory = os.path.dirname(path)
+
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            file_handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count)
+            file_handler.setFormatter(logging.Formatter("%(message)s"))
+            records = queue.SimpleQueue()
+            self._listener = logging.handlers.QueueListener(records, file_handler)
+            self._listener.start()
+            atexit.register(self.close)
+            file_logger = logging.getLogger("notification_bot.traces")
+            file_logger.handlers = [logging.handlers.QueueHandler(records)]
+            file_logger.setLevel(logging.INFO)
+            file_logger.propagate = False
+            self._file_logger = file_logger
+
+    @property
+    def enabled(self) -> bool:
+        return self._file_logger is not None
+
+    def close(self):
+        """
+        Stops exporting: flushes queued spans to the file and stops the writer thread (idempotent).
+
+        Parameters:
+        - None
+
+        Returns:
+        - None
+        """
+        listener, self._listener = self._listener, None
+        self._file_logger = None
+
+        if listener is not None:
+            listener.stop()
+
+            for handler in listener.handlers:
+                handler.close()
+
+    def start_trace(self, name, metadata=None, attributes=None):
+        """
+        Starts the ingress span of a trace, continuing an upstream `traceparent` if present.
+
+        Parameters:
+        - name: str
+        - metadata: iterable[(key, value)]|None - gRPC invocation metadata
+        - attributes: dict|None
+
+        Returns:
+        - Span|_NoopSpan
+        """
+        if not self.enabled:
+            return NOOP_SPAN
+
+        upstream = extract_traceparent(metadata)
+
+        if upstream is not None:
+            trace_id, parent_id, sampled = upstream
+
+            if not sampled:
+                return NOOP_SPAN
+
+            return Span(self, name, trace_id, parent_id, attributes=attributes)
+
+        if random.random() >= self.sample_rate:
+            return NOOP_SPAN
+
+        return Span(self, name, os.urandom(16).hex(), attributes=attributes)
+
+    def start_span(self, name, parent: Optional[SpanContext], start_ns=None, attributes=None):
+        """
+        Starts a child span; unsampled parents (None) yield a no-op span.
+
+        Parameters:
+        - name: str
+        - parent: SpanContext|None
+        - start_ns: int|None - backdated start (e.g. enqueue time for queue waits)
+        - attributes: dict|None
+
+        Returns:
+        - Span|_NoopSpan
+        """
+        if parent is None or not self.enabled:
+            return NOOP_SPAN
+
+        return Span(self, name, parent.trace_id, parent.span_id, start_ns=start_ns, attributes=attributes)
+
+    def _export(self, record):
+        file_logger = self._file_logger
+
+        if file_logger is not None:
+            file_logger.info(json.dumps(record, separators=(",", ":"), default=str))
+
+def extract_traceparent(metadata):
+    """
+    Parses a W3C traceparent ("00-<trace_id>-<span_id>-<flags>") from gRPC metadata.
+
+    Parameters:
+    - metadata: iterable[(key, value)]|None
+
+    Returns:
+    - tuple(trace_id: str, span_id: str, sampled: bool)|None
+    """
+    if not metadata:
+        return None
+
+    for key, value in metadata:
+
+        if key != TRACEPARENT_KEY:
+            continue
+
+        parts = value.split("-") if isinstance(value, str) else []
+
+        if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+            return None
+
+        try:
+            sampled = bool(int(parts[3], 16) & 0x01)
+
+        except ValueError:
+            return None
+
+        return parts[1], parts[2], sampled
+
+    return None
+
+_tracer = Tracer()
+
+def configure_tracing(config):
+    """
+    Replaces the global tracer according to config (trace_file, trace_sample_rate), closing the previous one.
+
+    Parameters:
+    - config: object - trace_file, trace_sample_rate, trace_max_bytes, trace_backup_count
+
+    Returns:
+    - Tracer
+    """
+    global _tracer
+    _tracer.close()
+    _tracer = Tracer(
+        path=getattr(config, "trace_file", None) or None,
+        sample_rate=getattr(config, "trace_sample_rate", 1.0),
+        max_bytes=getattr(config, "trace_max_bytes", 10 * 1024 * 1024),
+        backup_count=getattr(config, "trace_backup_count", 3),
+    )
+    return _tracer
+
+def get_tracer() -> Tracer:
+    """
+    Returns the process-wide tracer (no-op until configure_tracing is called with a trace file).
+
+    Parameters:
+    - None
+
+    Returns:
+    - Tracer
+    """
+    return _tracer
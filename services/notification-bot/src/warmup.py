@@ -0,0 +1,75 @@
+# SPDX-FileCopyrightText: 2025 Maxim Selin <selinmax05@mail.ru>
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Warm-up phase run once on the Telegram loop before the process is marked ready: starts the
+delivery worker, opens the DB connection with the authorized-user query the contact path runs,
+calls get_me to open a Bot API connection (and, in broadcast mode, sends the invite link to
+users authorized before the mode was enabled), and imports and exercises the WebApp cipher.
+Everything the first contact or auth call would otherwise pay for is paid here, while the gRPC
+health service still reports NOT_SERVING.
+"""
+import time
+import asyncio
+from src.logger import get_logger
+from src.handlers import encrypt_uid, decrypt_uid
+
+logger = get_logger("warmup")
+
+async def _step(name: str, timeout: float, start):
+    """
+    Runs one best-effort warm-up step within timeout; a failure is logged and does not block readiness.
+
+    Parameters:
+    - name: str
+    - timeout: float - seconds
+    - start: callable() -> awaitable
+
+    Returns:
+    - object|None - the step's result, None on failure
+    """
+    started = time.perf_counter()
+
+    try:
+        result = await asyncio.wait_for(start(), timeout)
+
+    except Exception as ex:
+        logger.warning("Warm-up step failed", extra={"warmup_step": name, "error": repr(ex)})
+        return None
+
+    logger.info("Warm-up step done", extra={"warmup_step": name, "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)})
+    return result
+
+async def warm_up(config, application, handler):
+    """
+    Runs the warm-up phase. The delivery worker is always started; the other steps are
+    best-effort, so an unreachable DB or Bot API delays readiness by at most warmup_timeout
+    each instead of keeping the process out of service.
+
+    Parameters:
+    - config: Config - webapp_token_secret, warmup_timeout
+    - application: telegram.ext.Application (initialized)
+    - handler: NotificationHandler
+
+    Returns:
+    - None
+    """
+    started = time.perf_counter()
+    timeout = getattr(config, "warmup_timeout", 10.0)
+    await handler.start_worker()
+
+    user_ids = await _step("database", timeout, lambda: asyncio.to_thread(handler.user_auth_manager.get_all_authorized_user_ids))
+
+    if user_ids is not None:
+        logger.info("Authorized users loaded", extra={"authorized_users": len(user_ids)})
+
+    await _step("telegram", timeout, application.bot.get_me)
+
+    if handler.broadcast_channel is not None:
+        await _step("broadcast_invite", timeout, handler.announce_broadcast_invite)
+
+    secret = config.webapp_token_secret
+    await _step("webapp_cipher", timeout, lambda: asyncio.to_thread(lambda: decrypt_uid(encrypt_uid("0", secret), secret)))
+
+    logger.info("Warm-up finished", extra={"elapsed_ms": round((time.perf_counter() - started) * 1000, 1)})